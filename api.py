@@ -1,49 +1,214 @@
 # api.py
 
+import hashlib
+import logging
+import sqlite3
 import requests
-from constants import API_URL
+import metrics
+from constants import API_STATIONS_PATH, FETCH_DEADLINE
+from cancel import CancelToken, FetchCancelled
+from catalog_cache import get_catalog_cache
+from mirrors import get_mirror_pool
+from global_index import get_global_index
+from single_flight import SingleFlight
+from station import stations_from_dicts
 from PyQt6.QtCore import QThread, pyqtSignal
-from tenacity import retry, stop_after_attempt, wait_exponential
+
+log = logging.getLogger(__name__)
 
 class FetchStationsWorker(QThread):
     """
     A worker thread to fetch radio stations by country.
     This is useful to prevent the UI from freezing during network requests.
+
+    Stale-while-revalidate: a cached catalog is emitted through `cached` right
+    away, then revalidated with a conditional GET. `finished` is only emitted
+    when the server returned a list that differs from the cached one (or when
+    there was nothing cached to show).
+
+    The whole load shares one CancelToken with an overall deadline. `stop()`
+    cancels it, which aborts waiting and downloading in the mirror pool
+    within a fraction of a second, so a superseded worker can simply be
+    dropped instead of joined.
     """
-    finished = pyqtSignal(list)  # emits the list of stations once done
+    cached = pyqtSignal(list)  # emits the cached list of Station records, if any
+    finished = pyqtSignal(list)  # emits the list of Station records once done
 
-    def __init__(self, country):
+    def __init__(self, country, deadline=FETCH_DEADLINE, emit_cached=True):
+        """
+        Args:
+            country (str): Country to load.
+            deadline (float): Overall budget for the load, in seconds.
+            emit_cached (bool): Emit `cached` (False when the caller already shows the cached list).
+        """
         super().__init__()
         self.country = country
+        self.emit_cached = emit_cached
+        self.cancel_token = CancelToken(deadline)
         self._is_running = True
 
     def run(self):
-        if self._is_running:
-            stations = fetch_stations_by_country(self.country)
-            if self._is_running:  # Check again before emitting
-                self.finished.emit(stations)
+        if not self._is_running:
+            return
+
+        cache = get_catalog_cache()
+        entry = cache.load(self.country)
+        if entry is not None:
+            if self.emit_cached:
+                self.cached.emit(entry.stations)
+            index_catalog(entry)
+            if entry.is_fresh():
+                return  # Young enough, no need to ask the server
+
+        stations, changed = refresh_catalog_shared(self.country, entry, cancel=self.cancel_token)
+        if not self._is_running:  # Superseded while fetching: nobody wants the result
+            return
+
+        if changed:
+            self.finished.emit(stations)
+        elif entry is None:
+            self.finished.emit([])  # Network error and nothing cached to show
 
     def stop(self):
-        """Stop the thread."""
+        """Stop the thread: abort its request and drop its result. Never blocks."""
         self._is_running = False
+        self.cancel_token.cancel()
 
-@retry(stop=stop_after_attempt(10), wait=wait_exponential(multiplier=1, min=4, max=10))
-def fetch_stations_by_country(country):
+class FetchResult:
     """
-    Fetch radio stations by country using the Radio-Browser API.
+    Outcome of a conditional station request.
+    `stations` is a list of Station records, None when the request failed;
+    `not_modified` is True on a 304; `cancelled` is True when the request
+    was aborted or ran out of its deadline.
     """
+
+    def __init__(self, stations=None, not_modified=False, etag=None, last_modified=None, digest=None,
+                 cancelled=False):
+        self.stations = stations
+        self.cancelled = cancelled
+        self.not_modified = not_modified
+        self.etag = etag
+        self.last_modified = last_modified
+        self.digest = digest
+
+def fetch_stations_conditional(country, etag=None, last_modified=None, cancel=None):
+    """
+    Fetch radio stations by country, revalidating a cached copy.
+    Sends If-None-Match / If-Modified-Since when validators are known and asks
+    for a compressed response. The request goes through the shared MirrorPool,
+    which picks the fastest healthy mirror and hedges slow requests.
+    Args:
+        country (str): Country name as understood by the Radio-Browser API.
+        etag (str): ETag of the cached copy, if any.
+        last_modified (str): Last-Modified of the cached copy, if any.
+        cancel (CancelToken): Aborts the request when cancelled or past its deadline.
+    Returns:
+        FetchResult
+    """
+    headers = {"Accept-Encoding": "gzip, deflate"}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
     try:
-        response = requests.get(f"{API_URL}/bycountry/{country}", timeout=6)
+        with metrics.span("api.fetch"):
+            response = get_mirror_pool().get(
+                f"{API_STATIONS_PATH}/bycountry/{country}", cancel=cancel, headers=headers
+            )
+        if response.status_code == 304:
+            metrics.count("api.fetch.not_modified")
+            return FetchResult(not_modified=True, etag=etag, last_modified=last_modified)
         response.raise_for_status()
-        stations = response.json()
-        if isinstance(stations, list):  # Ensure the response is a list of stations
-            return stations
-        else:
-            print(f"Unexpected response format for {country}")
-            return []
+        with metrics.span("api.decode"):
+            stations = response.json()
+            if not isinstance(stations, list):  # Ensure the response is a list of stations
+                log.warning("Unexpected response format for %s", country)
+                return FetchResult()
+            stations = stations_from_dicts(stations)
+        return FetchResult(
+            stations=stations,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            digest=hashlib.sha1(response.content).hexdigest(),
+        )
+    except FetchCancelled as e:
+        metrics.count("api.fetch.cancelled")
+        log.info("Request for %s abandoned: %s", country, e)
+        return FetchResult(cancelled=True)
     except requests.Timeout:
-        print(f"Request timed out for {country}")
-        return []
-    except requests.RequestException as e:
-        print(f"Error fetching stations for {country}: {e}")
-        return []
\ No newline at end of file
+        metrics.count("api.fetch.failed")
+        log.warning("Request timed out for %s", country)
+        return FetchResult()
+    except (requests.RequestException, ValueError) as e:
+        metrics.count("api.fetch.failed")
+        log.warning("Error fetching stations for %s: %s", country, e)
+        return FetchResult()
+
+def refresh_catalog(country, entry=None, cancel=None):
+    """
+    Revalidate a country's catalog against the API and update the cache.
+    Args:
+        country (str): Country name.
+        entry (CatalogEntry): The cached entry to revalidate, if any.
+        cancel (CancelToken): Aborts the request when cancelled or past its deadline.
+    Returns:
+        tuple: (stations, changed). `changed` is False when the server
+        confirmed the cached copy or could not be reached; `stations` is then
+        the cached list (or an empty list when nothing was cached). A
+        cancelled request leaves the cache untouched.
+    """
+    cache = get_catalog_cache()
+    result = fetch_stations_conditional(
+        country,
+        etag=entry.etag if entry else None,
+        last_modified=entry.last_modified if entry else None,
+        cancel=cancel,
+    )
+
+    if entry is not None and (
+        result.not_modified or (result.digest is not None and result.digest == entry.digest)
+    ):
+        cache.touch(country)
+        return entry.stations, False
+
+    if result.stations is None:
+        # Network error: keep the cached list if there is one
+        return (entry.stations if entry else []), False
+
+    entry = cache.store(country, result.stations, result.etag, result.last_modified, result.digest)
+    index_catalog(entry)
+    return result.stations, True
+
+# Concurrent refreshes of one country (the UI and the prefetcher) share a single request
+catalog_flights = SingleFlight()
+
+def refresh_catalog_shared(country, entry=None, cancel=None):
+    """
+    refresh_catalog, coalesced: if the same country is already being
+    refreshed, wait for that request instead of sending another one.
+    A cancelled caller stops waiting; the request itself is aborted only
+    when every caller waiting for it has been cancelled.
+    """
+    try:
+        return catalog_flights.do(country, lambda token: refresh_catalog(country, entry, cancel=token), cancel)
+    except FetchCancelled:
+        return (entry.stations if entry else []), False
+
+def index_catalog(entry):
+    """
+    Add a country's catalog to the global cross-country search index.
+    Cheap when the catalog is already indexed (same digest).
+    """
+    try:
+        get_global_index().update_country(entry.country, entry.stations, entry.digest)
+    except sqlite3.Error as e:
+        log.warning("Could not index stations for %s: %s", entry.country, e)
+
+def fetch_stations_by_country(country):
+    """
+    Fetch radio stations by country using the Radio-Browser API.
+    Failover between mirrors is handled by the MirrorPool, so there is no
+    retry loop here.
+    """
+    return fetch_stations_conditional(country).stations or []
@@ -0,0 +1,94 @@
+# asset_cache.py
+
+import os
+import sys
+
+from PyQt6.QtCore import QSize
+from PyQt6.QtGui import QGuiApplication, QIcon, QTransform
+
+
+def asset_path(name):
+    """Absolute path of a file in assets/, for development and PyInstaller builds."""
+    base_path = getattr(sys, '_MEIPASS', os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base_path, "assets", name)
+
+
+class AssetCache:
+    """
+    Icons and pixmaps loaded once per process.
+
+    Each asset file is read from disk once. Icons are pre-rendered at the
+    requested size for every screen's device-pixel ratio, so painting a
+    row or switching a button icon never touches the disk or rescales an
+    image. `file_loads` and `hits` count what the cache saved.
+    """
+
+    def __init__(self):
+        self._sources = {}  # file name -> QIcon read from disk
+        self._icons = {}    # (name, size, mirrored) -> QIcon with pre-rendered pixmaps
+        self._pixmaps = {}  # (name, size, device pixel ratio, mirrored) -> QPixmap
+        self.file_loads = 0
+        self.hits = 0
+
+    @staticmethod
+    def device_pixel_ratios():
+        """Device-pixel ratios of the connected screens (1.0 always included)."""
+        ratios = {1.0}
+        app = QGuiApplication.instance()
+        if app is not None:
+            ratios.update(screen.devicePixelRatio() for screen in app.screens())
+        return sorted(ratios)
+
+    def _source(self, name):
+        source = self._sources.get(name)
+        if source is None:
+            source = QIcon(asset_path(name))
+            self._sources[name] = source
+            self.file_loads += 1
+        return source
+
+    def pixmap(self, name, size, device_pixel_ratio=1.0, mirrored=False):
+        """
+        `name` rendered at `size` (int or QSize, in device-independent pixels)
+        for a device-pixel ratio; optionally mirrored left-to-right.
+        """
+        size = size if isinstance(size, QSize) else QSize(size, size)
+        key = (name, size.width(), size.height(), device_pixel_ratio, mirrored)
+        pixmap = self._pixmaps.get(key)
+        if pixmap is not None:
+            self.hits += 1
+            return pixmap
+        pixmap = self._source(name).pixmap(size, device_pixel_ratio)
+        if mirrored:
+            pixmap = pixmap.transformed(QTransform().scale(-1, 1))
+            pixmap.setDevicePixelRatio(device_pixel_ratio)
+        self._pixmaps[key] = pixmap
+        return pixmap
+
+    def icon(self, name, size, mirrored=False):
+        """
+        QIcon for `name` holding a ready-made pixmap for every screen's
+        device-pixel ratio at `size`.
+        """
+        size = size if isinstance(size, QSize) else QSize(size, size)
+        key = (name, size.width(), size.height(), mirrored)
+        icon = self._icons.get(key)
+        if icon is not None:
+            self.hits += 1
+            return icon
+        icon = QIcon()
+        for ratio in self.device_pixel_ratios():
+            icon.addPixmap(self.pixmap(name, size, ratio, mirrored))
+        self._icons[key] = icon
+        return icon
+
+
+_shared_cache = None
+
+
+def get_asset_cache():
+    """Return the process-wide AssetCache, creating it on first use."""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = AssetCache()
+    return _shared_cache
@@ -0,0 +1,140 @@
+# benchmarks/icon_cache.py
+"""
+Measure the file I/O and allocations of painting station rows, with star
+icons built from disk for every row (as the per-row QIcon code did) and
+with the shared AssetCache.
+
+The list is scrolled page by page and rendered into an offscreen image,
+so every row is painted. Bytes read come from /proc/self/io (Linux only,
+otherwise reported as n/a); object counts are QIcon/QPixmap instances
+created while painting.
+
+Usage:
+    python benchmarks/icon_cache.py [station_count]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtCore import QSize  # noqa: E402
+from PyQt6.QtGui import QIcon, QImage, QPainter  # noqa: E402
+from PyQt6.QtWidgets import QApplication, QListView  # noqa: E402
+
+from asset_cache import AssetCache, asset_path  # noqa: E402
+from station import Station  # noqa: E402
+from station_model import StationListModel, StationDelegate  # noqa: E402
+
+
+class UncachedAssets:
+    """Stand-in for AssetCache that loads a new icon from disk on every request."""
+
+    def __init__(self):
+        self.created = 0
+
+    def pixmap(self, name, size, device_pixel_ratio=1.0, mirrored=False):
+        self.created += 2  # A QIcon and the QPixmap rendered from it
+        return QIcon(asset_path(name)).pixmap(QSize(size, size), device_pixel_ratio)
+
+
+class CountingAssets(AssetCache):
+    """AssetCache that counts the icons and pixmaps it creates."""
+
+    def __init__(self):
+        super().__init__()
+        self.created = 0
+
+    def _source(self, name):
+        if name not in self._sources:
+            self.created += 1
+        return super()._source(name)
+
+    def pixmap(self, name, size, device_pixel_ratio=1.0, mirrored=False):
+        before = len(self._pixmaps)
+        pixmap = super().pixmap(name, size, device_pixel_ratio, mirrored)
+        self.created += len(self._pixmaps) - before
+        return pixmap
+
+
+def bytes_read():
+    """Bytes this process has read so far, or None off Linux."""
+    try:
+        with open("/proc/self/io") as f:
+            for line in f:
+                if line.startswith("rchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def render_all_rows(view, model):
+    """Scroll through the list a page at a time, painting each page."""
+    image = QImage(view.viewport().size(), QImage.Format.Format_ARGB32)
+    rows_per_page = max(1, view.viewport().height() // StationDelegate.ROW_HEIGHT)
+    for row in range(0, model.rowCount(), rows_per_page):
+        view.scrollTo(model.index(row), QListView.ScrollHint.PositionAtTop)
+        painter = QPainter(image)
+        view.viewport().render(painter)
+        painter.end()
+
+
+def measure(assets, stations):
+    favorites = {station.key for station in stations[::3]}
+    model = StationListModel(is_favorite=favorites.__contains__)
+    model.set_stations(stations)
+    view = QListView()
+    view.setUniformItemSizes(True)
+    view.setModel(model)
+    view.setItemDelegate(StationDelegate(view, assets=assets))
+    view.resize(400, 600)
+    view.show()
+    QApplication.processEvents()
+
+    read_before = bytes_read()
+    tracemalloc.start()
+    started = time.perf_counter()
+    render_all_rows(view, model)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    read_after = bytes_read()
+
+    view.close()
+    return {
+        "seconds": elapsed,
+        "bytes_read": None if read_before is None else read_after - read_before,
+        "objects": assets.created,
+        "python_peak": peak,
+    }
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    app = QApplication(sys.argv[:1])  # noqa: F841
+    stations = [
+        Station.from_dict({"stationuuid": f"{i:08x}", "name": f"Station {i}", "url": f"http://example.com/{i}"})
+        for i in range(count)
+    ]
+
+    results = {
+        "per-row QIcon": measure(UncachedAssets(), stations),
+        "AssetCache": measure(CountingAssets(), stations),
+    }
+
+    print(f"Rows painted: {count}")
+    print(f"{'':16} {'time':>10} {'bytes read':>12} {'icons/pixmaps':>14} {'py peak':>10}")
+    for name, r in results.items():
+        read = "n/a" if r["bytes_read"] is None else f"{r['bytes_read']:,}"
+        print(
+            f"{name:16} {r['seconds'] * 1000:8.1f}ms {read:>12} {r['objects']:>14,} "
+            f"{r['python_peak'] / 1024:8.1f}KiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
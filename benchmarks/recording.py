@@ -0,0 +1,145 @@
+# benchmarks/recording.py
+"""
+Record several streams at once from a local HTTP stream source and check
+the result: segment rotation, the disk budget, per-recording throughput
+and drop counters, and that the bytes on disk are exactly the bytes sent.
+
+The source serves an endless audio/mpeg stream of a known byte pattern at
+a fixed rate; one stream can be made to drop its connection midway to
+exercise reconnects. Two runs are made:
+
+    integrity   large budget: the segments of each recording, concatenated,
+                must equal the start of what the source sent
+    budget      small budget: old segments must be deleted to stay under it
+
+Usage:
+    python benchmarks/recording.py [--streams 4] [--seconds 6] [--rate 64]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from recorder import RecordingManager  # noqa: E402
+
+PATTERN = bytes(range(251))  # Prime length: a dropped or repeated chunk shows up as a mismatch
+PIECE = 4096
+
+
+def pattern_bytes(offset, length):
+    """`length` bytes of the source stream starting at `offset`."""
+    start = offset % len(PATTERN)
+    repeated = PATTERN * ((start + length) // len(PATTERN) + 1)
+    return repeated[start:start + length]
+
+
+class StreamSource(BaseHTTPRequestHandler):
+    rate = 64 * 1024  # Bytes per second
+    drop_after = None  # Bytes after which /drop streams close the connection
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "audio/mpeg")
+        self.end_headers()
+        sent = 0
+        started = time.monotonic()
+        try:
+            while True:
+                if self.path.startswith("/drop") and self.drop_after and sent >= self.drop_after:
+                    return
+                self.wfile.write(pattern_bytes(sent, PIECE))
+                sent += PIECE
+                ahead = sent / self.rate - (time.monotonic() - started)
+                if ahead > 0:
+                    time.sleep(ahead)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+def segment_order(name):
+    """Sort key for <timestamp>[-n].<ext>: segments opened within the same second carry a suffix."""
+    stem = name.rsplit(".", 1)[0]
+    return stem[:15], int(stem[16:] or 1)
+
+
+def read_segments(recording_dir):
+    data = b""
+    for name in sorted(os.listdir(recording_dir), key=segment_order):
+        with open(os.path.join(recording_dir, name), "rb") as f:
+            data += f.read()
+    return data
+
+
+def run(base_url, streams, seconds, directory, disk_budget, segment_seconds):
+    manager = RecordingManager(directory, disk_budget=disk_budget, segment_seconds=segment_seconds,
+                               max_concurrent=streams)
+    for i in range(streams):
+        path = "/drop" if i == 0 else "/live"
+        manager.start(f"{base_url}{path}/{i}", name=f"Station {i}", key=f"station-{i}")
+    time.sleep(seconds)
+    stats = [recording.stats() for recording in manager.recordings()]
+    manager.stop_all(wait=True)
+    return manager, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--streams", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=6.0)
+    parser.add_argument("--rate", type=int, default=64, help="Source rate per stream, KiB/s")
+    args = parser.parse_args()
+
+    StreamSource.rate = args.rate * 1024
+    StreamSource.drop_after = StreamSource.rate  # The /drop stream disconnects after one second
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StreamSource)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    failures = []
+
+    print(f"{'run':10} {'recording':10} {'segments':>8} {'written':>10} {'KiB/s':>8} {'dropped':>8} {'reconnects':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        manager, stats = run(base_url, args.streams, args.seconds, os.path.join(directory, "integrity"),
+                             disk_budget=1024 ** 3, segment_seconds=1.0)
+        for s in stats:
+            print(f"{'integrity':10} {s['key']:10} {s['segments']:>8} {s['bytes_written']:>10,} "
+                  f"{s['throughput_bps'] / 1024:>8.1f} {s['chunks_dropped']:>8} {s['reconnects']:>10}")
+            if s["key"] == "station-0":
+                continue  # Reconnected: the source restarts its pattern, checked by segment count only
+            data = read_segments(os.path.join(manager.directory, s["name"].replace(" ", "_")))
+            if data != pattern_bytes(0, len(data)):
+                failures.append(f"{s['key']}: bytes on disk differ from the source")
+            if s["segments"] < 2:
+                failures.append(f"{s['key']}: segments were not rotated")
+        if not any(s["reconnects"] for s in stats if s["key"] == "station-0"):
+            failures.append("station-0: dropped connection was not reconnected")
+
+        budget = 3 * StreamSource.rate  # About three seconds of one stream
+        manager, stats = run(base_url, args.streams, args.seconds, os.path.join(directory, "budget"),
+                             disk_budget=budget, segment_seconds=0.5)
+        for s in stats:
+            print(f"{'budget':10} {s['key']:10} {s['segments']:>8} {s['bytes_written']:>10,} "
+                  f"{s['throughput_bps'] / 1024:>8.1f} {s['chunks_dropped']:>8} {s['reconnects']:>10}")
+        used = manager.disk_used()
+        print(f"Disk budget {budget:,} bytes, used {used:,}, segments deleted {manager.deleted_segments}")
+        if used > budget:
+            failures.append(f"disk budget exceeded: {used:,} > {budget:,}")
+        if not manager.deleted_segments:
+            failures.append("no segment was deleted to honour the disk budget")
+
+    server.shutdown()
+    print("OK" if not failures else "FAILED:\n  " + "\n  ".join(failures))
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+# benchmarks/startup.py
+"""
+Measure cold start: module import time, time until the window has painted
+once, and time until the station list shows real, clickable stations.
+
+Every run starts a fresh interpreter, so imports are not cached between
+runs (the OS file cache still is). Runs are reproducible offline and never
+touch the user's files: the cache and config directories are temporary,
+holding a fresh catalog for the startup country (the case the startup path
+is optimised for), every API fetch goes to a mirror that refuses
+connections, and vlc and pynput are replaced by stub modules. The stubs
+are still imported lazily, so "loaded before paint" stays meaningful.
+
+Usage:
+    python benchmarks/startup.py [--runs N] [--stations N] [--offscreen]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LIST_TIMEOUT = 30.0  # Seconds to wait for the station list before giving up
+COUNTRY = "Nigeria"  # The window's startup country
+
+# ---- Stubs: no audio, no key listener; written as modules so they import lazily ----
+STUB_MODULES = {
+    "vlc.py": """
+import types
+
+State = types.SimpleNamespace(NothingSpecial=0, Opening=1, Buffering=2, Playing=3, Paused=4, Stopped=5, Ended=6,
+                              Error=7)
+EventType = types.SimpleNamespace(MediaPlayerOpening=0, MediaPlayerBuffering=1, MediaPlayerPlaying=2,
+                                  MediaPlayerEncounteredError=3, MediaPlayerStopped=4, MediaPlayerEndReached=5)
+
+
+class _EventManager:
+    def event_attach(self, *args):
+        pass
+
+    def event_detach(self, *args):
+        pass
+
+
+class MediaPlayer:
+    def __init__(self, *args):
+        self._state = 0
+
+    def event_manager(self):
+        return _EventManager()
+
+    def set_media(self, media):
+        pass
+
+    def play(self):
+        self._state = 3
+        return 0
+
+    def stop(self):
+        self._state = 5
+
+    def release(self):
+        pass
+
+    def get_state(self):
+        return self._state
+
+    def is_playing(self):
+        return 1 if self._state == 3 else 0
+
+    def audio_get_volume(self):
+        return 100
+
+    def audio_set_volume(self, volume):
+        pass
+
+    def audio_set_mute(self, mute):
+        pass
+
+
+def Media(url, *args):
+    return url
+""",
+    "pynput/__init__.py": "",
+    "pynput/keyboard.py": """
+import threading
+
+
+class Key:
+    media_play_pause, media_next, media_previous = "play_pause", "next", "previous"
+
+
+class Listener:
+    def __init__(self, on_press=None):
+        self._stopped = threading.Event()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def join(self):
+        self._stopped.wait()
+""",
+}
+
+
+def use_data_dir(data_dir):
+    """Point the app's cache and config directories into `data_dir` (before anything imports them)."""
+    import paths
+    cache_dir = os.path.join(data_dir, "cache")
+    config_dir = os.path.join(data_dir, "config")
+    os.makedirs(cache_dir, exist_ok=True)
+    os.makedirs(config_dir, exist_ok=True)
+    paths.user_cache_dir = lambda: cache_dir
+    paths.user_config_dir = lambda: config_dir
+
+
+def prepare(data_dir, stations):
+    """Write the stub modules and seed a fresh catalog for the startup country."""
+    for name, source in STUB_MODULES.items():
+        path = os.path.join(data_dir, "stubs", name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(source.lstrip())
+
+    sys.path.insert(0, ROOT)
+    use_data_dir(data_dir)
+    from catalog_cache import get_catalog_cache
+    from station import stations_from_dicts
+    from station_memory import synthetic_api_catalog
+    catalog = json.loads(synthetic_api_catalog(stations))
+    for i, station in enumerate(catalog):
+        station["url"] = station["url_resolved"] = f"http://127.0.0.1:9/{i}"  # Probes are refused at once
+    get_catalog_cache().store(COUNTRY, stations_from_dicts(catalog))
+
+
+def child(data_dir):
+    """One measured startup; prints a JSON line with the timings."""
+    started = time.perf_counter()
+    sys.path.insert(0, ROOT)
+    sys.path.insert(0, os.path.join(data_dir, "stubs"))
+    use_data_dir(data_dir)
+    import mirrors
+    mirrors._shared_pool = mirrors.MirrorPool(["http://127.0.0.1:9"], discover=False)  # Refuses every fetch
+
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication(sys.argv[:1])
+    import radio_window
+    imported = time.perf_counter()
+
+    window = radio_window.RadioWindow()
+    marks = {}
+    finish_startup = window.finish_startup
+
+    def after_first_paint():  # Scheduled by the first paintEvent, before deferred work starts
+        marks["painted"] = time.perf_counter()
+        marks["vlc"] = "vlc" in sys.modules
+        marks["pynput"] = "pynput" in sys.modules
+        finish_startup()
+
+    window.finish_startup = after_first_paint
+    window.show()
+    while "painted" not in marks:
+        app.processEvents()
+    painted = marks["painted"]
+
+    interactive = None
+    while time.perf_counter() - painted < LIST_TIMEOUT:
+        app.processEvents()
+        if window.station_model.station_at(0) is not None:
+            interactive = time.perf_counter()
+            break
+        time.sleep(0.001)
+
+    print(json.dumps({
+        "import_s": imported - started,
+        "window_s": painted - started,
+        "interactive_s": None if interactive is None else interactive - started,
+        "vlc_loaded_at_paint": marks["vlc"],
+        "pynput_loaded_at_paint": marks["pynput"],
+    }))
+    os._exit(0)  # Skip teardown of background threads; it is not part of startup
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--stations", type=int, default=300, help="Size of the seeded catalog")
+    parser.add_argument("--offscreen", action="store_true", help="Use Qt's offscreen platform (no display needed)")
+    parser.add_argument("--child", metavar="DATA_DIR", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.child)
+        return
+
+    env = dict(os.environ)
+    if args.offscreen:
+        env["QT_QPA_PLATFORM"] = "offscreen"
+
+    results = []
+    with tempfile.TemporaryDirectory() as data_dir:
+        prepare(data_dir, args.stations)
+        for _ in range(args.runs):
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--child", data_dir],
+                env=env, capture_output=True, text=True, check=True,
+            ).stdout
+            results.append(json.loads(output.strip().splitlines()[-1]))
+
+    def median_ms(key):
+        values = [r[key] for r in results if r[key] is not None]
+        return f"{statistics.median(values) * 1000:8.1f} ms" if values else "     n/a"
+
+    print(f"Runs:                        {len(results)}")
+    print(f"Imports:                     {median_ms('import_s')}")
+    print(f"Window painted:              {median_ms('window_s')}")
+    print(f"Station list interactive:    {median_ms('interactive_s')}")
+    print(f"libvlc loaded before paint:  {any(r['vlc_loaded_at_paint'] for r in results)}")
+    print(f"pynput loaded before paint:  {any(r['pynput_loaded_at_paint'] for r in results)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# benchmarks/station_memory.py
+"""
+Compare the memory used by a catalog held as raw Radio-Browser dicts with
+the same catalog held as compact Station records.
+
+Usage:
+    python benchmarks/station_memory.py [station_count]
+"""
+
+import gc
+import json
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from station import stations_from_dicts  # noqa: E402
+
+COUNTRIES = ["Nigeria", "South Africa", "Kenya", "Ghana", "Egypt", "Morocco", "Tanzania"]
+CODECS = ["MP3", "AAC", "AAC+", "OGG"]
+TAGS = ["news,talk", "music,pop", "gospel", "afrobeats,hiphop", "jazz", "sports,news"]
+LANGUAGES = ["english", "french", "arabic", "swahili", "yoruba", "hausa"]
+
+
+def synthetic_api_catalog(count, seed=1):
+    """
+    Radio-Browser shaped station dicts (the full set of ~30 fields),
+    round-tripped through JSON like a real response.
+    """
+    rng = random.Random(seed)
+    stations = []
+    for i in range(count):
+        country = rng.choice(COUNTRIES)
+        stations.append({
+            "changeuuid": f"{i:08x}-0000-4000-8000-{rng.getrandbits(48):012x}",
+            "stationuuid": f"{i:08x}-1111-4000-8000-{rng.getrandbits(48):012x}",
+            "serveruuid": None,
+            "name": f"{country} Radio {i}",
+            "url": f"http://stream{i % 97}.example.com:8000/live{i}",
+            "url_resolved": f"http://stream{i % 97}.example.com:8000/live{i}.mp3",
+            "homepage": f"https://radio{i}.example.com/",
+            "favicon": f"https://radio{i}.example.com/favicon.png",
+            "tags": rng.choice(TAGS),
+            "country": country,
+            "countrycode": country[:2].upper(),
+            "iso_3166_2": None,
+            "state": "",
+            "language": rng.choice(LANGUAGES),
+            "languagecodes": "en",
+            "votes": rng.randint(0, 5000),
+            "lastchangetime": "2024-01-01 00:00:00",
+            "lastchangetime_iso8601": "2024-01-01T00:00:00Z",
+            "codec": rng.choice(CODECS),
+            "bitrate": rng.choice([32, 64, 96, 128, 192]),
+            "hls": 0,
+            "lastcheckok": rng.choice([0, 1, 1, 1]),
+            "lastchecktime": "2024-01-02 00:00:00",
+            "lastchecktime_iso8601": "2024-01-02T00:00:00Z",
+            "lastcheckoktime": "2024-01-02 00:00:00",
+            "lastcheckoktime_iso8601": "2024-01-02T00:00:00Z",
+            "lastlocalchecktime": "2024-01-02 00:00:00",
+            "lastlocalchecktime_iso8601": "2024-01-02T00:00:00Z",
+            "clicktimestamp": "2024-01-03 00:00:00",
+            "clicktimestamp_iso8601": "2024-01-03T00:00:00Z",
+            "clickcount": rng.randint(0, 1000),
+            "clicktrend": rng.randint(-10, 10),
+            "ssl_error": 0,
+            "geo_lat": None,
+            "geo_long": None,
+            "has_extended_info": False,
+        })
+    return json.dumps(stations)
+
+
+def measure(build):
+    """Return (object, bytes allocated) for the object built by `build`."""
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, size
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    payload = synthetic_api_catalog(count)
+
+    dicts, dict_bytes = measure(lambda: json.loads(payload))
+    records, record_bytes = measure(lambda: stations_from_dicts(json.loads(payload)))
+    assert len(dicts) == len(records) == count
+
+    mib = 1024 * 1024
+    print(f"Stations:            {count}")
+    print(f"API dicts:           {dict_bytes / mib:8.1f} MiB ({dict_bytes / count:6.0f} B/station)")
+    print(f"Station records:     {record_bytes / mib:8.1f} MiB ({record_bytes / count:6.0f} B/station)")
+    print(f"Reduction:           {100.0 * (1 - record_bytes / dict_bytes):8.1f} %")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+# benchmarks/ui_hot_paths.py
+"""
+Time the RadioWindow hot paths on synthetic catalogs under Qt's offscreen
+platform, with VLC and the network stubbed out:
+
+    on_stations_fetched        a new catalog arrives (rank, index, show)
+    populate_station_list      the list is refilled
+    search                     typing a query (on_search_text_changed + run_search)
+    toggle_favorite            add and remove a favorite, repainting its star
+    highlight_station_in_list  select and bold a station by key
+
+Each operation includes the repaint that follows it. Results are written
+as JSON (with the commit they were measured at) so runs can be compared
+across commits; pass --baseline to print the ratios against an earlier
+results file.
+
+Usage:
+    python benchmarks/ui_hot_paths.py [--sizes 1000 10000 100000] [--repeat 5]
+                                      [--output ui_hot_paths.json] [--baseline old.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import types
+
+os.environ["QT_QPA_PLATFORM"] = "offscreen"
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from station_memory import synthetic_api_catalog  # noqa: E402
+
+
+# ---- Stubs: no audio, no key listener, no network, no real user files ----
+class _StubEventManager:
+    def event_attach(self, *args):
+        pass
+
+    def event_detach(self, *args):
+        pass
+
+
+class _StubMediaPlayer:
+    def __init__(self, *args):
+        self._state = 0
+
+    def event_manager(self):
+        return _StubEventManager()
+
+    def set_media(self, media):
+        pass
+
+    def play(self):
+        self._state = 3
+        return 0
+
+    def stop(self):
+        self._state = 5
+
+    def release(self):
+        pass
+
+    def get_state(self):
+        return self._state
+
+    def is_playing(self):
+        return 1 if self._state == 3 else 0
+
+    def audio_get_volume(self):
+        return 100
+
+    def audio_set_volume(self, volume):
+        pass
+
+    def audio_set_mute(self, mute):
+        pass
+
+
+def install_stubs(data_dir):
+    vlc = types.ModuleType("vlc")
+    vlc.MediaPlayer = _StubMediaPlayer
+    vlc.Media = lambda url, *args: url
+    vlc.State = types.SimpleNamespace(
+        NothingSpecial=0, Opening=1, Buffering=2, Playing=3, Paused=4, Stopped=5, Ended=6, Error=7
+    )
+    vlc.EventType = types.SimpleNamespace(
+        MediaPlayerOpening=0, MediaPlayerBuffering=1, MediaPlayerPlaying=2,
+        MediaPlayerEncounteredError=3, MediaPlayerStopped=4, MediaPlayerEndReached=5,
+    )
+    sys.modules["vlc"] = vlc
+
+    import paths
+    cache_dir = os.path.join(data_dir, "cache")
+    config_dir = os.path.join(data_dir, "config")
+    os.makedirs(cache_dir, exist_ok=True)
+    os.makedirs(config_dir, exist_ok=True)
+    paths.user_cache_dir = lambda: cache_dir
+    paths.user_config_dir = lambda: config_dir
+
+    import mirrors
+    mirrors._shared_pool = mirrors.MirrorPool(["http://127.0.0.1:9"], discover=False)  # Refuses any stray fetch
+
+
+def make_window():
+    import radio_window
+    from catalog_cache import get_catalog_cache
+    from station import stations_from_dicts
+    # A fresh cached catalog for the startup country: the window never fetches
+    get_catalog_cache().store("Nigeria", stations_from_dicts(json.loads(synthetic_api_catalog(100))))
+    window = radio_window.RadioWindow()
+    window.startup_finished = True  # Never start media keys, libvlc or the prefetcher
+    window.health.probe = lambda stations: None
+    window.radio_player.resolver.warm = lambda urls: None
+    window.show()
+    return window
+
+
+# ---- Measurement ----
+def timed(app, fn, repeat):
+    """Milliseconds per call of fn() followed by processing the resulting events."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        app.processEvents()
+        samples.append((time.perf_counter() - started) * 1000.0)
+    return {"median_ms": statistics.median(samples), "min_ms": min(samples), "max_ms": max(samples)}
+
+
+def run_size(app, window, size, repeat):
+    from station import stations_from_dicts
+    stations = stations_from_dicts(json.loads(synthetic_api_catalog(size)))
+    rng = random.Random(size)
+    window.search_bar.blockSignals(True)
+    window.search_bar.clear()
+    window.search_bar.blockSignals(False)
+
+    results = {"on_stations_fetched": timed(app, lambda: window.on_stations_fetched(stations), repeat)}
+    results["populate_station_list"] = timed(app, lambda: window.populate_station_list(window.all_stations), repeat)
+
+    def type_query():
+        for prefix in ("r", "ra", "rad", "radi", "radio", "radio 1"):
+            window.search_bar.setText(prefix)  # on_search_text_changed (debounce restart)
+            window.run_search()  # What the debounce timer then runs
+        window.search_bar.setText("")
+        window.run_search()
+    results["search"] = timed(app, type_query, repeat)
+
+    def toggle_favorite():
+        station = rng.choice(window.all_stations)
+        window.toggle_favorite(station)  # Add: favorites_changed -> update_station_star_icon
+        window.toggle_favorite(station)  # Remove
+    results["toggle_favorite"] = timed(app, toggle_favorite, repeat)
+
+    results["highlight_station_in_list"] = timed(
+        app, lambda: window.highlight_station_in_list(rng.choice(window.all_stations).key), repeat
+    )
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default="ui_hot_paths.json")
+    parser.add_argument("--baseline", help="Earlier results file to compare against")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        install_stubs(data_dir)
+        from PyQt6.QtCore import QT_VERSION_STR
+        from PyQt6.QtWidgets import QApplication
+        app = QApplication(sys.argv[:1])
+        window = make_window()
+
+        results = {}
+        for size in args.sizes:
+            results[str(size)] = run_size(app, window, size, args.repeat)
+        window.favorites_widget.store.flush()
+
+    report = {
+        "benchmark": "ui_hot_paths",
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "qt": QT_VERSION_STR,
+        "repeat": args.repeat,
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+    print(f"{'operation':28} {'stations':>9} {'median':>10} {'min':>10}" + (f" {'vs base':>8}" if baseline else ""))
+    for size, operations in results.items():
+        for name, stats in operations.items():
+            line = f"{name:28} {size:>9} {stats['median_ms']:8.2f}ms {stats['min_ms']:8.2f}ms"
+            if baseline:
+                old = baseline.get(size, {}).get(name)
+                line += f" {stats['median_ms'] / old['median_ms']:7.2f}x" if old else f" {'-':>8}"
+            print(line)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# cancel.py
+
+import threading
+import time
+
+
+class FetchCancelled(Exception):
+    """Raised when a request was cancelled or ran out of its deadline budget."""
+
+
+class CancelToken:
+    """
+    Cancellation flag plus an optional overall deadline, shared by every
+    request made on behalf of one load.
+
+    `cancel()` can be called from any thread (typically the UI thread when
+    a load is superseded); the threads doing the work poll `cancelled` or
+    call `check()` between blocking steps and bound each step's timeout by
+    `remaining()`.
+
+    A token made with a `parent` is also cancelled when the parent is, and
+    never outlives the parent's deadline; cancelling the child leaves the
+    parent alone. That scopes one step (such as a single hedged request) of
+    a larger load.
+    """
+
+    def __init__(self, deadline=None, parent=None):
+        """
+        Args:
+            deadline (float): Seconds from now after which the token counts as cancelled.
+            parent (CancelToken): Token whose cancellation and deadline this one inherits.
+        """
+        self._event = threading.Event()
+        self._expires_at = time.monotonic() + deadline if deadline is not None else None
+        self._parent = parent
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        if self._parent is not None and self._parent.cancelled:
+            return True
+        return self._event.is_set() or self.remaining() == 0.0
+
+    def remaining(self):
+        """Seconds left before the deadline (None without a deadline)."""
+        remaining = None if self._parent is None else self._parent.remaining()
+        if self._expires_at is not None:
+            own = max(0.0, self._expires_at - time.monotonic())
+            remaining = own if remaining is None else min(own, remaining)
+        return remaining
+
+    def timeout(self, limit):
+        """`limit` capped by the remaining budget, for a single blocking call."""
+        remaining = self.remaining()
+        return limit if remaining is None else min(limit, remaining)
+
+    def check(self):
+        """Raise FetchCancelled if the token was cancelled or its deadline passed."""
+        if self._parent is not None:
+            self._parent.check()
+        if self._event.is_set():
+            raise FetchCancelled("cancelled")
+        if self.remaining() == 0.0:
+            raise FetchCancelled("deadline exceeded")
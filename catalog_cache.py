@@ -0,0 +1,143 @@
+# catalog_cache.py
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+
+from constants import CATALOG_CACHE_TTL, CATALOG_CACHE_MAX_STALE
+from paths import user_cache_dir
+from station import stations_from_dicts
+
+log = logging.getLogger(__name__)
+
+
+class CatalogEntry:
+    """
+    A cached station list (Station records) for one country, together with
+    the HTTP validators needed to revalidate it with a conditional GET.
+    """
+
+    def __init__(self, country, stations, fetched_at, etag=None, last_modified=None, digest=None):
+        self.country = country
+        self.stations = stations
+        self.fetched_at = fetched_at
+        self.etag = etag
+        self.last_modified = last_modified
+        self.digest = digest
+
+    @property
+    def age(self):
+        return time.time() - self.fetched_at
+
+    def is_fresh(self):
+        """True while the entry can be served without asking the server."""
+        return self.age < CATALOG_CACHE_TTL
+
+    def is_usable(self):
+        """True while the entry can still be shown (stale-while-revalidate)."""
+        return self.age < CATALOG_CACHE_MAX_STALE
+
+
+class CatalogCache:
+    """
+    Persistent per-country station catalog cache.
+    Each country is stored as one JSON file in the user cache directory and
+    mirrored in memory, so repeated lookups never touch the disk.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory or os.path.join(user_cache_dir(), "catalog")
+        os.makedirs(self.directory, exist_ok=True)
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def _path(self, country):
+        safe_name = re.sub(r"[^A-Za-z0-9_-]+", "_", country).lower()
+        return os.path.join(self.directory, f"{safe_name}.json")
+
+    def load(self, country):
+        """
+        Return the cached CatalogEntry for a country, or None if there is no
+        usable entry (missing, unreadable or older than CATALOG_CACHE_MAX_STALE).
+        """
+        with self._lock:
+            entry = self._entries.get(country)
+        if entry is None:
+            entry = self._read(country)
+            if entry is not None:
+                with self._lock:
+                    self._entries[country] = entry
+        if entry is not None and entry.is_usable():
+            return entry
+        return None
+
+    def _read(self, country):
+        try:
+            with open(self._path(country), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return CatalogEntry(
+                country=country,
+                stations=stations_from_dicts(data["stations"]),
+                fetched_at=data["fetched_at"],
+                etag=data.get("etag"),
+                last_modified=data.get("last_modified"),
+                digest=data.get("digest"),
+            )
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            log.warning("Ignoring unreadable catalog cache for %s: %s", country, e)
+            return None
+
+    def store(self, country, stations, etag=None, last_modified=None, digest=None):
+        """Save a freshly downloaded station list and its validators."""
+        entry = CatalogEntry(country, stations, time.time(), etag, last_modified, digest)
+        with self._lock:
+            self._entries[country] = entry
+        self._write(entry)
+        return entry
+
+    def touch(self, country):
+        """Mark a cached entry as fresh again (the server answered 304 Not Modified)."""
+        entry = self.load(country)
+        if entry is None:
+            return None
+        entry.fetched_at = time.time()
+        self._write(entry)
+        return entry
+
+    def _write(self, entry):
+        path = self._path(entry.country)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        data = {
+            "country": entry.country,
+            "fetched_at": entry.fetched_at,
+            "etag": entry.etag,
+            "last_modified": entry.last_modified,
+            "digest": entry.digest,
+            "stations": [station.to_dict() for station in entry.stations],
+        }
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_path, path)  # Atomic, so a crash never leaves a half-written file
+        except OSError as e:
+            log.warning("Could not write catalog cache for %s: %s", entry.country, e)
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+
+_shared_cache = None
+
+
+def get_catalog_cache():
+    """Return the process-wide CatalogCache, creating it on first use."""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = CatalogCache()
+    return _shared_cache
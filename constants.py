@@ -1,9 +1,94 @@
 # constants.py
 
-API_URL = "https://de1.api.radio-browser.info/json/stations"
+APP_NAME = "SmoothAfricanRadioPlayer"
+
+# Radio-Browser API mirrors
+API_DISCOVERY_HOST = "all.api.radio-browser.info"  # DNS name listing every live mirror
+API_FALLBACK_MIRRORS = [
+    "https://de1.api.radio-browser.info",
+    "https://nl1.api.radio-browser.info",
+    "https://at1.api.radio-browser.info",
+]
+API_STATIONS_PATH = "/json/stations"
+API_REQUEST_TIMEOUT = 6           # Per-request timeout (seconds)
+API_HEDGE_DELAY_MIN = 0.25        # Never hedge earlier than this (seconds)
+API_HEDGE_DELAY_DEFAULT = 1.5     # Hedge delay while a mirror has no latency history
+API_CIRCUIT_FAILURES = 3          # Consecutive failures before a mirror is ejected
+API_CIRCUIT_COOLDOWN = 60         # Seconds before an ejected mirror gets a trial request
+API_POOL_CONNECTIONS = 8          # Keep-alive connections kept per mirror
+
+# Country loads
+FETCH_DEADLINE = 20               # Overall budget (seconds) for loading one country, all mirrors included
+FETCH_CANCEL_POLL = 0.1           # How often a waiting request checks for cancellation (seconds)
+FETCH_CHUNK_SIZE = 64 * 1024      # Response bodies are read in chunks this size, checking for cancellation
+COUNTRY_DEBOUNCE_MS = 250         # Load a country only once the combo selection has rested this long
+
+# Background catalog prefetch
+PREFETCH_MAX_IN_FLIGHT = 3        # Countries fetched concurrently during warm-up
 
 AFRICAN_COUNTRIES = [
     "Nigeria", "South Africa", "Kenya", "Ghana", "Egypt", "Morocco", "Tanzania",
     "Algeria", "Uganda", "Ethiopia", "Sudan", "Angola", "Cameroon", "Senegal",
     "Zimbabwe", "Rwanda", "Botswana", "Mozambique", "Namibia", "Zambia"
 ]
+
+# Station catalog cache (seconds)
+CATALOG_CACHE_TTL = 6 * 60 * 60          # Served without revalidation while younger than this
+CATALOG_CACHE_MAX_STALE = 30 * 24 * 60 * 60  # Served (and revalidated) until this age, then dropped
+
+# Search
+SEARCH_DEBOUNCE_MS = 150  # Wait this long after the last keystroke before searching
+
+# Favorites
+FAVORITES_WRITE_DELAY = 1.0  # Seconds to coalesce favorite changes before writing them to disk
+
+# Playback
+PLAYBACK_START_DEADLINE_MS = 15000  # Give up on a stream that has not started playing by then
+STANDBY_MAX_PREBUFFERS = 2          # Muted standby players kept buffering likely next stations
+STANDBY_MAX_AGE = 90                # Seconds an unused standby player is kept before release
+STANDBY_HOVER_DELAY_MS = 400        # Hover this long over a row before pre-buffering it
+
+# Stream health probing
+HEALTH_PROBE_TIMEOUT = 5            # Seconds allowed for connect and for the first byte
+HEALTH_MAX_CONCURRENT = 8           # Streams probed at once
+HEALTH_CACHE_TTL = 30 * 60          # Seconds a probe result is trusted
+HEALTH_LATENCY_STEP_MS = 250        # Probed latencies within one step rank as equal (then by bitrate)
+
+# Reconnecting after playback errors
+RECONNECT_BASE_DELAY = 1.0          # Seconds before the first retry (doubled per attempt, jittered)
+RECONNECT_MAX_DELAY = 30.0          # Longest wait between two attempts
+RECONNECT_MAX_ATTEMPTS = 6          # Attempts before giving up on an outage
+RECONNECT_ATTEMPT_TIMEOUT_MS = 12000  # An attempt that has not started playing by then has failed
+
+# Playlist (.pls/.m3u) resolution
+PLAYLIST_CACHE_TTL = 24 * 60 * 60   # Seconds a playlist's resolved stream URL is reused
+PLAYLIST_FETCH_TIMEOUT = 5          # Seconds allowed to download a playlist
+PLAYLIST_MAX_CONCURRENT = 4         # Playlists resolved at once
+PLAYLIST_MAX_BYTES = 64 * 1024      # Playlists larger than this are truncated
+PLAYLIST_WRITE_DELAY = 2.0          # Seconds to coalesce new resolutions before saving the cache file
+
+# Logging and metrics
+LOG_RATE_LIMIT = 20                 # Log records let through per call site per window
+LOG_RATE_WINDOW = 10.0              # Seconds; records beyond the limit are counted, not printed
+METRICS_WRITE_INTERVAL = 30         # Seconds between two writes of the metrics file
+METRICS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)  # Span histogram bounds
+
+# UI stall watchdog
+WATCHDOG_HEARTBEAT_MS = 100          # The UI thread checks in this often
+WATCHDOG_STALL_THRESHOLD = 1.0       # Seconds without a heartbeat that count as a stall
+WATCHDOG_LOG_MAX_BYTES = 1024 * 1024 # Size at which the diagnostics file is rolled over
+WATCHDOG_LOG_BACKUPS = 3             # Rolled-over diagnostics files kept
+
+# Headless mode
+CONTROL_PORT = 8765                 # Loopback port of the headless control API
+CONTROL_CALL_TIMEOUT = 5.0          # Seconds a control request waits for the player thread
+CONTROL_SEARCH_LIMIT = 50           # Search results returned when the request sets no limit
+CONTROL_MAX_BODY = 64 * 1024        # Largest request body accepted
+
+# Stream recording
+RECORDING_SEGMENT_SECONDS = 15 * 60          # A new file is started every this many seconds
+RECORDING_DISK_BUDGET = 2 * 1024 ** 3        # Bytes all recordings may use; the oldest segments are deleted beyond it
+RECORDING_MAX_CONCURRENT = 4                 # Recordings running at once
+RECORDING_CHUNK_SIZE = 16 * 1024             # Bytes read from the network at a time
+RECORDING_QUEUE_CHUNKS = 512                 # Chunks buffered between network and disk; more are dropped
+RECORDING_READ_TIMEOUT = 15                  # Seconds without data before a recording reconnects
@@ -1,17 +1,73 @@
-from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QListWidget, QPushButton
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, pyqtSignal
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QListView, QPushButton
+
+from favorites_store import FavoritesStore
+from asset_cache import get_asset_cache
+
+class FavoritesListModel(QAbstractListModel):
+    """
+    List model over a FavoritesStore.
+    Adding or removing a favorite inserts or removes exactly one row instead
+    of rebuilding the list.
+    """
+    KeyRole = Qt.ItemDataRole.UserRole  # The favorite's stationuuid
+
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.store = store
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.store)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self.store):
+            return None
+        favorite = self.store.at(index.row())
+        if role == Qt.ItemDataRole.DisplayRole:
+            return favorite["name"]
+        if role == Qt.ItemDataRole.DecorationRole:
+            return get_asset_cache().icon("star_full.png", 16)  # One shared icon for every row
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return favorite.get("country")
+        if role == self.KeyRole:
+            return favorite.get("stationuuid") or favorite.get("url")
+        return None
+
+    def add(self, station, country=None):
+        if station.key in self.store:
+            return
+        row = len(self.store)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.store.add(station, country)
+        self.endInsertRows()
+
+    def remove(self, key):
+        row = self.store.row_of(key)
+        if row is None:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        self.store.remove(key)
+        self.endRemoveRows()
+
+    def clear(self):
+        self.beginResetModel()
+        self.store.clear()
+        self.endResetModel()
 
 class Favorites(QWidget):
     """
     Favorites class widget for the RadioWindow.
     This widget displays the list of favorite radio stations.
     """
-    # Define the signal to emit the station name when double-clicked
+    # Define the signal to emit the station key (stationuuid) when double-clicked
     station_selected = pyqtSignal(str)
+    # Emitted with the key of a station whose favorite state changed ("" after clearing all)
+    favorites_changed = pyqtSignal(str)
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, store=None):
         super().__init__(parent)
-        self.favorites = []
+        self.store = store or FavoritesStore()
+        self.model = FavoritesListModel(self.store, self)
         self.parent_window = parent  # Reference to the main window using this widget
         self.init_ui()
 
@@ -32,8 +88,11 @@ class Favorites(QWidget):
         self.layout.addWidget(self.favorites_label)
 
         # Favorites list
-        self.favorites_list = QListWidget()
-        self.favorites_list.itemDoubleClicked.connect(self.on_item_double_clicked)  # Connect double-click signal
+        self.favorites_list = QListView()
+        self.favorites_list.setModel(self.model)
+        self.favorites_list.setUniformItemSizes(True)
+        self.favorites_list.setEditTriggers(QListView.EditTrigger.NoEditTriggers)
+        self.favorites_list.doubleClicked.connect(self.on_item_double_clicked)  # Connect double-click signal
         self.layout.addWidget(self.favorites_list)
 
         # Clear favorites button
@@ -41,72 +100,73 @@ class Favorites(QWidget):
         self.clear_button.clicked.connect(self.clear_favorites)
         self.layout.addWidget(self.clear_button)
 
-    def is_favorite(self, station_name):
-        """Check if a station is in the favorites list."""
-        return station_name in [self.favorites_list.item(i).text() for i in range(self.favorites_list.count())]
+    def is_favorite(self, station_key):
+        """Check if a station (by stationuuid) is a favorite. O(1)."""
+        return station_key in self.store
 
-    def add_favorite(self, station_data):
+    def add_favorite(self, station, country=None):
         """
         Add a station to the favorites list.
         Args:
-            station_data (dict): A dictionary containing 'name' and 'country' keys.
+            station (Station): The station to add.
+            country (str): Country to file it under (defaults to the station's own).
         """
-        if station_data not in self.favorites:
-            self.favorites.append(station_data)
-
-            # Add the station name to the QListWidget for display
-            station_name = station_data["name"]
-            self.favorites_list.addItem(station_name)
+        self.model.add(station, country)
+        self.favorites_changed.emit(station.key)
 
-            # Update the UI
-            self.update_favorites_list()
-
-    def remove_favorite(self, station_name):
+    def remove_favorite(self, station_key):
         """
         Remove a station from the favorites list.
         Args:
-            station_name (str): The name of the station to remove.
+            station_key (str): The stationuuid of the station to remove.
         """
-        self.favorites = [f for f in self.favorites if f["name"] != station_name]
-
-        # Remove the station from the QListWidget
-        items = self.favorites_list.findItems(station_name, Qt.MatchFlag.MatchExactly)
-        for item in items:
-            self.favorites_list.takeItem(self.favorites_list.row(item))
-
-        # Update the UI
-        self.update_favorites_list()
+        self.model.remove(station_key)
+        self.favorites_changed.emit(station_key)
 
     def clear_favorites(self):
         """
         Clears all items from the Favorites list.
         """
-        self.favorites_list.clear()
+        self.model.clear()
+        self.favorites_changed.emit("")
         if self.parent_window:
             self.parent_window.show_message("Cleared", "All Favorites have been cleared.")
 
-    def on_item_double_clicked(self, item):
-        """Emit the station name when a favorite station is double-clicked."""
-        station_name = item.text()
-        self.station_selected.emit(station_name)  # Emit the signal with the selected station name
+    def on_item_double_clicked(self, index):
+        """Emit the station key when a favorite station is double-clicked."""
+        station_key = index.data(FavoritesListModel.KeyRole)
+        if station_key:
+            self.station_selected.emit(station_key)  # Emit the signal with the selected station key
 
-    def get_favorite_data(self, station_name):
+    def get_favorite_data(self, station_key):
         """
-        Get the favorite data (dict) for the given station name.
+        Get the favorite data (dict) for the given station key.
         Args:
-            station_name (str): The name of the station.
+            station_key (str): The stationuuid of the station.
         Returns:
-            dict or None: The favorite data or None if not found.
+            dict or None: The favorite data (name, country, url, ...) or None if not found.
         """
-        return next((f for f in self.favorites if f["name"] == station_name), None)
-    
-    def update_favorites_list(self):
-        """
-        Refresh the favorites list display in the QListWidget.
-        This ensures the UI reflects the current state of the favorites.
-        """
-        self.favorites_list.clear()  # Clear the current display
-
-        # Add all favorites back to the QListWidget
-        for favorite in self.favorites:
-            self.favorites_list.addItem(favorite["name"])
\ No newline at end of file
+        return self.store.get(station_key)
+
+    def favorite_countries(self):
+        """Countries of all favorites, in display order."""
+        return self.store.countries()
+
+    def selected_key(self):
+        """Key of the selected favorite, or None."""
+        index = self.favorites_list.currentIndex()
+        if not index.isValid() or not self.favorites_list.selectionModel().isSelected(index):
+            return None
+        return index.data(FavoritesListModel.KeyRole)
+
+    def select(self, station_key):
+        """Select the favorite with the given key. Returns True if it exists."""
+        row = self.store.row_of(station_key)
+        if row is None:
+            return False
+        self.favorites_list.setCurrentIndex(self.model.index(row))
+        return True
+
+    def clear_selection(self):
+        self.favorites_list.clearSelection()
+        self.favorites_list.setCurrentIndex(QModelIndex())
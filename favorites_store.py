@@ -0,0 +1,119 @@
+# favorites_store.py
+
+import logging
+import os
+import threading
+
+from constants import FAVORITES_WRITE_DELAY
+from json_store import WriteBehindJSON
+from paths import user_config_dir
+
+log = logging.getLogger(__name__)
+
+
+class FavoritesStore:
+    """
+    Favorite stations keyed by stationuuid.
+
+    Membership is a dict lookup, so checking a station costs the same with
+    one favorite or a thousand. Changes are written behind: they are
+    coalesced for FAVORITES_WRITE_DELAY seconds and then saved atomically
+    (temporary file + rename) on a timer thread, and flushed at exit.
+    """
+
+    def __init__(self, path=None, write_delay=FAVORITES_WRITE_DELAY):
+        self.path = path or os.path.join(user_config_dir(), "favorites.json")
+        self._records = {}  # key -> favorite dict
+        self._order = []  # keys in display order
+        self._lock = threading.RLock()
+        self._file = WriteBehindJSON(self.path, self._snapshot, write_delay, "favorites", indent=1)
+        self.load()
+
+    # ---- Queries ----
+    def __len__(self):
+        return len(self._records)
+
+    def __contains__(self, key):
+        return key in self._records
+
+    def keys(self):
+        return list(self._order)
+
+    def get(self, key):
+        """Favorite dict for `key`, or None."""
+        return self._records.get(key)
+
+    def at(self, row):
+        """Favorite dict at display position `row`."""
+        return self._records[self._order[row]]
+
+    def row_of(self, key):
+        """Display position of `key`, or None."""
+        if key not in self._records:
+            return None
+        return self._order.index(key)
+
+    def countries(self):
+        return [self._records[key]["country"] for key in self._order if self._records[key].get("country")]
+
+    # ---- Changes ----
+    def add(self, station, country=None):
+        """
+        Add a Station as a favorite.
+        Returns the new display row, or None if it was already a favorite.
+        """
+        key = station.key
+        with self._lock:
+            if key in self._records:
+                return None
+            self._records[key] = {
+                "stationuuid": station.stationuuid,
+                "name": station.name,
+                "country": country or station.country,
+                "url": station.url,
+                "url_resolved": station.url_resolved,
+            }
+            self._order.append(key)
+            self._file.mark_dirty()
+            return len(self._order) - 1
+
+    def remove(self, key):
+        """Remove a favorite. Returns its former display row, or None."""
+        with self._lock:
+            row = self.row_of(key)
+            if row is None:
+                return None
+            del self._records[key]
+            del self._order[row]
+            self._file.mark_dirty()
+            return row
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+            self._order.clear()
+            self._file.mark_dirty()
+
+    # ---- Persistence ----
+    def load(self):
+        records = self._file.load()
+        if records is None:
+            return
+        if not isinstance(records, list):
+            log.warning("Ignoring favorites in %s: expected a list, found %s", self.path, type(records).__name__)
+            return
+        for record in records:
+            if not isinstance(record, dict):
+                continue
+            key = record.get("stationuuid") or record.get("url")
+            if key and key not in self._records:
+                self._records[key] = record
+                self._order.append(key)
+
+    def _snapshot(self):
+        with self._lock:
+            return [self._records[key] for key in self._order]
+
+    def flush(self):
+        """Write pending changes now."""
+        self._file.flush()
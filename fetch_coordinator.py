@@ -0,0 +1,105 @@
+# fetch_coordinator.py
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from api import FetchStationsWorker, catalog_flights
+from constants import COUNTRY_DEBOUNCE_MS
+
+
+class CountryFetchCoordinator(QObject):
+    """
+    Decides which country loads actually run.
+
+    Selections are debounced: scrolling through the country combo with the
+    keyboard only loads the country the user stops on. Starting a load
+    cancels the previous one (without waiting for it), and concurrent
+    refreshes of the same country by the UI and the prefetcher share one
+    request through `api.catalog_flights`.
+    """
+    stations = pyqtSignal(str, list)  # country, Station records (cached copy first, then revalidated)
+
+    def __init__(self, debounce_ms=COUNTRY_DEBOUNCE_MS, parent=None):
+        super().__init__(parent)
+        self._pending_country = None
+        self._pending_emit_cached = True
+        self._worker = None
+        self._retired = set()  # Cancelled workers, kept referenced until their thread exits
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(debounce_ms)
+        self._timer.timeout.connect(self.flush)
+
+        self.requested = 0   # Selections received
+        self.debounced = 0   # Selections replaced by a newer one before their load started
+        self.superseded = 0  # Loads cancelled in flight by a newer selection
+
+    def request(self, country, immediate=False, emit_cached=True):
+        """
+        Load `country` once the selection has settled.
+        Args:
+            country (str): Country to load.
+            immediate (bool): Skip the debounce (initial load, favorites).
+            emit_cached (bool): Emit the cached list before revalidating
+                (False when the caller already shows it).
+        """
+        self.requested += 1
+        if self._pending_country is not None:
+            self.debounced += 1
+        self._pending_country = country
+        self._pending_emit_cached = emit_cached
+        if immediate:
+            self.flush()
+        else:
+            self._timer.start()  # Restarted by every selection
+
+    def flush(self):
+        """Start the pending load now."""
+        self._timer.stop()
+        country, self._pending_country = self._pending_country, None
+        if country is None:
+            return
+        self._stop_worker()
+        worker = FetchStationsWorker(country, emit_cached=self._pending_emit_cached)
+        worker.cached.connect(lambda stations, w=worker: self._on_worker_stations(w, stations))
+        worker.finished.connect(lambda stations, w=worker: self._on_worker_stations(w, stations))
+        self._worker = worker
+        worker.start()
+
+    def cancel(self):
+        """Drop the pending selection and cancel the running load. Never blocks."""
+        self._timer.stop()
+        if self._pending_country is not None:
+            self._pending_country = None
+            self.debounced += 1
+        self._stop_worker()
+
+    def _stop_worker(self):
+        worker, self._worker = self._worker, None
+        self._retired = {w for w in self._retired if w.isRunning()}
+        if worker is not None and worker.isRunning():
+            worker.stop()
+            self.superseded += 1
+            self._retired.add(worker)
+
+    def _on_worker_stations(self, worker, stations):
+        # Results of a superseded worker may still be queued: drop them
+        if worker is self._worker:
+            self.stations.emit(worker.country, stations)
+
+    def stats(self):
+        """
+        Counters so far. `coalesced` counts fetches that joined a request
+        already in flight; `cancelled` counts selections that were debounced
+        away or cancelled while loading; `aborted` counts network requests
+        actually cut off because nobody was waiting for them any more.
+        """
+        flights = catalog_flights.stats()
+        return {
+            "requested": self.requested,
+            "network_calls": flights["started"],
+            "coalesced": flights["coalesced"],
+            "cancelled": self.debounced + self.superseded,
+            "debounced": self.debounced,
+            "superseded": self.superseded,
+            "aborted": flights["cancelled"],
+        }
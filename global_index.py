@@ -0,0 +1,178 @@
+# global_index.py
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from paths import user_cache_dir
+from search import normalize
+from station import Station
+
+log = logging.getLogger(__name__)
+
+GLOBAL_SEARCH_LIMIT = 500
+INDEX_VERSION = 2  # Bumped when search_text is built differently; older indexes are rebuilt
+
+
+def _fts5_available(connection):
+    try:
+        connection.execute("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)")
+        connection.execute("DROP TABLE temp.fts5_probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+class GlobalStationIndex:
+    """
+    Local full-text index over every station fetched for any country.
+
+    Backed by SQLite FTS5 (with a LIKE-based fallback where FTS5 is not
+    compiled in). Countries are replaced one at a time as their catalogs
+    arrive, and skipped when the catalog digest has not changed.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(user_cache_dir(), "stations.db")
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self.fts5 = _fts5_available(self._db)
+        self._create_schema()
+
+    def _create_schema(self):
+        with self._lock, self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS countries (country TEXT PRIMARY KEY, digest TEXT, count INTEGER)"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS stations ("
+                " rowid INTEGER PRIMARY KEY, uuid TEXT, country TEXT, search_text TEXT, data TEXT)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS stations_country ON stations(country)")
+            if self.fts5:
+                self._db.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS stations_fts USING fts5("
+                    " search_text, content='stations', content_rowid='rowid',"
+                    " tokenize='unicode61 remove_diacritics 2')"
+                )
+            if self._db.execute("PRAGMA user_version").fetchone()[0] < INDEX_VERSION:
+                # Built with an older normalization: drop it, catalogs are re-indexed as they load
+                if self.fts5:
+                    self._db.execute("INSERT INTO stations_fts(stations_fts) VALUES ('delete-all')")
+                self._db.execute("DELETE FROM stations")
+                self._db.execute("DELETE FROM countries")
+                self._db.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+
+    def indexed_digest(self, country):
+        with self._lock:
+            row = self._db.execute("SELECT digest FROM countries WHERE country = ?", (country,)).fetchone()
+        return row[0] if row else None
+
+    def update_country(self, country, stations, digest=None):
+        """
+        Replace the indexed stations of one country.
+        Nothing is written when `digest` matches the indexed catalog.
+        """
+        if digest is not None and digest == self.indexed_digest(country):
+            return False
+
+        rows = []
+        for station in stations:
+            text = normalize(" ".join(
+                (station.name, station.tags, station.language, station.codec, station.country)
+            ))
+            rows.append((station.stationuuid, country, text, json.dumps(station.to_dict(), separators=(",", ":"))))
+
+        with self._lock, self._db:
+            if self.fts5:
+                # External-content FTS tables need the old rows removed explicitly
+                self._db.execute(
+                    "INSERT INTO stations_fts(stations_fts, rowid, search_text) "
+                    "SELECT 'delete', rowid, search_text FROM stations WHERE country = ?",
+                    (country,),
+                )
+            self._db.execute("DELETE FROM stations WHERE country = ?", (country,))
+            cursor = self._db.cursor()
+            cursor.executemany(
+                "INSERT INTO stations(uuid, country, search_text, data) VALUES (?, ?, ?, ?)", rows
+            )
+            if self.fts5:
+                self._db.execute(
+                    "INSERT INTO stations_fts(rowid, search_text) "
+                    "SELECT rowid, search_text FROM stations WHERE country = ?",
+                    (country,),
+                )
+            self._db.execute(
+                "INSERT OR REPLACE INTO countries(country, digest, count) VALUES (?, ?, ?)",
+                (country, digest, len(rows)),
+            )
+        return True
+
+    def search(self, query, limit=GLOBAL_SEARCH_LIMIT):
+        """
+        Return up to `limit` Station records from any country matching every
+        word of `query` (word-prefix match), best matches first.
+        """
+        tokens = normalize(query).split()
+        if not tokens:
+            return []
+
+        if self.fts5:
+            match = " AND ".join(f'"{token}"*' for token in tokens)
+            sql = (
+                "SELECT s.data FROM stations_fts f JOIN stations s ON s.rowid = f.rowid "
+                "WHERE stations_fts MATCH ? ORDER BY f.rank LIMIT ?"
+            )
+            params = (match, limit)
+        else:
+            sql = "SELECT data FROM stations WHERE " + " AND ".join(
+                "search_text LIKE ?" for _ in tokens
+            ) + " LIMIT ?"
+            params = tuple(f"%{token}%" for token in tokens) + (limit,)
+
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        return [Station.from_dict(json.loads(row[0])) for row in rows]
+
+    def count(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM stations").fetchone()[0]
+
+
+_shared_index = None
+_shared_index_lock = threading.Lock()
+
+
+def get_global_index():
+    """Return the process-wide GlobalStationIndex, creating it on first use."""
+    global _shared_index
+    with _shared_index_lock:
+        if _shared_index is None:
+            _shared_index = GlobalStationIndex()
+        return _shared_index
+
+
+class GlobalSearchWorker(QThread):
+    """
+    Runs one global search off the UI thread.
+    Emits the query together with the results so stale answers can be dropped.
+    """
+    results = pyqtSignal(str, list)
+
+    def __init__(self, query):
+        super().__init__()
+        self.query = query
+
+    def run(self):
+        try:
+            stations = get_global_index().search(self.query)
+        except sqlite3.Error as e:
+            log.warning("Global search failed for '%s': %s", self.query, e)
+            stations = []
+        self.results.emit(self.query, stations)
@@ -0,0 +1,371 @@
+# headless.py
+
+import json
+import logging
+import signal
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+import metrics
+from constants import AFRICAN_COUNTRIES, CONTROL_CALL_TIMEOUT, CONTROL_SEARCH_LIMIT, CONTROL_MAX_BODY
+from favorites_store import FavoritesStore
+from fetch_coordinator import CountryFetchCoordinator
+from radio_player import RadioPlayer
+from recorder import RecordingError, get_recording_manager
+from search import StationSearchIndex, normalize
+
+log = logging.getLogger(__name__)
+
+
+class ControlError(Exception):
+    """A control request that cannot be carried out; `status` is the HTTP status to answer with."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _station_json(station):
+    return {
+        "key": station.key,
+        "name": station.name,
+        "country": station.country,
+        "url": station.url,
+        "codec": station.codec,
+        "bitrate": station.bitrate,
+        "tags": station.tags,
+    }
+
+
+class HeadlessRadio(QObject):
+    """
+    The player without a window: RadioPlayer, the country catalog loader
+    and favorites, driven by a JSON API on the loopback interface.
+
+    Every HTTP client is served on its own thread. Requests that touch the
+    player are handed to the Qt thread through a queued signal and answered
+    once it has run them (a few milliseconds: nothing there waits on the
+    network). Searches run on the client's thread against an immutable
+    index, so many clients searching at once never hold up playback.
+
+    Requests must name the server as 127.0.0.1:PORT or localhost:PORT in
+    their Host header, and POST bodies must be sent as application/json, so
+    a web page open in a browser on the same machine cannot drive the player
+    (DNS rebinding, or a cross-origin form post).
+
+    Endpoints:
+        GET  /status                  what is playing, volume, country and list size
+        GET  /search?q=TEXT&limit=N   stations of the current country matching TEXT
+        GET  /favorites               favorite stations
+        POST /play      {"key": ...} or {"url": ...}
+        POST /stop
+        POST /next, POST /previous
+        POST /volume    {"volume": 0-100}
+        POST /country   {"country": ...}
+        GET  /recordings              running recordings with their counters, disk usage
+        POST /record    {"key": ...}, {"url": ...} or {} for the current station
+        POST /record/stop {"key": ...}
+    """
+    _call = pyqtSignal(object)  # (function, Future), run on the Qt thread
+
+    def __init__(self, country="Nigeria", parent=None):
+        super().__init__(parent)
+        self.player = RadioPlayer(parent=self)
+        self.favorites = FavoritesStore()
+        self.recorder = get_recording_manager()
+        self.fetch_coordinator = CountryFetchCoordinator(parent=self)
+        self.fetch_coordinator.stations.connect(self._on_country_stations)
+        self.country = country
+        self.volume = 100
+        self.server = None
+
+        self._catalog = []  # Station list of the current country; replaced, never mutated
+        self._search_index = None  # (catalog, StationSearchIndex), built on first search
+        self._search_lock = threading.Lock()
+        self._call.connect(self._run_call)  # Queued: emitted from HTTP threads
+
+    # ---- Lifetime ----
+    def start(self, port, host="127.0.0.1"):
+        """Load the current country and start serving the control API on host:port."""
+        self.fetch_coordinator.request(self.country, immediate=True)
+        handler = type("Handler", (_ControlHandler,), {"radio": self})
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, name="control-http", daemon=True).start()
+        log.info("Control API listening on http://%s:%d", host, self.server.server_port)
+
+    def shutdown(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+        self.fetch_coordinator.cancel()
+        self.player.stop_station()
+        self.recorder.stop_all()
+        self.favorites.flush()
+
+    # ---- Qt thread ----
+    def call(self, fn):
+        """Run `fn()` on the Qt thread and return its result (called from HTTP threads)."""
+        future = Future()
+        self._call.emit((fn, future))
+        try:
+            return future.result(timeout=CONTROL_CALL_TIMEOUT)
+        except FutureTimeout:
+            raise ControlError(503, "player busy, try again")
+
+    def _run_call(self, item):
+        fn, future = item
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+
+    def _on_country_stations(self, country, stations):
+        if country != self.country or not stations:
+            return
+        self._catalog = stations
+        self.player.update_stations(stations)
+        log.info("Loaded %d stations for %s", len(stations), country)
+
+    # ---- Commands (Qt thread) ----
+    def status(self):
+        station = self.player.current_station
+        state = self.player.get_state()
+        return {
+            "playing": self.player.is_playing(),
+            "wants_playback": self.player.wants_playback,
+            "reconnecting": self.player.reconnect.active,
+            "state": None if state is None else str(state).rsplit(".", 1)[-1],  # vlc.State.Playing -> "Playing"
+            "station": _station_json(station) if station is not None else None,
+            "url": self.player.current_url or None,
+            "volume": self.volume,
+            "country": self.country,
+            "stations": len(self._catalog),
+            "favorites": len(self.favorites),
+        }
+
+    def play(self, key=None, url=None):
+        if key:
+            station = self.player.station_index.get(key)
+            if station is not None:
+                self.player.play(station)
+            else:
+                favorite = self.favorites.get(key)
+                if favorite is None:
+                    raise ControlError(404, f"no station with key {key!r} in {self.country} or favorites")
+                self.player.play_station(favorite["url"])
+        elif url:
+            if not self.player.is_valid_url(url):
+                raise ControlError(400, "url must be an http(s) URL")
+            self.player.play_station(url)
+        else:
+            raise ControlError(400, "give a station 'key' or a stream 'url'")
+        self.player.set_volume(self.volume)
+        return self.status()
+
+    def stop(self):
+        self.player.stop_station()
+        return self.status()
+
+    def next(self):
+        self.player.play_next_station()
+        return self.status()
+
+    def previous(self):
+        self.player.play_previous_station()
+        return self.status()
+
+    def set_volume(self, volume):
+        self.volume = max(0, min(int(volume), 100))
+        self.player.set_volume(self.volume)
+        return self.status()
+
+    def set_country(self, country):
+        if country not in AFRICAN_COUNTRIES:
+            raise ControlError(400, f"unknown country {country!r}")
+        if country != self.country:
+            self.country = country
+            self._catalog = []
+            self.fetch_coordinator.request(country, immediate=True)
+        return self.status()
+
+    def record(self, key=None, url=None):
+        """Record a station of the current country or the favorites, a stream URL, or what is playing."""
+        if key:
+            station = self.player.station_index.get(key)
+            if station is not None:
+                url, name = station.url, station.name
+            else:
+                favorite = self.favorites.get(key)
+                if favorite is None:
+                    raise ControlError(404, f"no station with key {key!r} in {self.country} or favorites")
+                url, name = favorite["url"], favorite["name"]
+        elif url:
+            if not self.player.is_valid_url(url):
+                raise ControlError(400, "url must be an http(s) URL")
+            key, name = url, url
+        else:
+            station = self.player.current_station
+            if station is None:
+                raise ControlError(400, "nothing is playing: give a station 'key' or a stream 'url'")
+            key, url, name = station.key, station.url, station.name
+        try:
+            return self.recorder.start(url, name=name, key=key).stats()
+        except RecordingError as e:
+            raise ControlError(409, str(e))
+
+    def stop_recording(self, key):
+        recording = self.recorder.stop(key)
+        if recording is None:
+            raise ControlError(404, f"{key!r} is not being recorded")
+        return recording.stats()
+
+    # ---- Queries (any thread) ----
+    def search(self, query, limit=CONTROL_SEARCH_LIMIT):
+        catalog = self._catalog
+        with self._search_lock:
+            if self._search_index is None or self._search_index[0] is not catalog:
+                self._search_index = (catalog, StationSearchIndex(catalog))
+            index = self._search_index[1]
+        tokens = normalize(query).split()
+        positions = index.search(tokens) if tokens or not query.strip() else []
+        return {
+            "query": query,
+            "total": len(positions),
+            "stations": [_station_json(index.stations[p]) for p in positions[:limit]],
+        }
+
+    def favorite_list(self):
+        return {"favorites": [self.favorites.get(key) for key in self.favorites.keys()]}
+
+
+class _ControlHandler(BaseHTTPRequestHandler):
+    radio = None  # Set on the subclass built by HeadlessRadio.start
+
+    def do_GET(self):
+        if not self._check_host():
+            return
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        routes = {
+            "/status": lambda: self.radio.call(self.radio.status),
+            "/search": lambda: self.radio.search(
+                query.get("q", [""])[0], _int_param(query.get("limit", [CONTROL_SEARCH_LIMIT])[0], "limit", minimum=0)
+            ),
+            "/favorites": self.radio.favorite_list,
+            "/recordings": self.radio.recorder.stats,
+        }
+        self._dispatch(routes.get(url.path))
+
+    def do_POST(self):
+        if not self._check_host():
+            return
+        url = urlsplit(self.path)
+        body = self._read_body()
+        if body is None:
+            return
+        radio = self.radio
+        routes = {
+            "/play": lambda: radio.call(lambda: radio.play(body.get("key"), body.get("url"))),
+            "/stop": lambda: radio.call(radio.stop),
+            "/next": lambda: radio.call(radio.next),
+            "/previous": lambda: radio.call(radio.previous),
+            "/volume": lambda: radio.call(partial(radio.set_volume, _int_param(body.get("volume"), "volume"))),
+            "/country": lambda: radio.call(lambda: radio.set_country(body.get("country"))),
+            "/record": lambda: radio.call(lambda: radio.record(body.get("key"), body.get("url"))),
+            "/record/stop": lambda: radio.stop_recording(body.get("key") or body.get("url")),
+        }
+        self._dispatch(routes.get(url.path))
+
+    def _check_host(self):
+        port = self.server.server_address[1]
+        if self.headers.get("Host", "").lower() not in (f"127.0.0.1:{port}", f"localhost:{port}"):
+            self._reply(403, {"error": "Host must be 127.0.0.1 or localhost with the server's port"})
+            return False
+        return True
+
+    def _read_body(self):
+        content_type = self.headers.get("Content-Type", "").split(";", 1)[0].strip().lower()
+        if content_type != "application/json":
+            self._reply(415, {"error": "Content-Type must be application/json"})
+            return None
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            self._reply(400, {"error": "invalid Content-Length"})
+            return None
+        if length < 0:
+            self._reply(400, {"error": "invalid Content-Length"})
+            return None
+        if length > CONTROL_MAX_BODY:
+            self._reply(413, {"error": "request body too large"})
+            return None
+        raw = self.rfile.read(length) if length else b""
+        try:
+            body = json.loads(raw) if raw.strip() else {}
+        except ValueError:
+            self._reply(400, {"error": "body is not valid JSON"})
+            return None
+        if not isinstance(body, dict):
+            self._reply(400, {"error": "body must be a JSON object"})
+            return None
+        return body
+
+    def _dispatch(self, route):
+        if route is None:
+            self._reply(404, {"error": f"no endpoint {self.command} {urlsplit(self.path).path}"})
+            return
+        metrics.count("control.requests")
+        try:
+            self._reply(200, route())
+        except ControlError as e:
+            self._reply(e.status, {"error": str(e)})
+        except Exception as e:
+            log.exception("Control request %s %s failed", self.command, self.path)
+            self._reply(500, {"error": str(e)})
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        log.debug("%s - %s", self.address_string(), format % args)
+
+
+def _int_param(value, name, minimum=None):
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise ControlError(400, f"'{name}' must be an integer")
+    if minimum is not None and number < minimum:
+        raise ControlError(400, f"'{name}' must be at least {minimum}")
+    return number
+
+
+def run_headless(app, port, country="Nigeria"):
+    """
+    Run the headless player on a QCoreApplication until SIGINT/SIGTERM.
+    Returns:
+        int: The application's exit code.
+    """
+    radio = HeadlessRadio(country)
+    radio.start(port)
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *args: app.quit())
+    wakeup = QTimer()  # Python runs signal handlers only between Qt events
+    wakeup.timeout.connect(lambda: None)
+    wakeup.start(250)
+    code = app.exec()
+    radio.shutdown()
+    return code
@@ -0,0 +1,81 @@
+# json_store.py
+
+import atexit
+import json
+import logging
+import os
+import threading
+
+log = logging.getLogger(__name__)
+
+
+class WriteBehindJSON:
+    """
+    A JSON file written behind its owner's changes.
+
+    The owner calls `mark_dirty()` after every change; changes are coalesced
+    for `delay` seconds and then saved atomically (temporary file + rename)
+    on a timer thread, and flushed at exit. What is saved is whatever
+    `snapshot()` returns at write time, so the owner takes its own lock
+    there and the file always holds the latest state.
+    """
+
+    def __init__(self, path, snapshot, delay, description="data", **dump_options):
+        """
+        Args:
+            path (str): The JSON file.
+            snapshot (callable): Returns the document to save (a consistent copy).
+            delay (float): Seconds to coalesce changes before writing.
+            description (str): What the file holds, for log messages.
+            **dump_options: Passed to json.dump (indent, separators, ...).
+        """
+        self.path = path
+        self.delay = delay
+        self.description = description
+        self._snapshot = snapshot
+        self._dump_options = dump_options
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._timer = None
+        self._dirty = False
+        atexit.register(self.flush)
+
+    def load(self):
+        """The saved document, or None if there is none or it cannot be read."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            log.warning("Could not read %s from %s: %s", self.description, self.path, e)
+            return None
+
+    def mark_dirty(self):
+        """Schedule a write (at most one per `delay` seconds)."""
+        with self._lock:
+            self._dirty = True
+            if self._timer is None:
+                self._timer = threading.Timer(self.delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        """Write pending changes now."""
+        with self._write_lock:  # One writer at a time, always with the latest snapshot
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._dirty:
+                    return
+                self._dirty = False
+            document = self._snapshot()  # Changes made from here on mark the file dirty again
+
+            tmp_path = f"{self.path}.tmp"
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(document, f, **self._dump_options)
+                os.replace(tmp_path, self.path)  # Atomic: never leaves a truncated file behind
+            except OSError as e:
+                log.warning("Could not save %s to %s: %s", self.description, self.path, e)
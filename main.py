@@ -1,9 +1,47 @@
+import argparse
 import sys
-from PyQt6.QtWidgets import QApplication
-from radio_window import RadioWindow
+from constants import AFRICAN_COUNTRIES, CONTROL_PORT, WATCHDOG_STALL_THRESHOLD
+from metrics import configure_logging, serve_metrics, export_metrics_file
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Smooth African Radio Player")
+    parser.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                        type=str.upper, help="Lowest level of log messages shown (default: INFO)")
+    parser.add_argument("--metrics-port", type=int,
+                        help="Serve Prometheus metrics on http://127.0.0.1:PORT/metrics")
+    parser.add_argument("--metrics-file",
+                        help="Write metrics to this file periodically and at exit (.prom for Prometheus text, else JSON)")
+    parser.add_argument("--stall-threshold", type=float, default=WATCHDOG_STALL_THRESHOLD,
+                        help="Record UI freezes longer than this many seconds (0 disables the watchdog)")
+    parser.add_argument("--headless", action="store_true",
+                        help="Run without a window, controlled through the local HTTP/JSON API")
+    parser.add_argument("--control-port", type=int, default=CONTROL_PORT,
+                        help=f"Loopback port of the headless control API (default: {CONTROL_PORT})")
+    parser.add_argument("--country", default="Nigeria", choices=AFRICAN_COUNTRIES,
+                        help="Country whose stations are loaded at start in headless mode")
+    args, _ = parser.parse_known_args()  # Leave Qt's own options (-style, ...) to QApplication
+    return args
 
 def main():
+    args = parse_args()
+    configure_logging(args.log_level)
+    if args.metrics_port is not None:
+        serve_metrics(args.metrics_port)
+    if args.metrics_file:
+        export_metrics_file(args.metrics_file)
+
+    if args.headless:
+        from PyQt6.QtCore import QCoreApplication  # No widgets, no display needed
+        from headless import run_headless
+        app = QCoreApplication(sys.argv)
+        sys.exit(run_headless(app, args.control_port, args.country))
+
+    from PyQt6.QtWidgets import QApplication
+    from stall_watchdog import StallWatchdog
+    from radio_window import RadioWindow
     app = QApplication(sys.argv)
+    if args.stall_threshold > 0:
+        StallWatchdog(app, threshold=args.stall_threshold).start()
     window = RadioWindow()
     window.show()
     sys.exit(app.exec())
@@ -0,0 +1,264 @@
+# metrics.py
+
+import atexit
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from constants import (
+    APP_NAME, LOG_RATE_LIMIT, LOG_RATE_WINDOW, METRICS_WRITE_INTERVAL, METRICS_BUCKETS,
+)
+
+
+class Timing:
+    """Count, sum, extremes and histogram buckets of one span's durations (seconds)."""
+
+    def __init__(self, buckets=METRICS_BUCKETS):
+        self.buckets = buckets
+        self.bucket_counts = [0] * len(buckets)  # Non-cumulative; cumulated on export
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+        position = bisect.bisect_left(self.buckets, seconds)
+        if position < len(self.buckets):
+            self.bucket_counts[position] += 1
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.total / self.count if self.count else None,
+            "min": self.min,
+            "max": self.max,
+        }
+
+
+class Metrics:
+    """
+    Thread-safe registry of named counters and timing spans.
+
+    Names are dotted, e.g. "api.fetch" or "player.reconnect.attempts".
+    Recording is a dict update under a lock, cheap enough for hot paths;
+    nothing is printed or written until the metrics are exported.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._timings = {}
+        self.started_at = time.time()
+
+    def count(self, name, value=1):
+        """Add `value` to the counter `name`."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name, seconds):
+        """Record one duration, in seconds, for the span `name`."""
+        with self._lock:
+            timing = self._timings.get(name)
+            if timing is None:
+                timing = self._timings[name] = Timing()
+            timing.add(seconds)
+
+    @contextmanager
+    def span(self, name):
+        """
+        Time the enclosed block as one occurrence of `name`. Blocks that
+        raise are recorded as well, and counted under "<name>.errors".
+        Also usable as a decorator.
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.count(f"{name}.errors")
+            raise
+        finally:
+            self.observe(name, time.perf_counter() - started)
+
+    def snapshot(self):
+        """Current values as a JSON-serialisable dict."""
+        with self._lock:
+            return {
+                "app": APP_NAME,
+                "started_at": self.started_at,
+                "written_at": time.time(),
+                "counters": dict(self._counters),
+                "timings": {name: timing.to_dict() for name, timing in self._timings.items()},
+            }
+
+    def prometheus_text(self):
+        """Current values in the Prometheus text exposition format."""
+        prefix = APP_NAME.lower()
+        lines = []
+        with self._lock:
+            for name, value in sorted(self._counters.items()):
+                metric = f"{prefix}_{_metric_name(name)}_total"
+                lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+            for name, timing in sorted(self._timings.items()):
+                metric = f"{prefix}_{_metric_name(name)}_seconds"
+                lines.append(f"# TYPE {metric} histogram")
+                cumulative = 0
+                for bound, count in zip(timing.buckets, timing.bucket_counts):
+                    cumulative += count
+                    lines.append(f'{metric}_bucket{{le="{bound}"}} {cumulative}')
+                lines += [
+                    f'{metric}_bucket{{le="+Inf"}} {timing.count}',
+                    f"{metric}_sum {timing.total}",
+                    f"{metric}_count {timing.count}",
+                ]
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """
+        Write the metrics to `path`, atomically: Prometheus text when the
+        file name ends in ".prom" (for a node_exporter textfile collector),
+        JSON otherwise.
+        """
+        if path.endswith(".prom"):
+            content = self.prometheus_text()
+        else:
+            content = json.dumps(self.snapshot(), indent=2)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(temp_path, path)
+
+
+def _metric_name(name):
+    return "".join(c if c.isalnum() else "_" for c in name)
+
+
+_metrics = Metrics()
+
+
+def get_metrics():
+    """Return the process-wide Metrics registry."""
+    return _metrics
+
+
+# Shorthands for the shared registry
+def count(name, value=1):
+    _metrics.count(name, value)
+
+
+def observe(name, seconds):
+    _metrics.observe(name, seconds)
+
+
+def span(name):
+    return _metrics.span(name)
+
+
+# ---- Export ----
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = _metrics.prometheus_text().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Scrapes are not worth a log line each
+
+
+def serve_metrics(port, host="127.0.0.1"):
+    """
+    Serve the metrics at http://<host>:<port>/metrics in the Prometheus text
+    format, from a daemon thread. Binds to the loopback interface only.
+    Returns:
+        ThreadingHTTPServer: The running server (call `shutdown()` to stop it).
+    """
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    logging.getLogger(__name__).info("Serving metrics on http://%s:%d/metrics", host, server.server_port)
+    return server
+
+
+def export_metrics_file(path, interval=METRICS_WRITE_INTERVAL):
+    """Write the metrics to `path` every `interval` seconds and once more at exit."""
+    log = logging.getLogger(__name__)
+
+    def write():
+        try:
+            _metrics.write(path)
+        except OSError as e:
+            log.warning("Could not write metrics to %s: %s", path, e)
+
+    def loop():
+        while True:
+            time.sleep(interval)
+            write()
+
+    threading.Thread(target=loop, name="metrics-file", daemon=True).start()
+    atexit.register(write)
+
+
+# ---- Logging ----
+class RateLimitFilter(logging.Filter):
+    """
+    Let through at most `limit` records per call site (file and line) in
+    each `window` seconds. The records dropped are counted in the
+    "log.suppressed" counter, and the first record let through after them
+    says how many similar records were suppressed.
+    """
+
+    def __init__(self, limit=LOG_RATE_LIMIT, window=LOG_RATE_WINDOW):
+        super().__init__()
+        self.limit = limit
+        self.window = window
+        self._lock = threading.Lock()
+        self._sites = {}  # (pathname, lineno) -> [window start, records let through, records suppressed]
+
+    def filter(self, record):
+        now = time.monotonic()
+        key = (record.pathname, record.lineno)
+        with self._lock:
+            site = self._sites.get(key)
+            if site is None or now - site[0] >= self.window:
+                suppressed = site[2] if site is not None else 0
+                self._sites[key] = [now, 1, 0]
+                if suppressed:
+                    record.msg = f"{record.msg} ({suppressed} similar messages suppressed)"
+                return True
+            if site[1] >= self.limit:
+                site[2] += 1
+                count("log.suppressed")
+                return False
+            site[1] += 1
+            return True
+
+
+def configure_logging(level="INFO"):
+    """
+    Send log records to stderr with timestamps, levels and logger names,
+    rate-limited per call site. Routine per-action messages (searches,
+    highlights, key presses) are logged at DEBUG and hidden by default.
+    Args:
+        level (str): Lowest level shown (DEBUG, INFO, WARNING, ERROR).
+    """
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)-7s %(name)s: %(message)s"))
+    handler.addFilter(RateLimitFilter())
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(level.upper())
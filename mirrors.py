@@ -0,0 +1,313 @@
+# mirrors.py
+
+import logging
+import socket
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from constants import (
+    API_DISCOVERY_HOST, API_FALLBACK_MIRRORS, API_REQUEST_TIMEOUT,
+    API_HEDGE_DELAY_MIN, API_HEDGE_DELAY_DEFAULT,
+    API_CIRCUIT_FAILURES, API_CIRCUIT_COOLDOWN, API_POOL_CONNECTIONS,
+    FETCH_CHUNK_SIZE, FETCH_CANCEL_POLL,
+)
+from cancel import CancelToken, FetchCancelled
+import metrics
+
+log = logging.getLogger(__name__)
+
+
+def create_session():
+    """
+    Create a requests.Session with a keep-alive connection pool large enough
+    for the prefetcher and hedged requests to share it without reconnecting.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=API_POOL_CONNECTIONS, pool_maxsize=API_POOL_CONNECTIONS)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["User-Agent"] = "SmoothAfricanRadioPlayer/1.0"
+    return session
+
+
+class MirrorPoolError(requests.RequestException):
+    """Raised when no mirror could answer a request."""
+
+
+class MirrorStats:
+    """
+    Latency and error bookkeeping for one mirror, plus its circuit breaker.
+    The breaker opens after API_CIRCUIT_FAILURES consecutive failures and lets
+    a single trial request through once API_CIRCUIT_COOLDOWN has passed.
+    """
+
+    EWMA_ALPHA = 0.3
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.samples = deque(maxlen=50)  # Recent successful latencies (seconds)
+        self.ewma = None
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    @property
+    def error_rate(self):
+        total = self.successes + self.failures
+        return self.failures / total if total else 0.0
+
+    def p95(self):
+        """95th percentile of recent latencies, or None without history."""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def is_available(self, now):
+        """Closed breaker, or open breaker whose cool-down has expired (half-open)."""
+        if self.opened_at is None:
+            return True
+        return now - self.opened_at >= API_CIRCUIT_COOLDOWN and not self.trial_in_flight
+
+    def score(self, default_latency):
+        """Lower is better: smoothed latency penalised by the error rate."""
+        latency = self.ewma if self.ewma is not None else default_latency
+        return latency * (1.0 + 4.0 * self.error_rate)
+
+    def record_success(self, latency):
+        self.samples.append(latency)
+        self.ewma = latency if self.ewma is None else (
+            self.EWMA_ALPHA * latency + (1 - self.EWMA_ALPHA) * self.ewma
+        )
+        self.successes += 1
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    def record_failure(self, now):
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.trial_in_flight = False
+        if self.opened_at is not None or self.consecutive_failures >= API_CIRCUIT_FAILURES:
+            self.opened_at = now  # (Re-)open the breaker
+
+
+class MirrorPool:
+    """
+    A pool of Radio-Browser API mirrors.
+
+    Requests go to the fastest healthy mirror. If it has not answered by its
+    p95 latency, a hedged copy of the request is sent to the next best mirror
+    and whichever answers first wins; the attempts still running are then
+    cancelled, so a hedge never downloads the body a second time. Failing
+    mirrors are ejected by a circuit breaker and retried after a cool-down.
+    """
+
+    def __init__(self, base_urls=None, discover=True, max_hedges=1, session=None):
+        """
+        Args:
+            base_urls (list): Mirror base URLs such as "https://de1.api.radio-browser.info".
+                Local stand-in servers ("http://127.0.0.1:8000") work too.
+            discover (bool): Look mirrors up in DNS when no base_urls are given.
+            max_hedges (int): Extra copies of a request allowed while the first is slow.
+            session (requests.Session): Session whose connection pool is shared by all requests.
+        """
+        self.session = session or create_session()
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._discover = discover and not base_urls
+        self._discovered = False
+        self.max_hedges = max_hedges
+        self._executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="mirror")
+        for url in base_urls or API_FALLBACK_MIRRORS:
+            self._add(url)
+
+    def _add(self, base_url):
+        base_url = base_url.rstrip("/")
+        if base_url not in self._stats:
+            self._stats[base_url] = MirrorStats(base_url)
+
+    def discover(self):
+        """
+        Resolve API_DISCOVERY_HOST and add every mirror it points to.
+        Radio-Browser publishes one A record per mirror; the reverse lookup
+        gives the mirror's HTTPS name.
+        """
+        try:
+            infos = socket.getaddrinfo(API_DISCOVERY_HOST, 443, proto=socket.IPPROTO_TCP)
+        except OSError as e:
+            log.warning("Mirror discovery failed: %s", e)
+            return
+        for info in infos:
+            ip = info[4][0]
+            try:
+                hostname = socket.gethostbyaddr(ip)[0]
+            except OSError:
+                continue
+            with self._lock:
+                self._add(f"https://{hostname}")
+
+    @property
+    def mirrors(self):
+        with self._lock:
+            return list(self._stats)
+
+    def stats(self, base_url):
+        return self._stats.get(base_url.rstrip("/"))
+
+    def ranked(self):
+        """Available mirrors, best first."""
+        if self._discover and not self._discovered:
+            self._discovered = True
+            self.discover()
+
+        now = time.monotonic()
+        with self._lock:
+            known = [s.ewma for s in self._stats.values() if s.ewma is not None]
+            default_latency = sum(known) / len(known) if known else 0.0
+            available = [s for s in self._stats.values() if s.is_available(now)]
+            available.sort(key=lambda s: s.score(default_latency))
+            return available
+
+    def _hedge_delay(self, stats):
+        p95 = stats.p95()
+        if p95 is None:
+            return API_HEDGE_DELAY_DEFAULT
+        return max(API_HEDGE_DELAY_MIN, p95)
+
+    def _attempt(self, stats, path, get, kwargs, cancel=None):
+        with self._lock:
+            if stats.opened_at is not None:
+                stats.trial_in_flight = True  # Half-open: this is the trial request
+        started = time.monotonic()
+        try:
+            response = self._get_cancellable(f"{stats.base_url}{path}", get, kwargs, cancel)
+            if response.status_code >= 500:
+                response.raise_for_status()
+        except FetchCancelled:
+            with self._lock:
+                stats.trial_in_flight = False  # Says nothing about the mirror's health
+            raise
+        except Exception:
+            with self._lock:
+                stats.record_failure(time.monotonic())
+            raise
+        with self._lock:
+            stats.record_success(time.monotonic() - started)
+        return response
+
+    @staticmethod
+    def _get_cancellable(url, get, kwargs, cancel):
+        """
+        GET `url`, reading the body in chunks so a cancelled or expired token
+        aborts the transfer (and closes the connection) within one chunk.
+        """
+        response = get(url, stream=True, **kwargs)
+        try:
+            chunks = []
+            for chunk in response.iter_content(chunk_size=FETCH_CHUNK_SIZE):
+                cancel.check()
+                chunks.append(chunk)
+            cancel.check()
+        except BaseException:
+            response.close()
+            raise
+        response._content = b"".join(chunks)  # Lets .content and .json() work as usual
+        return response
+
+    def get(self, path, session=None, cancel=None, **kwargs):
+        """
+        GET `path` from the best mirror, hedging to the next one when slow
+        and failing over when a mirror errors.
+        Args:
+            path (str): Path below the mirror base URL, e.g. "/json/stations/bycountry/Ghana".
+            session (requests.Session): Session to use instead of the pool's own.
+            cancel (CancelToken): Aborts waiting and downloading when cancelled;
+                its deadline also caps the per-request timeout.
+            **kwargs: Passed to requests (headers, timeout, ...).
+        Returns:
+            requests.Response from the first mirror that answered.
+        Raises:
+            MirrorPoolError: if every mirror failed.
+            FetchCancelled: if `cancel` was cancelled or its deadline passed.
+        """
+        kwargs.setdefault("timeout", API_REQUEST_TIMEOUT)
+        if cancel is not None:
+            cancel.check()
+            kwargs["timeout"] = cancel.timeout(kwargs["timeout"])
+        get = (session or self.session).get
+        candidates = self.ranked()
+        if not candidates:
+            # Every breaker is open: try the least recently ejected mirror anyway
+            with self._lock:
+                candidates = sorted(self._stats.values(), key=lambda s: s.opened_at or 0)[:1]
+        if not candidates:
+            raise MirrorPoolError("No API mirrors configured")
+
+        pending = {}
+        hedges_left = self.max_hedges
+        last_error = None
+        request = CancelToken(parent=cancel)  # Stops the attempts still running once this call is over
+
+        def launch():
+            stats = candidates.pop(0)
+            pending[self._executor.submit(self._attempt, stats, path, get, kwargs, request)] = stats
+            # When to hedge if nothing has answered by then
+            if hedges_left and candidates:
+                return time.monotonic() + self._hedge_delay(stats)
+            return None
+
+        try:
+            hedge_at = launch()
+            while pending:
+                if cancel is not None:
+                    cancel.check()  # Attempts still running notice the token and close their connections
+                timeout = None if hedge_at is None else max(0.0, hedge_at - time.monotonic())
+                if cancel is not None:
+                    timeout = FETCH_CANCEL_POLL if timeout is None else min(timeout, FETCH_CANCEL_POLL)
+                done, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+
+                if not done:
+                    if hedge_at is not None and time.monotonic() >= hedge_at:
+                        # The request passed its p95 deadline: hedge to another mirror
+                        hedges_left -= 1
+                        hedge_at = launch()
+                    continue
+
+                for future in done:
+                    stats = pending.pop(future)
+                    try:
+                        return future.result()
+                    except FetchCancelled:
+                        raise
+                    except Exception as e:
+                        last_error = e
+                        metrics.count("api.mirror.failures")
+                        log.warning("Mirror %s failed: %s", stats.base_url, e)
+
+                if candidates and not pending:
+                    hedge_at = launch()  # Fail over to the next mirror
+
+            raise MirrorPoolError(f"All API mirrors failed: {last_error}")
+        finally:
+            request.cancel()  # The winner's body is already read; the others stop within a chunk
+
+
+_shared_pool = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_mirror_pool():
+    """Return the process-wide MirrorPool, creating it on first use."""
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = MirrorPool()
+        return _shared_pool
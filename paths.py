@@ -0,0 +1,55 @@
+# paths.py
+
+import os
+import sys
+
+from constants import APP_NAME
+
+
+def user_cache_dir():
+    """
+    Return (and create) the per-user cache directory for the application.
+    Uses %LOCALAPPDATA% on Windows, ~/Library/Caches on macOS and
+    $XDG_CACHE_HOME (or ~/.cache) elsewhere.
+    """
+    if sys.platform.startswith("win"):
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+        path = os.path.join(base, APP_NAME, "Cache")
+    elif sys.platform == "darwin":
+        path = os.path.join(os.path.expanduser("~/Library/Caches"), APP_NAME)
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+        path = os.path.join(base, APP_NAME)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def user_config_dir():
+    """
+    Return (and create) the per-user configuration directory for the application.
+    Uses %APPDATA% on Windows, ~/Library/Application Support on macOS and
+    $XDG_CONFIG_HOME (or ~/.config) elsewhere.
+    """
+    if sys.platform.startswith("win"):
+        base = os.environ.get("APPDATA") or os.path.expanduser("~\\AppData\\Roaming")
+        path = os.path.join(base, APP_NAME)
+    elif sys.platform == "darwin":
+        path = os.path.join(os.path.expanduser("~/Library/Application Support"), APP_NAME)
+    else:
+        base = os.environ.get("XDG_CONFIG_HOME") or os.path.expanduser("~/.config")
+        path = os.path.join(base, APP_NAME)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def user_recordings_dir(create=True):
+    """
+    Return (and create, unless `create` is False) the directory stream
+    recordings are saved to: a folder named after the application in the
+    user's Music directory ($XDG_MUSIC_DIR when set).
+    """
+    base = os.environ.get("XDG_MUSIC_DIR") or os.path.join(os.path.expanduser("~"), "Music")
+    path = os.path.join(base, APP_NAME)
+    if create:
+        os.makedirs(path, exist_ok=True)
+    return path
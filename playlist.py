@@ -0,0 +1,171 @@
+# playlist.py
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlsplit
+
+import requests
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from constants import (
+    PLAYLIST_CACHE_TTL, PLAYLIST_FETCH_TIMEOUT, PLAYLIST_MAX_CONCURRENT, PLAYLIST_MAX_BYTES, PLAYLIST_WRITE_DELAY,
+)
+from json_store import WriteBehindJSON
+from mirrors import create_session
+from paths import user_cache_dir
+
+log = logging.getLogger(__name__)
+
+PLAYLIST_EXTENSIONS = (".pls", ".m3u")
+PLAYLIST_CONTENT_TYPES = ("audio/x-scpls", "audio/scpls", "audio/x-mpegurl", "audio/mpegurl")
+
+
+def looks_like_playlist(url):
+    """True if the URL path names a .pls or .m3u playlist (HLS .m3u8 is a stream, not a playlist)."""
+    return urlsplit(url).path.lower().endswith(PLAYLIST_EXTENSIONS)
+
+
+def parse_playlist(text, base_url=""):
+    """
+    Extract the stream URLs from a PLS or M3U playlist, in playlist order.
+    Args:
+        text (str): Playlist contents.
+        base_url (str): URL the playlist came from, for relative entries.
+    Returns:
+        list: HTTP(S) stream URLs (empty if none were found).
+    """
+    urls = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith(("#", "[")):
+            continue
+        if line.lower().startswith("file") and "=" in line:  # PLS: File1=http://...
+            line = line.split("=", 1)[1].strip()
+        elif "=" in line and "://" not in line.split("=", 1)[0]:
+            continue  # Other PLS keys (Title1=, Length1=, NumberOfEntries=)
+        url = urljoin(base_url, line)
+        if url.startswith(("http://", "https://")) and url not in urls:
+            urls.append(url)
+    return urls
+
+
+class PlaylistResolver(QObject):
+    """
+    Expands .pls/.m3u playlist URLs into direct stream URLs ahead of time.
+
+    Without it VLC downloads and parses the playlist on every play before it
+    can open the stream. Resolutions are cached in memory and in a JSON file
+    in the user cache directory for PLAYLIST_CACHE_TTL seconds, so playing a
+    station only needs a dictionary lookup. URLs that turn out to be direct
+    streams are remembered too, so they are not fetched again.
+    """
+    failed = pyqtSignal(str, str)  # playlist URL, error
+
+    def __init__(self, path=None, parent=None, max_concurrent=PLAYLIST_MAX_CONCURRENT):
+        super().__init__(parent)
+        self.path = path or os.path.join(user_cache_dir(), "playlists.json")
+        self._entries = {}  # playlist URL -> {"streams": [...], "resolved_at": seconds}
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._file = WriteBehindJSON(
+            self.path, self._snapshot, PLAYLIST_WRITE_DELAY, "playlist cache", separators=(",", ":")
+        )
+        self._session = create_session()
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="playlist")
+        self.load()
+
+    # ---- Lookups ----
+    def cached(self, url):
+        """Direct stream URL for `url` if a fresh resolution is cached, else None."""
+        with self._lock:
+            entry = self._entries.get(url)
+        if entry is None or time.time() - entry["resolved_at"] >= PLAYLIST_CACHE_TTL:
+            return None
+        return entry["streams"][0] if entry["streams"] else None
+
+    def stream_url(self, url):
+        """The URL to hand to the player: the cached resolution, or `url` itself."""
+        return self.cached(url) or url
+
+    # ---- Resolving ----
+    def warm(self, urls):
+        """Resolve, in the background, every playlist URL without a fresh cache entry."""
+        for url in urls:
+            if not url or not looks_like_playlist(url) or self.cached(url) is not None:
+                continue
+            with self._lock:
+                if url in self._pending:
+                    continue
+                self._pending.add(url)
+            self._executor.submit(self._resolve_pending, url)
+
+    def _resolve_pending(self, url):
+        try:
+            self.resolve(url)
+        finally:
+            with self._lock:
+                self._pending.discard(url)
+
+    def resolve(self, url):
+        """
+        Fetch and parse a playlist (blocking; call it off the UI thread).
+        Returns:
+            str or None: The first stream URL, or None if resolution failed.
+        """
+        try:
+            with self._session.get(url, timeout=PLAYLIST_FETCH_TIMEOUT, stream=True) as response:
+                response.raise_for_status()
+                content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+                if content_type.startswith("audio/") and content_type not in PLAYLIST_CONTENT_TYPES:
+                    streams = [response.url]  # Already a stream: never download it
+                else:
+                    body = b""
+                    for chunk in response.iter_content(chunk_size=8192):
+                        body += chunk
+                        if len(body) >= PLAYLIST_MAX_BYTES:
+                            break
+                    streams = parse_playlist(body.decode("utf-8", "replace"), response.url)
+        except requests.RequestException as e:
+            self.failed.emit(url, f"playlist unreachable: {e}")
+            return None
+
+        if not streams:
+            self.failed.emit(url, "playlist has no stream entries")
+            return None
+        with self._lock:
+            self._entries[url] = {"streams": streams, "resolved_at": time.time()}
+        self._file.mark_dirty()
+        return streams[0]
+
+    # ---- Persistence ----
+    def load(self):
+        entries = self._file.load()
+        if not isinstance(entries, dict):
+            return
+        now = time.time()
+        for url, entry in entries.items():
+            if isinstance(entry, dict) and now - entry.get("resolved_at", 0) < PLAYLIST_CACHE_TTL:
+                self._entries[url] = entry
+
+    def _snapshot(self):
+        with self._lock:
+            return dict(self._entries)
+
+    def flush(self):
+        """Write pending resolutions now."""
+        self._file.flush()
+
+_shared_resolver = None
+_shared_resolver_lock = threading.Lock()
+
+
+def get_playlist_resolver():
+    """Return the process-wide PlaylistResolver, creating it on first use."""
+    global _shared_resolver
+    with _shared_resolver_lock:
+        if _shared_resolver is None:
+            _shared_resolver = PlaylistResolver()
+        return _shared_resolver
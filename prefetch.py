@@ -0,0 +1,117 @@
+# prefetch.py
+
+import heapq
+import itertools
+import logging
+import threading
+
+from constants import AFRICAN_COUNTRIES, PREFETCH_MAX_IN_FLIGHT
+from catalog_cache import get_catalog_cache
+from api import refresh_catalog_shared, index_catalog
+from cancel import CancelToken
+
+log = logging.getLogger(__name__)
+
+
+class CatalogPrefetcher:
+    """
+    Warms the catalog cache for every country in the background.
+
+    Countries are fetched by a small pool of worker threads (at most
+    PREFETCH_MAX_IN_FLIGHT requests in flight) that share the mirror pool's
+    keep-alive session. The queue is ordered by how likely the user is to pick
+    a country next: favorites' countries first, then the neighbours of the
+    current selection in the country combo, nearest first.
+    After warm-up a country switch is a lookup in the cache's memory layer.
+    """
+
+    def __init__(self, countries=None, max_in_flight=PREFETCH_MAX_IN_FLIGHT):
+        self.countries = list(countries or AFRICAN_COUNTRIES)
+        self.max_in_flight = max_in_flight
+        self._queue = []  # heap of (priority, sequence, country)
+        self._priorities = {}  # country -> priority currently queued
+        self._done = set()
+        self._in_flight = set()
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._threads = []
+        self._stopped = False
+        self._cancel = CancelToken()  # Aborts requests in flight when the prefetcher stops
+
+    def start(self, current_country=None, favorite_countries=()):
+        """Queue every country and start the worker threads."""
+        self.prioritize(current_country, favorite_countries)
+        if self._threads:
+            return
+        for i in range(self.max_in_flight):
+            thread = threading.Thread(target=self._work, name=f"prefetch-{i}", daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def stop(self):
+        """Stop handing out work and abort the requests in flight."""
+        self._cancel.cancel()
+        with self._lock:
+            self._stopped = True
+
+    def prioritize(self, current_country=None, favorite_countries=()):
+        """
+        Re-rank the countries that are still waiting.
+        Call this whenever the selection moves so the prefetcher keeps running
+        ahead of the user.
+        """
+        ranking = {}
+        for country in favorite_countries:
+            if country in self.countries and country != current_country:
+                ranking.setdefault(country, 0)
+
+        if current_country in self.countries:
+            index = self.countries.index(current_country)
+            for distance in range(1, len(self.countries)):
+                # Keyboard scrolling moves one step at a time; "down" is slightly more likely
+                for neighbour in (index + distance, index - distance):
+                    if 0 <= neighbour < len(self.countries):
+                        ranking.setdefault(self.countries[neighbour], 1 + distance * 2 + (neighbour < index))
+        else:
+            for position, country in enumerate(self.countries):
+                ranking.setdefault(country, 1 + position)
+
+        with self._lock:
+            for country, priority in ranking.items():
+                if country in self._done or country in self._in_flight:
+                    continue
+                if self._priorities.get(country) == priority:
+                    continue
+                self._priorities[country] = priority
+                heapq.heappush(self._queue, (priority, next(self._sequence), country))
+
+    def _next_country(self):
+        """Highest-priority waiting country, or None once stopped or the queue is drained."""
+        with self._lock:
+            while self._queue and not self._stopped:
+                priority, _, country = heapq.heappop(self._queue)
+                if self._priorities.get(country) != priority:
+                    continue  # Superseded by a later prioritize() call
+                del self._priorities[country]
+                self._in_flight.add(country)
+                return country
+            return None  # The current country is never queued: the window loads it itself
+
+    def _work(self):
+        cache = get_catalog_cache()
+        while True:
+            country = self._next_country()
+            if country is None:
+                return
+            try:
+                entry = cache.load(country)
+                if entry is None or not entry.is_fresh():
+                    refresh_catalog_shared(country, entry, cancel=self._cancel)
+                else:
+                    index_catalog(entry)
+            except Exception as e:
+                log.warning("Prefetch failed for %s: %s", country, e)
+            finally:
+                with self._lock:
+                    self._in_flight.discard(country)
+                    self._done.add(country)
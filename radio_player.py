@@ -1,34 +1,143 @@
-import vlc
+import logging
 import re
+import threading
+import time
+from collections import OrderedDict
 
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
 
-class RadioPlayer:
+from constants import STANDBY_MAX_PREBUFFERS, STANDBY_MAX_AGE
+from station import StationIndex
+from vlc_loader import load_vlc
+from reconnect import ReconnectSupervisor
+from playlist import get_playlist_resolver
+import metrics
+
+log = logging.getLogger(__name__)
+
+
+class RadioPlayer(QObject):
     """
     A class that wraps VLC functionality.
     Handles play, stop, volume—no UI code here.
+
+    VLC reports state changes on its own thread. Those callbacks only emit the
+    Qt signals below, which Qt queues to the receivers' thread, so slots
+    connected from the UI run safely on the UI thread.
+
+    Zapping: `prebuffer` opens likely next stations in muted standby players.
+    Playing one of them promotes its standby player instead of connecting
+    and buffering from scratch.
+
+    Outages: `reconnect` (a ReconnectSupervisor) retries and fails over when
+    a stream errors or stops on its own while playback is wanted.
     """
+    opening = pyqtSignal(str)       # stream URL
+    buffering = pyqtSignal(float)   # percent of the network cache filled
+    playing = pyqtSignal(str)       # stream URL
+    error = pyqtSignal(str)         # stream URL
+    stopped = pyqtSignal()
+    first_audio = pyqtSignal(str, float)  # stream URL, seconds from play request to Playing
 
-    def __init__(self, stations=None):
-        self._player = vlc.MediaPlayer()
+    def __init__(self, stations=None, parent=None, resolver=None):
+        super().__init__(parent)
+        self.resolver = resolver or get_playlist_resolver()  # .pls/.m3u -> direct stream URL
+        self._player_instance = None  # The audible vlc.MediaPlayer, created on first use
         self._current_url = ""
-        self._event_manager = self._player.event_manager()
+        self._current_key = None  # stationuuid of the station being played, if known
+        self._volume = 100
+        self.wants_playback = False  # True from a play request until stop_station
         self._stations = stations or []  # Initialize with empty list if no stations are provided
+        self._index = StationIndex(self._stations)
+        self._play_requested_at = None  # monotonic time of the last new-media play request
+        self._play_is_warm = False  # True while a promoted standby player is still starting
+        self.time_to_first_audio = {}  # stream URL -> seconds, most recent measurement
+        self.zap_latencies = {"warm": [], "cold": []}  # seconds to first audio, by standby hit/miss
+
+        # Standby players: stream URL -> (vlc.MediaPlayer, monotonic time requested)
+        self._standby = OrderedDict()
+        self.max_prebuffers = STANDBY_MAX_PREBUFFERS
+        self._standby_reaper = QTimer(self)
+        self._standby_reaper.setInterval(15000)
+        self._standby_reaper.timeout.connect(self._release_stale_standby)
+        self._standby_reaper.start()
+
+        self._events = None  # (event type, callback) pairs, built with the first player
+        self.reconnect = ReconnectSupervisor(self)
+
+    @property
+    def _player(self):
+        """
+        The audible player. libvlc is loaded and the player created on first
+        access, so constructing a RadioPlayer costs nothing at startup.
+        """
+        if self._player_instance is None:
+            player = load_vlc().MediaPlayer()
+            self._attach_events(player)
+            self._player_instance = player
+        return self._player_instance
+
+    @_player.setter
+    def _player(self, player):
+        self._player_instance = player
+
+    @property
+    def has_player(self):
+        """True once the VLC player has been created."""
+        return self._player_instance is not None
 
-        # Register event callbacks
-        self._event_manager.event_attach(
-            vlc.EventType.MediaPlayerEncounteredError, self._handle_error_event
-        )
-        self._event_manager.event_attach(
-            vlc.EventType.MediaPlayerStopped, self._handle_stopped_event
-        )
+    def _attach_events(self, player):
+        if self._events is None:
+            vlc = load_vlc()
+            self._events = (
+                (vlc.EventType.MediaPlayerOpening, self._handle_opening_event),
+                (vlc.EventType.MediaPlayerBuffering, self._handle_buffering_event),
+                (vlc.EventType.MediaPlayerPlaying, self._handle_playing_event),
+                (vlc.EventType.MediaPlayerEncounteredError, self._handle_error_event),
+                (vlc.EventType.MediaPlayerStopped, self._handle_stopped_event),
+                (vlc.EventType.MediaPlayerEndReached, self._handle_stopped_event),
+            )
+        event_manager = player.event_manager()
+        for event_type, callback in self._events:
+            event_manager.event_attach(event_type, callback)
+
+    def _detach_events(self, player):
+        event_manager = player.event_manager()
+        for event_type, _ in self._events:
+            event_manager.event_detach(event_type)
+
+    # Callbacks run on a VLC thread: emit only, never call back into libvlc here.
+    def _handle_opening_event(self, event):
+        self.opening.emit(self._current_url)
+
+    def _handle_buffering_event(self, event):
+        self.buffering.emit(float(event.u.new_cache))
+
+    def _handle_playing_event(self, event):
+        url = self._current_url
+        if self._play_requested_at is not None:
+            elapsed = time.monotonic() - self._play_requested_at
+            self._play_requested_at = None
+            self._record_first_audio(url, elapsed, warm=self._play_is_warm)
+        self.playing.emit(url)
+
+    def _record_first_audio(self, url, elapsed, warm):
+        metrics.observe("player.first_audio.warm" if warm else "player.first_audio.cold", elapsed)
+        self.time_to_first_audio[url] = elapsed
+        samples = self.zap_latencies["warm" if warm else "cold"]
+        samples.append(elapsed)
+        del samples[:-100]  # Keep the most recent measurements
+        self.first_audio.emit(url, elapsed)
 
     def _handle_error_event(self, event):
         """
         Callback for when VLC encounters a playback error.
         This can happen if the stream URL is invalid or if there's a network issue.
         """
-        # You might want to handle reconnection logic, logs, or user notifications here.
-        print("VLC encountered an error during playback.")
+        log.warning("VLC encountered an error during playback.")
+        self._play_requested_at = None
+        metrics.count("player.errors")
+        self.error.emit(self._current_url)
 
     def _handle_stopped_event(self, event):
         """
@@ -36,7 +145,8 @@ class RadioPlayer:
         """
         # This event is fired when `stop_station` is called,
         # or if the media ended on its own and changed state to 'Stopped.'
-        print("VLC has stopped playback.")
+        log.info("VLC has stopped playback.")
+        self.stopped.emit()
     
     @staticmethod
     def is_valid_url(url):
@@ -49,6 +159,8 @@ class RadioPlayer:
             return False
 
     def get_state(self):
+        if not self.has_player:
+            return None
         return self._player.get_state()
 
     def play_station(self, stream_url: str):
@@ -64,11 +176,11 @@ class RadioPlayer:
         URL_REGEX_HTTP = re.compile(r"^http://([^/]+)(.*)$")
 
         if not stream_url:
-            print("Error: Provided stream URL is empty.")
+            log.warning("Provided stream URL is empty.")
             return
 
         if not self.is_valid_url(stream_url):
-            print(f"Blocked non-HTTP(S) or malformed URL: {stream_url}")
+            log.warning("Blocked non-HTTP(S) or malformed URL: %s", stream_url)
             return
 
         # Strict check for HTTPS format
@@ -79,35 +191,196 @@ class RadioPlayer:
             # It's an HTTP URL (less secure)
             pass
         else:
-            print(f"Blocked non-HTTP(S) or malformed URL: {stream_url}")
+            log.warning("Blocked non-HTTP(S) or malformed URL: %s", stream_url)
             return
 
+        self.reconnect.cancel()  # A new request ends any outage handling
+        self.wants_playback = True
+
         if self._current_url == stream_url:
             # If we're already on this station, resume
-            print(f"Resuming existing stream: {stream_url}")
+            log.info("Resuming existing stream: %s", stream_url)
             self._player.play()
             return
 
         self._current_url = stream_url
+        self._current_key = None  # Set again by play() when the station is known
+
+        if stream_url in self._standby:
+            self._promote_standby(stream_url)
+            return
+
+        try:
+            player = self._player
+            media = load_vlc().Media(self._media_url(stream_url))
+            player.set_media(media)
+            self._play_requested_at = time.monotonic()
+            self._play_is_warm = False
+            player.play()
+            player.audio_set_volume(self._volume)
+            log.info("Started playing: %s", stream_url)
+        except Exception as e:
+            log.error("Error occurred while trying to play %s: %s", stream_url, e)
+
+    def _media_url(self, stream_url):
+        """
+        URL to hand to VLC: a playlist's cached stream URL, so VLC skips the
+        playlist round trip. Unresolved playlists are resolved in the
+        background for next time and played through VLC meanwhile.
+        """
+        media_url = self.resolver.stream_url(stream_url)
+        if media_url == stream_url:
+            self.resolver.warm([stream_url])
+        return media_url
 
+    def reopen(self, stream_url):
+        """
+        Load `stream_url` afresh on the current player without ending the
+        current outage (used by the reconnect supervisor). The current
+        station key is kept: a mirror URL still plays the same station.
+        The URL goes to VLC as-is, bypassing the playlist cache: if a cached
+        resolution has gone dead, VLC re-reads the playlist itself.
+        """
+        self._current_url = stream_url
+        self._play_requested_at = None  # Reconnects are reported as outages, not zap latency
         try:
-            media = vlc.Media(stream_url)
-            self._player.set_media(media)
+            self._player.set_media(load_vlc().Media(stream_url))
             self._player.play()
-            print(f"Started playing: {stream_url}")
         except Exception as e:
-            print(f"Error occurred while trying to play {stream_url}: {e}")
+            log.error("Error occurred while trying to reopen %s: %s", stream_url, e)
+
+    # -------------------- Standby players --------------------
+    def prebuffer(self, stream_urls):
+        """
+        Start muted standby players for the given stream URLs, most likely
+        first. At most `max_prebuffers` standby players are kept; the least
+        recently requested ones are released to make room.
+        """
+        wanted = [url for url in stream_urls if url and url != self._current_url and self.is_valid_url(url)]
+        for url in reversed(wanted[:self.max_prebuffers]):
+            if url in self._standby:
+                player, _ = self._standby.pop(url)
+            else:
+                player = self._open_standby(url)
+                if player is None:
+                    continue
+            self._standby[url] = (player, time.monotonic())
+            self._standby.move_to_end(url, last=False)  # Most likely first
+
+        while len(self._standby) > self.max_prebuffers:
+            _, (player, _) = self._standby.popitem(last=True)
+            self._release_player(player)
+
+    def _open_standby(self, url):
+        try:
+            vlc = load_vlc()
+            player = vlc.MediaPlayer()
+            player.set_media(vlc.Media(self._media_url(url)))
+            player.audio_set_mute(True)
+            player.play()
+            player.audio_set_mute(True)  # The audio output only exists once playback started
+            player.audio_set_volume(0)
+            log.debug("Pre-buffering: %s", url)
+            return player
+        except Exception as e:
+            log.warning("Could not pre-buffer %s: %s", url, e)
+            return None
+
+    def _promote_standby(self, url):
+        """Swap a pre-buffered standby player in as the audible player."""
+        standby, requested_at = self._standby.pop(url)
+        old_player = self._player_instance
+        if old_player is not None:
+            self._detach_events(old_player)
+        self._player = standby
+        self._attach_events(standby)
+        standby.audio_set_mute(False)
+        standby.audio_set_volume(self._volume)
+        if old_player is not None:
+            self._release_player(old_player)
+
+        if standby.get_state() == load_vlc().State.Playing:
+            # Already audible: the switch is instant
+            self._play_requested_at = None
+            self._record_first_audio(url, 0.0, warm=True)
+            self.playing.emit(url)
+        else:
+            # Still buffering: the Playing event will arrive on the attached callbacks
+            self._play_requested_at = time.monotonic()
+            self._play_is_warm = True
+        log.info("Switched to pre-buffered stream: %s", url)
+
+    def _release_player(self, player):
+        """Stop and free a player off the UI thread (stopping a network stream can block)."""
+        def release():
+            try:
+                player.stop()
+                player.release()
+            except Exception as e:
+                log.warning("Error releasing player: %s", e)
+        threading.Thread(target=release, daemon=True).start()
+
+    def _release_stale_standby(self):
+        now = time.monotonic()
+        for url, (player, requested_at) in list(self._standby.items()):
+            if now - requested_at > STANDBY_MAX_AGE:
+                del self._standby[url]
+                self._release_player(player)
+
+    def release_standby(self):
+        """Release every standby player."""
+        while self._standby:
+            _, (player, _) = self._standby.popitem()
+            self._release_player(player)
+
+    def play(self, station):
+        """
+        Play a Station record. Remembering its key lets next/previous find
+        the current position without searching the list.
+        """
+        self.play_station(station.url)
+        if self._current_url == station.url:
+            self._current_key = station.key
+
+    @property
+    def station_index(self):
+        """StationIndex over the current station list."""
+        return self._index
+
+    @property
+    def current_url(self):
+        """Stream URL last asked to play."""
+        return self._current_url
+
+    @property
+    def current_key(self):
+        """Key (stationuuid) of the station being played, if known."""
+        return self._current_key
+
+    @property
+    def current_station(self):
+        """The Station being played, if it is part of the current list."""
+        if self._current_key is not None:
+            station = self._index.get(self._current_key)
+            if station is not None:
+                return station
+        position = self._index.position_of_url(self._current_url)
+        return self._index.stations[position] if position is not None else None
 
     def stop_station(self):
         """
         Stop playback completely.
         If there's no active media, VLC's stop won't do much, but it doesn't hurt to call it.
         """
-        if self._player.is_playing():
-            print(f"Stopping current stream: {self._current_url}")
+        if self.is_playing():
+            log.info("Stopping current stream: %s", self._current_url)
         else:
-            print("stop_station called, but nothing is playing.")
-        self._player.stop()
+            log.debug("stop_station called, but nothing is playing.")
+        self.wants_playback = False  # The Stopped event that follows is deliberate
+        self.reconnect.cancel()
+        if self.has_player:
+            self._player.stop()
+        self.release_standby()  # Nothing to zap from: stop using bandwidth
 
     def set_volume(self, volume: int):
         """
@@ -116,53 +389,60 @@ class RadioPlayer:
         """
         # Enforce 0–100 range
         clamped_volume = max(0, min(volume, 100))
+        self._volume = clamped_volume  # Applied to standby players when they are promoted
+        if not self.has_player:
+            return  # Applied when the player is created
 
         try:
             current_volume = self._player.audio_get_volume()
             self._player.audio_set_volume(clamped_volume)
-            print(f"Volume changed from {current_volume} to {clamped_volume}.")
+            log.debug("Volume changed from %s to %s.", current_volume, clamped_volume)
         except Exception as e:
-            print(f"Error occurred while setting volume to {volume}: {e}")
+            log.error("Error occurred while setting volume to %s: %s", volume, e)
 
     def update_stations(self, stations):
         """
-        Update the list of stations.
+        Update the list of stations and rebuild the lookup index (once per list).
         """
         self._stations = stations or []
-        print(f"Updated stations: {len(self._stations)} stations available.")
+        self._index = StationIndex(self._stations)
+        log.debug("Updated stations: %s stations available.", len(self._stations))
+
+    def _current_position(self):
+        """Position of the current station in the list, or -1 (O(1) via the index)."""
+        position = None
+        if self._current_key is not None:
+            position = self._index.position(self._current_key)
+        if position is None:
+            position = self._index.position_of_url(self._current_url)
+        return -1 if position is None else position
 
     def play_next_station(self):
         """
         Play the next station in the list.
         """
         if not self._stations:
-            print("No stations available to play.")
+            log.warning("No stations available to play.")
             return
-        current_index = next(
-            (i for i, s in enumerate(self._stations) if s.get("url") == self._current_url), -1
-        )
-        next_index = (current_index + 1) % len(self._stations)
-        next_station = self._stations[next_index]
-        self.play_station(next_station["url"])
-        print(f"Playing next station: {next_station['name']}")
+        next_station = self._index.at(self._current_position() + 1)
+        self.play(next_station)
+        log.info("Playing next station: %s", next_station.name)
 
     def play_previous_station(self):
         """
         Play the previous station in the list.
         """
         if not self._stations:
-            print("No stations available to play.")
+            log.warning("No stations available to play.")
             return
-        current_index = next(
-            (i for i, s in enumerate(self._stations) if s.get("url") == self._current_url), -1
-        )
-        previous_index = (current_index - 1) % len(self._stations)
-        previous_station = self._stations[previous_index]
-        self.play_station(previous_station["url"])
-        print(f"Playing previous station: {previous_station['name']}")
+        previous_station = self._index.at(self._current_position() - 1)
+        self.play(previous_station)
+        log.info("Playing previous station: %s", previous_station.name)
 
     def is_playing(self):
         """
         Check if the VLC player is currently playing.
         """
+        if not self.has_player:
+            return False
         return self._player.is_playing() == 1  # VLC returns 1 if playing, 0 otherwise
\ No newline at end of file
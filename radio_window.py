@@ -1,26 +1,48 @@
+import logging
 import os
 import sys
-import vlc
-from PyQt6.QtCore import Qt, QTimer, QSize, QRectF
-from PyQt6.QtGui import QMovie, QIcon, QRegion, QPainterPath
+from PyQt6.QtCore import Qt, QTimer, QSize, QRectF, pyqtSignal
+from PyQt6.QtGui import QMovie, QRegion, QPainterPath
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QListWidget,
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QListView,
     QLineEdit, QComboBox, QSlider, QMessageBox,
-    QApplication, QToolButton, QListWidgetItem
+    QApplication, QToolButton, QCheckBox
 )
 
 from title_bar import TitleBar
 from specialbuttons import MediaKeyListener
 from favorites import Favorites
 from radio_player import RadioPlayer
-from api import FetchStationsWorker
-from constants import AFRICAN_COUNTRIES
+from fetch_coordinator import CountryFetchCoordinator
+from station import Station
+from catalog_cache import get_catalog_cache
+from prefetch import CatalogPrefetcher
+from station_model import StationListModel, StationDelegate
+from search import StationSearchIndex, IncrementalSearch
+from global_index import GlobalSearchWorker
+from stream_health import StreamHealthProber
+from vlc_loader import preload_vlc
+from asset_cache import get_asset_cache
+from recorder import RecordingError, get_recording_manager
+import metrics
+from constants import (
+    AFRICAN_COUNTRIES, SEARCH_DEBOUNCE_MS, PLAYBACK_START_DEADLINE_MS, STANDBY_HOVER_DELAY_MS
+)
 from styles import LOAD_STYLESHEET
 
+log = logging.getLogger(__name__)
+
 class RadioWindow(QWidget):
+    # Emitted with the country name whenever a station list has been shown
+    stations_loaded = pyqtSignal(str)
+
     def __init__(self):
         super().__init__()
-        self.fetch_stations_worker = None  # Keep track of the current worker thread
+        # Debounces country selections and runs (and cancels) the fetch workers
+        self.fetch_coordinator = CountryFetchCoordinator(parent=self)
+        self.fetch_coordinator.stations.connect(self.on_country_stations)
+        self.loading_country = None  # Country whose stations are being shown/loaded
+        self.pending_favorite_key = None  # Favorite to play once its country is loaded
         self.setWindowTitle("Smooth African Radio Player")
 
         # We want a frameless window with rounded corners
@@ -29,24 +51,82 @@ class RadioWindow(QWidget):
 
         # Create an instance of the RadioPlayer (the VLC logic part)
         self.all_stations = []  # Keep track of all stations
-        self.radio_player = RadioPlayer(self.all_stations)
+        self.radio_player = RadioPlayer(self.all_stations, parent=self)
+        self.now_playing_name = None  # Name of the station we asked VLC to play
 
-        # Create the MediaKeyListener
+        # Create the MediaKeyListener (started after the first paint)
         self.media_key_listener = MediaKeyListener(self.radio_player)
+        self.startup_finished = False
 
-        # Start the MediaKeyListener in a separate thread
-        self.media_key_listener.start()
-
-        # Keep track of stations and currently selected item
+        # Keep track of stations (the now-playing row lives in the station model)
         self.all_stations = []
-        self.current_station_item = None
+        self.station_search = None  # Built lazily for the current catalog
+        self.global_search_workers = set()  # Running cross-country searches
+
+        # Probe station streams in the background; broken ones are dimmed and sorted last
+        self.health = StreamHealthProber(self)
+        self.health.probed.connect(self.on_stream_probed)
+        self.radio_player.resolver.failed.connect(self.health.record_failure)
+        self.health_repaint_timer = QTimer(self)  # Coalesces repaints while results stream in
+        self.health_repaint_timer.setSingleShot(True)
+        self.health_repaint_timer.setInterval(250)
+        self.stream_checks_timer = QTimer(self)  # Skips catalogs the user only scrolls past
+        self.stream_checks_timer.setSingleShot(True)
+        self.stream_checks_timer.setInterval(1000)
+        self.stream_checks_timer.timeout.connect(self.start_stream_checks)
+
+        # Recordings run on their own threads and connections, apart from playback
+        self.recorder = get_recording_manager()
+        self.recording_status_timer = QTimer(self)  # Refreshes the Record button's counters
+        self.recording_status_timer.setInterval(2000)
+        self.recording_status_timer.timeout.connect(self.update_record_button)
 
         # Build the UI
         self.init_ui()
-
-        # (Optional) Fetch initial country's stations at startup
+        self.stations_loaded.connect(self.on_stations_loaded)
+
+        # React to VLC state changes instead of polling get_state()
+        self.playback_deadline = QTimer(self)
+        self.playback_deadline.setSingleShot(True)
+        self.playback_deadline.setInterval(PLAYBACK_START_DEADLINE_MS)
+        self.playback_deadline.timeout.connect(self.on_playback_deadline)
+        self.radio_player.buffering.connect(self.on_player_buffering)
+        self.radio_player.playing.connect(self.on_player_playing)
+        self.radio_player.error.connect(self.on_player_error)
+        self.radio_player.first_audio.connect(self.on_first_audio)
+        self.radio_player.reconnect.reconnecting.connect(self.on_player_reconnecting)
+        self.radio_player.reconnect.gave_up.connect(self.on_player_gave_up)
+
+        # Pre-buffer the station under the mouse once the pointer rests on it
+        self.hovered_station = None
+        self.hover_timer = QTimer(self)
+        self.hover_timer.setSingleShot(True)
+        self.hover_timer.setInterval(STANDBY_HOVER_DELAY_MS)
+        self.hover_timer.timeout.connect(self.prebuffer_likely_next)
+
+        # Warms the catalog of every other country in the background (started after the first paint)
+        self.prefetcher = CatalogPrefetcher(AFRICAN_COUNTRIES)
+
+        # Fetch initial country's stations at startup (from the cache when there is one)
         self.load_country_stations("Nigeria")
 
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.startup_finished:
+            self.startup_finished = True
+            QTimer.singleShot(0, self.finish_startup)
+
+    def finish_startup(self):
+        """
+        Start what the first paint does not need: media keys, libvlc and the
+        catalog prefetcher. Deferring them gets the window on screen sooner.
+        """
+        self.media_key_listener.start()
+        preload_vlc()  # Ready before the first play, loaded off the UI thread
+        self.prefetcher.start(
+            current_country=self.loading_country, favorite_countries=self._favorite_countries()
+        )
+
     def apply_rounded_corners(self):
         """Set a mask to create rounded corners for the window."""
         radius = 20  # Corner radius
@@ -106,7 +186,7 @@ class RadioWindow(QWidget):
         # ---- Sidebar Toggle Button ----
         self.toggle_button = QToolButton()
         # Default to "hide arrow" if the sidebar is shown by default
-        self.toggle_button.setIcon(QIcon(self.resource_path("assets/left_arrow2.png")))
+        self.toggle_button.setIcon(self.arrow_icon(point_left=True))
         self.toggle_button.setIconSize(QSize(24, 24))
         self.toggle_button.setCheckable(True)
         self.toggle_button.clicked.connect(self.toggle_sidebar)
@@ -119,6 +199,7 @@ class RadioWindow(QWidget):
         # ---- Favorites Sidebar ----
         self.favorites_widget = Favorites(self)
         self.favorites_widget.station_selected.connect(self.play_favorite_station)  # Connect signal
+        self.favorites_widget.favorites_changed.connect(self.on_favorites_changed)
         self.body_and_sidebar.addWidget(self.favorites_widget, stretch=1)
 
         # ---- Station Selection Area ----
@@ -137,14 +218,43 @@ class RadioWindow(QWidget):
         self.search_bar.textChanged.connect(self.on_search_text_changed)
         station_layout.addWidget(self.search_bar)
 
+        # Search every fetched country instead of the selected one
+        self.global_search_checkbox = QCheckBox("All countries")
+        self.global_search_checkbox.toggled.connect(self.run_search)
+        station_layout.addWidget(self.global_search_checkbox)
+
+        # Typing debounce: search once the user pauses
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.run_search)
+
         # Random station button
         self.random_button = QPushButton("Random Station")
         self.random_button.clicked.connect(self.play_random_station)
         station_layout.addWidget(self.random_button)
 
         # ---- Station List ----
-        self.station_list = QListWidget()
-        self.station_list.itemDoubleClicked.connect(self.on_station_double_clicked)
+        # Model/view: rows are painted by the delegate on demand, so only the
+        # visible stations cost anything regardless of the catalog size.
+        self.station_model = StationListModel(
+            is_favorite=self.favorites_widget.is_favorite, parent=self, health=self.health
+        )
+        self.health_repaint_timer.timeout.connect(self.station_model.refresh_all)
+        self.station_delegate = StationDelegate(parent=self)
+        self.station_delegate.star_clicked.connect(self.on_star_clicked)
+
+        self.station_list = QListView()
+        self.station_list.setModel(self.station_model)
+        self.station_model.row_repaint.connect(self.repaint_station_row)
+        self.station_list.setItemDelegate(self.station_delegate)
+        self.station_list.setUniformItemSizes(True)
+        self.station_list.setEditTriggers(QListView.EditTrigger.NoEditTriggers)
+        self.station_list.clicked.connect(self.on_station_item_clicked)
+        self.station_list.doubleClicked.connect(self.on_station_double_clicked)
+        self.station_list.setMouseTracking(True)
+        self.station_list.entered.connect(self.on_station_hovered)
+        self.station_list.selectionModel().currentChanged.connect(self.update_record_button)
         self.body_layout.addWidget(self.station_list)
 
         # ---- Controls Layout ----
@@ -159,6 +269,11 @@ class RadioWindow(QWidget):
         self.stop_button.clicked.connect(self.stop_station)
         controls_layout.addWidget(self.stop_button)
 
+        self.record_button = QPushButton("Record")
+        self.record_button.setToolTip("Record the selected (or playing) station")
+        self.record_button.clicked.connect(self.toggle_recording)
+        controls_layout.addWidget(self.record_button)
+
         volume_label = QLabel("Volume")
         controls_layout.addWidget(volume_label)
 
@@ -203,171 +318,150 @@ class RadioWindow(QWidget):
             self.favorites_widget.setVisible(False)
             self.body_and_sidebar.setStretch(0, 4)
             # Switch icon to 'right arrow' (means user can expand again)
-            self.toggle_button.setIcon(QIcon(self.resource_path("assets/right_arrow2.png")))
+            self.toggle_button.setIcon(self.arrow_icon(point_left=False))
         else:
             # Show sidebar
             self.favorites_widget.setVisible(True)
             self.body_and_sidebar.setStretch(0, 3)
             self.body_and_sidebar.setStretch(1, 1)
             # Switch icon to 'left arrow' (means user can hide again)
-            self.toggle_button.setIcon(QIcon(self.resource_path("assets/left_arrow2.png")))
-
-    def populate_station_list(self, stations):
-        """Populate the station list with favorite toggle icons."""
-        self.station_list.clear()
-
-        for station in stations:
-            station_name = station.get("name", "Unknown Station")
-
-            # Create a QWidget container for each station
-            container_widget = QWidget()
-            layout = QHBoxLayout(container_widget)
-            layout.setContentsMargins(5, 5, 5, 5)
-            layout.setSpacing(10)
-
-            # Add a star button
-            star_button = QPushButton()
-            star_button.setCheckable(True)
-            star_button.setIcon(self._get_star_icon(station_name))
-            star_button.clicked.connect(lambda _, s=station_name: self.toggle_favorite(s))
-            star_button.setFixedSize(24, 24)  # Adjust size as needed
-            layout.addWidget(star_button)
-
-            # Add a label for the station name
-            station_label = QLabel(station_name)
-            layout.addWidget(station_label)
+            self.toggle_button.setIcon(self.arrow_icon(point_left=True))
 
-            # Adjust layout to prevent stretching
-            layout.addStretch()
+    @staticmethod
+    def arrow_icon(point_left):
+        """Sidebar toggle arrow from the shared asset cache (the left arrow is the right one mirrored)."""
+        return get_asset_cache().icon("right-arrow2.png", 24, mirrored=point_left)
 
-            # Add the station container to the QListWidget
-            list_item = QListWidgetItem()
-            list_item.setSizeHint(container_widget.sizeHint())
-
-            # Add station name as data for easier selection handling
-            list_item.setData(Qt.ItemDataRole.UserRole, station_name)
-
-            self.station_list.addItem(list_item)
-            self.station_list.setItemWidget(list_item, container_widget)
+    def populate_station_list(self, stations):
+        """Populate the station list; stars are painted by the delegate."""
+        with metrics.span("ui.populate"):
+            self.station_model.set_stations(stations)
 
-        # Allow item selection even with custom widgets
-        self.station_list.itemClicked.connect(self.on_station_item_clicked)
-    
-    def on_station_item_clicked(self, item):
+    def on_station_item_clicked(self, index):
         """Handle station selection from the main station list."""
-        station_name = item.data(Qt.ItemDataRole.UserRole)  # Get the station name
-        if station_name:
-            self.highlight_station(item)
+        if self.station_model.station_at(index.row()) is not None:
+            self.highlight_station(index.row())
+
+    def on_star_clicked(self, index):
+        """The star of a row was clicked: toggle that station's favorite state."""
+        station = self.station_model.station_at(index.row())
+        if station is not None:
+            self.toggle_favorite(station)
 
-    def toggle_favorite(self, station_name):
+    def toggle_favorite(self, station):
         """Toggle the favorite status of a station."""
-        # Find the country of the current station
-        selected_country = self.country_combo.currentText()
-        
-        if self.favorites_widget.is_favorite(station_name):
-            self.favorites_widget.remove_favorite(station_name)
+        if self.favorites_widget.is_favorite(station.key):
+            self.favorites_widget.remove_favorite(station.key)
         else:
-            # Store both station name and country
-            self.favorites_widget.add_favorite({"name": station_name, "country": selected_country})
-
-        # Update the star icon in the station list
-        self.update_station_star_icon(station_name)
-    
-    def update_station_star_icon(self, station_name):
-        """Update the star icon for a station based on favorite status."""
-        for i in range(self.station_list.count()):
-            list_item = self.station_list.item(i)
-            container_widget = self.station_list.itemWidget(list_item)
-            if container_widget:
-                star_button = container_widget.findChild(QPushButton)
-                station_label = container_widget.findChild(QLabel)
-
-                # Match station name and update the star icon
-                if station_label and star_button and station_label.text() == station_name:
-                    star_button.setIcon(self._get_star_icon(station_name))
-                    break
-        
-    def _get_star_icon(self, station_name):
-        """Return the appropriate star icon based on favorite status."""
-        if self.favorites_widget.is_favorite(station_name):
-            return QIcon(self.resource_path("assets/star_full.png"))
+            # Cross-country search results carry their own country
+            country = station.country if station.country in AFRICAN_COUNTRIES else self.country_combo.currentText()
+            self.favorites_widget.add_favorite(station, country)
+
+    def on_favorites_changed(self, station_key):
+        """Repaint stars after a favorite was added, removed or all were cleared."""
+        if station_key:
+            self.update_station_star_icon(station_key)
         else:
-            return QIcon(self.resource_path("assets/star_empty.png"))
+            self.station_list.viewport().update()
     
-    def play_favorite_station(self, station_name):
-        """Play a station selected from the Favorites list."""
-        # Get the favorite's data (name and country)
-        favorite_data = self.favorites_widget.get_favorite_data(station_name)
+    def repaint_station_row(self, row):
+        """Repaint one row of the station list: only its rectangle, not the whole view."""
+        rect = self.station_list.visualRect(self.station_model.index(row))
+        if rect.isValid():
+            self.station_list.viewport().update(rect)
+
+    def update_station_star_icon(self, station_key):
+        """Repaint the star of a station after its favorite status changed."""
+        row = self.station_model.row_of(station_key)
+        if row is not None:
+            self.station_model.refresh_row(row)
+    
+    def play_favorite_station(self, station_key):
+        """
+        Play a station selected from the Favorites list.
+        Favorites remember their stream URL, so playback starts right away;
+        the favorite's country is loaded in parallel and the list selection is
+        reconciled from stations_loaded once it arrives.
+        """
+        # Get the favorite's data (name, country and stream URL)
+        favorite_data = self.favorites_widget.get_favorite_data(station_key)
         if not favorite_data:
-            QMessageBox.warning(self, "Favorite Not Found", f"The favorite '{station_name}' is no longer available.")
+            QMessageBox.warning(self, "Favorite Not Found", "This favorite is no longer available.")
             return
 
+        station_name = favorite_data["name"]
         favorite_country = favorite_data.get("country")
         if not favorite_country:
             QMessageBox.warning(self, "Invalid Data", f"The favorite '{station_name}' does not have a valid country.")
             return
 
-        # Check if the current country matches the favorite's country
+        station = self.radio_player.station_index.get(station_key) or Station.from_dict(favorite_data)
+        if station.url:
+            self._play_favorite(station)
+        else:
+            # Saved without a stream URL: play as soon as the catalog has it
+            self.pending_favorite_key = station_key
+
+        # Switch to the correct country; on_country_changed starts the load
         if self.country_combo.currentText() != favorite_country:
-            self.country_combo.setCurrentText(favorite_country)  # Switch to the correct country
-            self.load_country_stations(favorite_country)  # Load stations for the selected country
+            self.country_combo.setCurrentText(favorite_country)
+            self.fetch_coordinator.flush()  # A deliberate pick: no need to debounce
+        elif self.pending_favorite_key and self.loading_country == favorite_country:
+            self.on_stations_loaded(favorite_country)  # Already loaded
+
+    def _play_favorite(self, station):
+        """Play a favorite straight from its stored stream URL."""
+        self.pending_favorite_key = None
+        self.show_spinner()
+        self.radio_player.play(station)
+        self.set_now_playing(station.name)
+        self.station_model.set_playing_row(None)
+        self.highlight_favorite(station.key)
+        self.wait_for_playing()
 
-            # Wait for the stations to load and play the favorite
-            QTimer.singleShot(1000, lambda: self._play_favorite_after_switch(favorite_data))
-        else:
-            # Country matches, play directly
-            self._play_favorite(favorite_data)
-        
-    def _play_favorite_after_switch(self, favorite_data):
-        """Play the favorite after switching to the correct country."""
-        station_name = favorite_data["name"]
-        station_data = next((s for s in self.all_stations if s.get("name") == station_name), None)
-
-        if station_data and station_data.get("url"):
-            self.show_spinner()
-            self.radio_player.play_station(station_data["url"])
-            self.now_playing_label.setText(f"Now playing: {station_name}")
-            self.highlight_favorite(station_name)
-            self.wait_for_playing()
-        else:
-            QMessageBox.warning(self, "Station Not Found", f"The station '{station_name}' is not available in this country.")
+    def on_stations_loaded(self, country):
+        """
+        A station list was shown: start a favorite that was waiting for it and
+        select whatever is playing if it is part of the list.
+        """
+        if self.pending_favorite_key:
+            station = self.radio_player.station_index.get(self.pending_favorite_key)
+            if station is not None and station.url:
+                self._play_favorite(station)
+            else:
+                name = (self.favorites_widget.get_favorite_data(self.pending_favorite_key) or {}).get("name", "")
+                self.pending_favorite_key = None
+                QMessageBox.warning(self, "Station Not Found", f"The station '{name}' is not available in {country}.")
+                return
 
-    def _play_favorite(self, favorite_data):
-        """Directly play the favorite station."""
-        station_name = favorite_data["name"]
-        self._play_favorite_after_switch(favorite_data)
+        current = self.radio_player.current_station
+        if current is not None:
+            row = self.station_model.row_of(current.key)
+            if row is not None:
+                self.station_list.setCurrentIndex(self.station_model.index(row))
+                self.station_model.set_playing_row(row)
     
-    def highlight_station_in_list(self, station_name):
+    def highlight_station_in_list(self, station_key):
         """Highlight the specified station in the main station list."""
         # Unhighlight any station in the Favorites List
         self.unhighlight_favorites()
 
-        for i in range(self.station_list.count()):
-            list_item = self.station_list.item(i)
-            item_station_name = list_item.data(Qt.ItemDataRole.UserRole) or list_item.text()
-
-            if item_station_name == station_name:
-                self.station_list.setCurrentRow(i)  # Select the station
-                self.highlight_station(list_item)  # Apply bold styling
-                return
+        row = self.station_model.row_of(station_key)
+        if row is not None:
+            self.station_list.setCurrentIndex(self.station_model.index(row))  # Select the station
+            self.highlight_station(row)  # Apply bold styling
+            return
 
-        print(f"Station not found: {station_name}")  # Debugging log
+        log.debug("Station not found: %s", station_key)
 
     def unhighlight_favorites(self):
         """Remove selection from the Favorites List."""
-        selected_item = self.favorites_widget.favorites_list.currentItem()
-        if selected_item:
-            self.favorites_widget.favorites_list.setCurrentItem(None)  # Clear selection
-            print(f"Unhighlighted favorite: {selected_item.text()}")  # Debugging log
+        self.favorites_widget.clear_selection()
 
-    def highlight_favorite(self, station_name):
+    def highlight_favorite(self, station_key):
         """Highlight the specified station in the Favorites List."""
-        for i in range(self.favorites_widget.favorites_list.count()):
-            favorite_item = self.favorites_widget.favorites_list.item(i)
-            if favorite_item.text() == station_name:
-                self.favorites_widget.favorites_list.setCurrentRow(i)  # Highlight the station
-                print(f"Highlighted favorite: {favorite_item.text()}")  # Debugging log
-                return
+        if self.favorites_widget.select(station_key):
+            log.debug("Highlighted favorite: %s", station_key)
 
     # -------------------- Spinner Controls --------------------
     def show_spinner(self):
@@ -383,30 +477,46 @@ class RadioWindow(QWidget):
     def on_country_changed(self):
         """User changed the country combo—fetch new stations."""
         selected_country = self.country_combo.currentText()
-        self.load_country_stations(selected_country)
+        self.load_country_stations(selected_country, immediate=False)
+        self.prefetcher.prioritize(selected_country, self._favorite_countries())
 
-    def load_country_stations(self, country):
+    def _favorite_countries(self):
+        """Countries of the favorite stations, used to rank prefetching."""
+        return self.favorites_widget.favorite_countries()
+
+    def load_country_stations(self, country, immediate=True):
         """
         Uses a background worker to fetch stations so the UI won't freeze.
-        If you don't use threading, you can fetch directly (but UI might freeze).
+        Args:
+            country (str): Country to show.
+            immediate (bool): Start the fetch now instead of after the
+                selection debounce (used for everything but combo changes).
         """
+        self.loading_country = country
 
-        # Cancel any existing thread
-        if self.fetch_stations_worker and self.fetch_stations_worker.isRunning():
-            self.fetch_stations_worker.quit()
-            self.fetch_stations_worker.wait()
+        # Warmed up by the prefetcher: a memory lookup, no network wait
+        entry = get_catalog_cache().load(country)
+        if entry is not None and entry.is_fresh():
+            self.stop_fetch_thread()
+            self.on_stations_fetched(entry.stations)
+            return
 
-        self.current_station_item = None  # Reset the current station item
-        self.station_list.clear()
-        self.station_list.addItem("[Loading stations...]")
+        if entry is not None:
+            # Stale but usable: show it right away and revalidate behind it
+            self.on_stations_fetched(entry.stations)
+            self.fetch_coordinator.request(country, immediate=immediate, emit_cached=False)
+            return
+
+        self.station_model.set_placeholder("[Loading stations...]")
 
         # Show spinner while fetching
         self.show_spinner()
+        self.fetch_coordinator.request(country, immediate=immediate)
 
-        # Create the worker
-        self.fetch_stations_worker = FetchStationsWorker(country)
-        self.fetch_stations_worker.finished.connect(self.on_stations_fetched)
-        self.fetch_stations_worker.start()
+    def on_country_stations(self, country, stations):
+        """Stations from the fetch coordinator, shown if they are for the selected country."""
+        if country == self.loading_country:
+            self.on_stations_fetched(stations)
 
     def on_stations_fetched(self, stations):
         """
@@ -414,177 +524,338 @@ class RadioWindow(QWidget):
         """
         self.hide_spinner()
 
-        # Update the internal list of stations
-        self.all_stations = stations or []
+        # Update the internal list of stations: fast, high-bitrate streams first, known-broken last
+        self.all_stations = self.health.rank(stations or [])
+        self.station_search = None  # Rebuilt on the next search
 
         # Update the RadioPlayer with the new stations
         self.radio_player.update_stations(self.all_stations)
 
         if not self.all_stations:
-            self.station_list.addItem("[No stations found]")
+            self.station_model.set_placeholder("[No stations found]")
+        elif self.search_bar.text().strip():
+            self.run_search()  # Keep the user's filter applied to the new catalog
         else:
             self.populate_station_list(self.all_stations)
 
+        self.stream_checks_timer.start()  # Probe and resolve once the selection has settled
+        self.stations_loaded.emit(self.loading_country or "")
+
+    def start_stream_checks(self):
+        """Probe the shown catalog's streams and resolve its playlists in the background."""
+        self.health.probe(self.all_stations)
+        self.radio_player.resolver.warm(station.url for station in self.all_stations)
+
+    def on_stream_probed(self, url, result):
+        """A stream health result arrived: repaint the list shortly (rows are not re-sorted under the user)."""
+        if not self.health_repaint_timer.isActive():
+            self.health_repaint_timer.start()
+
     def stop_fetch_thread(self):
-        """Stop the current fetch thread if it's running."""
-        if self.fetch_stations_worker and self.fetch_stations_worker.isRunning():
-            self.fetch_stations_worker.stop()
-            self.fetch_stations_worker.quit()
-            self.fetch_stations_worker.wait()
+        """
+        Cancel the current (or pending) fetch. Returns immediately: the worker
+        aborts its request on its own.
+        """
+        self.fetch_coordinator.cancel()
 
     # -------------------- Search / Filter --------------------
     def on_search_text_changed(self, text):
-        """Filter stations by search text (case-insensitive)."""
-        self.station_list.clear()
-        filtered = [s for s in self.all_stations if text.lower() in s.get("name", "").lower()]
+        """Restart the debounce timer; the search itself runs in run_search."""
+        self.search_timer.start()
+
+    def run_search(self):
+        """
+        Filter stations by the search text (name, tags, language and codec,
+        accent- and case-insensitive) using the indexed incremental search.
+        """
+        self.search_timer.stop()
+        text = self.search_bar.text()
+        if not text.strip():
+            if self.all_stations:
+                self.populate_station_list(self.all_stations)
+            return
+
+        if self.global_search_checkbox.isChecked():
+            self.start_global_search(text)
+            return
+
+        if self.station_search is None:
+            self.station_search = IncrementalSearch(StationSearchIndex(self.all_stations))
+        filtered = self.station_search.search(text)
+        metrics.observe("ui.search", self.station_search.last_query_ms / 1000)
+        log.debug("Search '%s': %d results in %.2f ms", text, len(filtered), self.station_search.last_query_ms)
+
         if not filtered:
-            self.station_list.addItem("[No results found]")
+            self.station_model.set_placeholder("[No results found]")
             return
 
-        for station in filtered:
-            self.station_list.addItem(station.get("name", "Unknown Station"))
+        self.station_model.set_stations(filtered)
+
+    def start_global_search(self, text):
+        """Query the cross-country index on a worker thread."""
+        worker = GlobalSearchWorker(text)
+        worker.results.connect(self.on_global_search_results)
+        worker.finished.connect(lambda w=worker: self.global_search_workers.discard(w))
+        self.global_search_workers.add(worker)  # Keep a reference while it runs
+        worker.start()
+
+    def on_global_search_results(self, query, stations):
+        """Show cross-country results, unless the user has typed on since."""
+        if query != self.search_bar.text() or not self.global_search_checkbox.isChecked():
+            return
+        if not stations:
+            self.station_model.set_placeholder("[No results found]")
+            return
+        self.station_model.set_stations(stations, show_country=True)
 
     # -------------------- Play / Stop Logic --------------------
-    def on_station_double_clicked(self, item):
+    def on_station_double_clicked(self, index):
         """Double-click plays the selected station (unless placeholder)."""
-        if "[No" in item.text():
+        if self.station_model.station_at(index.row()) is None:
             return
         self.play_selected_station()
 
     def play_selected_station(self):
         """Play the currently selected station, either from the main list or favorites."""
-        selected_items = self.station_list.selectedItems()
+        selected_indexes = self.station_list.selectedIndexes()
 
-        if not selected_items:
-            selected_favorite = self.favorites_widget.favorites_list.currentItem()
+        if not selected_indexes:
+            selected_favorite = self.favorites_widget.selected_key()
             if selected_favorite:
-                station_name = selected_favorite.text()
-                self.play_favorite_station(station_name)
+                self.play_favorite_station(selected_favorite)
             else:
                 QMessageBox.warning(self, "No selection", "Please select a station.")
             return
 
-        station_name = selected_items[0].data(Qt.ItemDataRole.UserRole) or selected_items[0].text()
-        if "[No" in station_name:
-            self.hide_spinner()
-            return
-
-        station_data = next((s for s in self.all_stations if s.get("name") == station_name), None)
+        row = selected_indexes[0].row()
+        station_data = self.station_model.station_at(row)
         if station_data:
-            url = station_data.get("url")
+            station_name = station_data.name
+            url = station_data.url
             if url:
                 self.show_spinner()
-                self.radio_player.play_station(url)
-                self.highlight_station_in_list(station_name)  # Ensure it's highlighted
-                self.now_playing_label.setText(f"Now playing: {station_name}")
+                self.radio_player.play(station_data)
+                self.unhighlight_favorites()
+                self.highlight_station(row)  # Ensure it's highlighted
+                self.set_now_playing(station_name)
                 self.wait_for_playing()
             else:
                 QMessageBox.warning(self, "No Stream URL", f"Station {station_name} has no stream URL.")
         else:
-            QMessageBox.warning(self, "Not Found", f"Could not find data for station: {station_name}.")
+            self.hide_spinner()
+
+    def set_now_playing(self, name):
+        """Remember and show the station that playback was requested for."""
+        self.now_playing_name = name
+        self.now_playing_label.setText(f"Now playing: {name}")
 
     def wait_for_playing(self):
         """
-        Poll the VLC player's state every 100 ms.
-        Hide the spinner as soon as it equals vlc.State.Playing.
+        Arm the start-up deadline. The spinner is hidden by on_player_playing
+        or on_player_error; if neither arrives in time, on_playback_deadline
+        gives up on the stream.
         """
-        state = self.radio_player.get_state()
-        if state == vlc.State.Playing:
-            # Music should be audible now
-            self.hide_spinner()
-        else:
-            # Try again in 100 ms
-            QTimer.singleShot(100, self.wait_for_playing)
+        self.playback_deadline.start()
+
+    def on_player_buffering(self, percent):
+        """Show buffering progress while a stream is starting."""
+        if self.playback_deadline.isActive() and self.now_playing_name:
+            self.now_playing_label.setText(f"Buffering: {self.now_playing_name} ({percent:.0f}%)")
+
+    def on_player_playing(self, url):
+        """VLC reports Playing: music should be audible now."""
+        self.playback_deadline.stop()
+        self.hide_spinner()
+        if self.now_playing_name:
+            self.now_playing_label.setText(f"Now playing: {self.now_playing_name}")
+        self.prebuffer_likely_next()
+
+    def on_station_hovered(self, index):
+        """Remember the hovered station; it is pre-buffered if the pointer stays."""
+        station = self.station_model.station_at(index.row())
+        if station is not None and station is not self.hovered_station:
+            self.hovered_station = station
+            self.hover_timer.start()
+
+    def prebuffer_likely_next(self):
+        """
+        Open the stations the user is most likely to switch to next in muted
+        standby players: the hovered row, the list neighbours of the playing
+        station and the next favorite. Only while something is meant to be
+        playing: hovering the list when stopped never downloads a stream.
+        """
+        if not self.radio_player.wants_playback:
+            return
+        candidates = []
+        if self.hovered_station is not None:
+            candidates.append(self.hovered_station.url)
+
+        playing_row = self.station_model.playing_row
+        if playing_row is not None:
+            for row in (playing_row + 1, playing_row - 1):
+                station = self.station_model.station_at(row)
+                if station is not None:
+                    candidates.append(station.url)
+
+        # The favorite after the playing (or selected) one
+        store = self.favorites_widget.store
+        key = self.radio_player.current_key or self.favorites_widget.selected_key()
+        row = store.row_of(key) if key else None
+        if row is not None and len(store) > 1:
+            candidates.append(store.at((row + 1) % len(store)).get("url"))
+
+        self.radio_player.prebuffer(candidates)
+
+    def on_player_error(self, url):
+        """VLC could not open or lost the stream."""
+        self.health.record_failure(url, "playback error")
+        if self.radio_player.reconnect.active:
+            return  # The reconnect supervisor takes over
+        self.playback_deadline.stop()
+        self.hide_spinner()
+        if self.now_playing_name:
+            self.now_playing_label.setText(f"Could not play: {self.now_playing_name}")
+
+    def on_player_reconnecting(self, url, attempt, delay):
+        """The stream dropped; the reconnect supervisor retries (possibly on another URL)."""
+        self.playback_deadline.stop()  # Attempts are bounded by the supervisor itself
+        self.show_spinner()
+        if self.now_playing_name:
+            self.now_playing_label.setText(
+                f"Reconnecting: {self.now_playing_name} (attempt {attempt}, in {delay:.0f} s)"
+            )
+
+    def on_player_gave_up(self, url, outage):
+        """Every reconnect attempt failed."""
+        self.hide_spinner()
+        self.radio_player.stop_station()
+        if self.now_playing_name:
+            self.now_playing_label.setText(f"Could not play: {self.now_playing_name}")
+
+    def on_playback_deadline(self):
+        """The stream did not start within PLAYBACK_START_DEADLINE_MS: stop trying."""
+        self.hide_spinner()
+        if self.radio_player.current_url:
+            self.health.record_failure(self.radio_player.current_url, "playback timed out")
+        self.radio_player.stop_station()
+        if self.now_playing_name:
+            self.now_playing_label.setText(f"No response from: {self.now_playing_name}")
+
+    def on_first_audio(self, url, seconds):
+        """Record time-to-first-audio for the station that just started."""
+        latencies = self.radio_player.zap_latencies
+        warm, cold = latencies["warm"], latencies["cold"]
+        log.info(
+            "Time to first audio for %s: %.2f s (avg pre-buffered %.2f s over %d, cold %.2f s over %d)",
+            self.now_playing_name or url, seconds,
+            sum(warm) / len(warm) if warm else 0, len(warm),
+            sum(cold) / len(cold) if cold else 0, len(cold),
+        )
 
     def stop_station(self):
         """Stop playback."""
+        self.playback_deadline.stop()
+        self.hide_spinner()
         self.radio_player.stop_station()
+        self.now_playing_name = None
         self.now_playing_label.setText("Now playing: Nothing")
         self.unhighlight_previous_station()
 
     def play_random_station(self):
-        """Pick a random station from the list (that has a valid URL)."""
+        """Pick a random station from the list (that has a valid URL and does not look broken)."""
         if not self.all_stations:
             QMessageBox.information(self, "No Stations", "No stations available.")
             return
 
         from random import choice
-        valid_stations = [s for s in self.all_stations if s.get("url")]
+        valid_stations = [s for s in self.all_stations if s.url]
+        healthy_stations = [s for s in valid_stations if not self.health.is_broken(s)]
+        valid_stations = healthy_stations or valid_stations  # Better a doubtful stream than none
         if not valid_stations:
             QMessageBox.warning(self, "No Valid Streams", "No station has a valid stream URL.")
             return
 
         self.show_spinner()
         station = choice(valid_stations)
-        name = station.get("name", "Unknown Station")
-        url = station["url"]  # guaranteed to exist from valid_stations
+        name = station.name  # url guaranteed to exist from valid_stations
 
-        self.radio_player.play_station(url)
-        self.now_playing_label.setText(f"Now playing: {name}")
+        self.radio_player.play(station)
+        self.set_now_playing(name)
 
         # Highlight in the list
-        matches = self.station_list.findItems(name, Qt.MatchFlag.MatchExactly)
-        if matches:
-            self.highlight_station(matches[0])
-            self.station_list.setCurrentItem(matches[0])
+        self.highlight_station_in_list(station.key)
 
-        # Poll for playing state
+        # Arm the start deadline; VLC's Playing event disarms it
         self.wait_for_playing()
 
     def set_volume(self, volume):
         """Adjust volume in the RadioPlayer."""
         self.radio_player.set_volume(volume)
 
+    # -------------------- Recording --------------------
+    def recording_target(self):
+        """The station the Record button acts on: the selected one, else the one playing."""
+        selected_indexes = self.station_list.selectedIndexes()
+        if selected_indexes:
+            station = self.station_model.station_at(selected_indexes[0].row())
+            if station is not None:
+                return station
+        return self.radio_player.current_station
+
+    def toggle_recording(self):
+        """Start or stop recording the selected (or playing) station; playback is not touched."""
+        station = self.recording_target()
+        if station is None or not station.url:
+            QMessageBox.information(self, "Nothing to Record", "Select or play a station to record it.")
+            return
+        if self.recorder.is_recording(station.key):
+            self.recorder.stop(station.key)
+        else:
+            try:
+                self.recorder.start(station.url, name=station.name, key=station.key)
+            except RecordingError as e:
+                QMessageBox.warning(self, "Cannot Record", str(e))
+                return
+        self.update_record_button()
+
+    def update_record_button(self, *args):
+        """Label the Record button for the current target and list running recordings in its tooltip."""
+        station = self.recording_target()
+        recording = station is not None and self.recorder.is_recording(station.key)
+        self.record_button.setText("Stop Recording" if recording else "Record")
+
+        running = self.recorder.recordings()
+        if not running:
+            self.recording_status_timer.stop()
+            self.record_button.setToolTip("Record the selected (or playing) station")
+            return
+        lines = []
+        for r in running:
+            line = f"{r.name}: {r.bytes_written / 1024 ** 2:.1f} MiB in {r.segments} file(s)"
+            if r.chunks_dropped:
+                line += f", {r.chunks_dropped} chunks dropped"
+            if r.reconnects:
+                line += f", {r.reconnects} reconnects"
+            lines.append(line)
+        lines.append(f"Saved to {self.recorder.directory}")
+        self.record_button.setToolTip("\n".join(lines))
+        if not self.recording_status_timer.isActive():
+            self.recording_status_timer.start()
+
     # -------------------- Highlighting Items --------------------
-    def highlight_station(self, item):
+    def highlight_station(self, row):
         """Bold the newly playing station in the main list."""
-        print(f"Highlighting item: {item.text()}")  # Debugging log
-
-        self.unhighlight_previous_station()  # Remove bold from the previously highlighted item
-        self.current_station_item = item
-
-        container_widget = self.station_list.itemWidget(item)
-        if container_widget:
-            # Apply bold font to the QLabel in the custom widget
-            station_label = container_widget.findChild(QLabel)
-            if station_label:
-                font = station_label.font()
-                font.setBold(True)
-                station_label.setFont(font)
-                print(f"Bold applied to custom widget: {station_label.text()}")  # Debugging log
-        else:
-            # Fallback for plain QListWidgetItem
-            font = item.font()
-            font.setBold(True)
-            item.setFont(font)
-            print(f"Bold applied to QListWidgetItem: {item.text()}")  # Debugging log
+        log.debug("Highlighting row: %s", row)
+
+        self.unhighlight_previous_station()  # Remove bold from the previously highlighted row
+        self.station_model.set_playing_row(row)
 
     def unhighlight_previous_station(self):
         """Remove bold formatting from the previously highlighted station."""
-        if self.current_station_item:
-            # Check if the item still exists in the station_list
-            for i in range(self.station_list.count()):
-                if self.station_list.item(i) == self.current_station_item:
-                    container_widget = self.station_list.itemWidget(self.current_station_item)
-                    if container_widget:
-                        # Reset the QLabel font in the custom widget
-                        station_label = container_widget.findChild(QLabel)
-                        if station_label:
-                            font = station_label.font()
-                            font.setBold(False)
-                            station_label.setFont(font)
-                    else:
-                        # Handle plain QListWidgetItem
-                        font = self.current_station_item.font()
-                        font.setBold(False)
-                        self.current_station_item.setFont(font)
-                    break
-
-            # Clear the current station reference
-            self.current_station_item = None
+        self.station_model.set_playing_row(None)
 
         # Clear selection in the Favorites List
-        self.favorites_widget.favorites_list.clearSelection()
+        self.favorites_widget.clear_selection()
 
     def show_message(self, title: str, message: str):
         msg_box = QMessageBox(self)
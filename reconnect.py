@@ -0,0 +1,163 @@
+# reconnect.py
+
+import logging
+import random
+import time
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from vlc_loader import load_vlc
+import metrics
+from constants import (
+    RECONNECT_BASE_DELAY, RECONNECT_MAX_DELAY, RECONNECT_MAX_ATTEMPTS, RECONNECT_ATTEMPT_TIMEOUT_MS,
+)
+
+log = logging.getLogger(__name__)
+
+
+class ReconnectSupervisor(QObject):
+    """
+    Brings a live stream back after a playback error or an unexpected
+    Stopped/EndReached event.
+
+    Attempts are spaced by exponential backoff with jitter and cycle through
+    the station's candidate URLs: the URL that failed, its `url_resolved`,
+    then the URLs of other stations with the same name (mirrors of the same
+    broadcast). A deliberate `RadioPlayer.stop_station` or a new play
+    request cancels the supervisor.
+
+    Only a stream that has reached Playing is supervised. A station that
+    fails on its first open is left to the window's start deadline, so a
+    dead station is reported in seconds rather than after every retry.
+    """
+    reconnecting = pyqtSignal(str, int, float)  # stream URL, attempt number, delay in seconds
+    recovered = pyqtSignal(str, float)          # stream URL now playing, outage in seconds
+    gave_up = pyqtSignal(str, float)            # stream URL that failed, outage in seconds
+
+    def __init__(self, player, max_attempts=RECONNECT_MAX_ATTEMPTS):
+        """
+        Args:
+            player (RadioPlayer): The player to supervise.
+            max_attempts (int): Attempts before giving up on an outage.
+        """
+        super().__init__(player)
+        self.player = player
+        self.max_attempts = max_attempts
+        self.outages = []  # (stream URL, seconds) of recovered outages, most recent last
+
+        self._candidates = []
+        self._attempt = 0
+        self._outage_started = None
+        self._failed_url = ""
+        self._established = False  # The current stream has played since the last play request
+
+        self._retry_timer = QTimer(self)
+        self._retry_timer.setSingleShot(True)
+        self._retry_timer.timeout.connect(self._retry)
+        self._attempt_timer = QTimer(self)  # Bounds an attempt that neither plays nor fails
+        self._attempt_timer.setSingleShot(True)
+        self._attempt_timer.setInterval(RECONNECT_ATTEMPT_TIMEOUT_MS)
+        self._attempt_timer.timeout.connect(self._on_failure)
+
+        # Emitted from VLC's thread: these slots run queued on this object's thread
+        player.error.connect(self._on_failure)
+        player.stopped.connect(self._on_stopped)
+        player.playing.connect(self._on_playing)
+
+    @property
+    def active(self):
+        """True while an outage is being handled."""
+        return self._outage_started is not None
+
+    def cancel(self):
+        """Forget the current outage and stop supervising (the user stopped or picked another station)."""
+        self._established = False
+        self._retry_timer.stop()
+        self._attempt_timer.stop()
+        self._outage_started = None
+        self._candidates = []
+        self._attempt = 0
+
+    # ---- Player events ----
+    def _on_stopped(self):
+        # A Stopped event seen while the player is (re)starting or running
+        # belongs to media that has already been replaced by a station switch
+        state = load_vlc().State
+        if self.player.get_state() in (state.Opening, state.Buffering, state.Playing):
+            return
+        self._on_failure()
+
+    def _on_failure(self, *args):
+        if not self.player.wants_playback or self._retry_timer.isActive():
+            return
+        if self._outage_started is None and not self._established:
+            return  # Never played: not an outage, the start deadline handles it
+        self._attempt_timer.stop()
+
+        if self._outage_started is None:
+            self._outage_started = time.monotonic()
+            self._failed_url = self.player.current_url
+            self._candidates = self._candidate_urls()
+            self._attempt = 0
+            metrics.count("player.outages")
+            log.warning("Stream interrupted: %s", self._failed_url)
+
+        if self._attempt >= self.max_attempts or not self._candidates:
+            outage = time.monotonic() - self._outage_started
+            failed_url = self._failed_url
+            self.cancel()
+            metrics.count("player.reconnect.gave_up")
+            metrics.observe("player.outage", outage)
+            log.warning("Giving up on %s after %.1f s", failed_url, outage)
+            self.gave_up.emit(failed_url, outage)
+            return
+
+        delay = min(RECONNECT_MAX_DELAY, RECONNECT_BASE_DELAY * 2 ** self._attempt)
+        delay *= random.uniform(0.5, 1.0)  # Jitter: clients dropped together do not return together
+        self._attempt += 1
+        url = self._candidates[(self._attempt - 1) % len(self._candidates)]
+        self.reconnecting.emit(url, self._attempt, delay)
+        self._retry_timer.start(int(delay * 1000))
+
+    def _retry(self):
+        if not self.player.wants_playback:
+            self.cancel()
+            return
+        url = self._candidates[(self._attempt - 1) % len(self._candidates)]
+        metrics.count("player.reconnect.attempts")
+        log.info("Reconnect attempt %s/%s: %s", self._attempt, self.max_attempts, url)
+        self._attempt_timer.start()
+        self.player.reopen(url)
+
+    def _on_playing(self, url):
+        if self._outage_started is None:
+            self._established = True
+            return
+        outage = time.monotonic() - self._outage_started
+        self.outages.append((url, outage))
+        del self.outages[:-100]  # Keep the most recent outages
+        self.cancel()
+        self._established = True
+        metrics.count("player.reconnect.recovered")
+        metrics.observe("player.outage", outage)
+        log.info("Stream recovered after %.1f s: %s", outage, url)
+        self.recovered.emit(url, outage)
+
+    # ---- Failover ----
+    def _candidate_urls(self):
+        """URLs to try, in order: the failed one, its resolved form, then same-name stations."""
+        urls = [self.player.current_url]
+        station = self.player.current_station
+        if station is not None:
+            urls += [station.url, station.url_resolved]
+            index = self.player.station_index
+            for key in index.keys_for_name(station.name):
+                alternate = index.get(key)
+                if alternate is not None and alternate.key != station.key:
+                    urls += [alternate.url, alternate.url_resolved]
+
+        candidates = []
+        for url in urls:
+            if url and url not in candidates and self.player.is_valid_url(url):
+                candidates.append(url)
+        return candidates
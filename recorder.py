@@ -0,0 +1,417 @@
+# recorder.py
+
+import atexit
+import logging
+import os
+import queue
+import random
+import re
+import threading
+import time
+from collections import deque
+
+import metrics
+from constants import (
+    RECORDING_SEGMENT_SECONDS, RECORDING_DISK_BUDGET, RECORDING_MAX_CONCURRENT, RECORDING_CHUNK_SIZE,
+    RECORDING_QUEUE_CHUNKS, RECORDING_READ_TIMEOUT, RECONNECT_BASE_DELAY, RECONNECT_MAX_DELAY,
+)
+from mirrors import create_session
+from paths import user_recordings_dir
+from playlist import get_playlist_resolver, looks_like_playlist
+
+log = logging.getLogger(__name__)
+
+# File extension for a stream's Content-Type; anything else is saved as .bin
+EXTENSIONS = {
+    "audio/mpeg": "mp3", "audio/mp3": "mp3",
+    "audio/aac": "aac", "audio/aacp": "aac", "audio/x-aac": "aac",
+    "audio/ogg": "ogg", "application/ogg": "ogg", "audio/opus": "opus",
+    "audio/flac": "flac", "video/mp2t": "ts",
+}
+
+
+class RecordingError(Exception):
+    """Raised when a recording cannot be started."""
+
+
+# Name of a segment file written by Recording._open_segment: <timestamp>[-n].<ext>
+SEGMENT_NAME = re.compile(
+    r"^\d{8}-\d{6}(-\d+)?\.(%s)$" % "|".join(sorted(set(EXTENSIONS.values()) | {"bin"}))
+)
+
+
+def _slug(text):
+    """File-system-safe version of a station name."""
+    return re.sub(r"[^\w.-]+", "_", text).strip("._")[:60] or "stream"
+
+
+class Recording:
+    """
+    One stream being saved to disk in time-based segments.
+
+    A reader thread downloads the raw stream (its own connection, separate
+    from playback) into a bounded queue; a writer thread drains the queue
+    into the current segment file and starts a new file every
+    `segment_seconds`. If the disk falls behind and the queue is full, new
+    chunks are dropped and counted instead of stalling the download. Network
+    errors and ended streams reconnect with jittered backoff until the
+    recording is stopped.
+    """
+
+    def __init__(self, manager, key, url, name, segment_seconds=RECORDING_SEGMENT_SECONDS):
+        """
+        Args:
+            manager (RecordingManager): Owner; enforces the disk budget.
+            key (str): Identifies the recording (station key, or the URL).
+            url (str): Stream or playlist URL.
+            name (str): Station name, used for the recording's folder.
+            segment_seconds (float): Length of one segment file.
+        """
+        self.manager = manager
+        self.key = key
+        self.url = url
+        self.name = name or url
+        self.segment_seconds = segment_seconds
+        self.directory = os.path.join(manager.directory, _slug(self.name))
+        self.started_at = time.time()
+
+        # Counters: each is only updated by one of the two threads
+        self.bytes_received = 0
+        self.bytes_written = 0
+        self.chunks_dropped = 0
+        self.bytes_dropped = 0
+        self.segments = 0
+        self.reconnects = 0
+        self.content_type = ""
+        self.error = ""
+        self.segment_path = None  # File being written
+        self.segment_bytes = 0
+
+        self._queue = queue.Queue(RECORDING_QUEUE_CHUNKS)
+        self._stop = threading.Event()
+        self._finished = threading.Event()  # Set once the writer has closed its last segment
+        self._response = None
+        self._session = create_session()
+        self._reader = threading.Thread(target=self._read, name=f"record-read-{_slug(self.name)}", daemon=True)
+        self._writer = threading.Thread(target=self._write, name=f"record-write-{_slug(self.name)}", daemon=True)
+
+    def start(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self._reader.start()
+        self._writer.start()
+        log.info("Recording %s to %s", self.name, self.directory)
+
+    def stop(self, wait=False):
+        """
+        Stop downloading; what is already queued is still written out.
+        Args:
+            wait (bool): Block until the last segment is closed (at most a few seconds).
+        """
+        self._stop.set()
+        response = self._response
+        if response is not None:
+            try:
+                response.close()  # Wakes a reader blocked on the socket
+            except Exception:
+                pass
+        if wait:
+            self._finished.wait(timeout=5)
+
+    @property
+    def active(self):
+        return not self._finished.is_set()
+
+    def stats(self):
+        elapsed = max(time.time() - self.started_at, 1e-9)
+        return {
+            "key": self.key,
+            "name": self.name,
+            "url": self.url,
+            "active": self.active,
+            "content_type": self.content_type,
+            "segment": self.segment_path,
+            "segments": self.segments,
+            "seconds": elapsed,
+            "bytes_received": self.bytes_received,
+            "bytes_written": self.bytes_written,
+            "throughput_bps": self.bytes_written / elapsed,
+            "chunks_dropped": self.chunks_dropped,
+            "bytes_dropped": self.bytes_dropped,
+            "reconnects": self.reconnects,
+            "error": self.error,
+        }
+
+    # ---- Reader thread ----
+    def _stream_url(self):
+        """The direct stream URL: playlists are resolved (through the shared cache) first."""
+        resolver = get_playlist_resolver()
+        url = resolver.stream_url(self.url)
+        if url == self.url and looks_like_playlist(url):
+            url = resolver.resolve(url) or url
+        return url
+
+    def _read(self):
+        attempt = 0
+        while not self._stop.is_set():
+            try:
+                with self._session.get(self._stream_url(), stream=True, timeout=RECORDING_READ_TIMEOUT) as response:
+                    response.raise_for_status()
+                    self._response = response
+                    self.content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+                    for chunk in response.iter_content(RECORDING_CHUNK_SIZE):
+                        if self._stop.is_set():
+                            return
+                        if not chunk:
+                            continue
+                        attempt = 0  # Data is flowing again
+                        self.bytes_received += len(chunk)
+                        try:
+                            self._queue.put_nowait(chunk)
+                        except queue.Full:
+                            self.chunks_dropped += 1
+                            self.bytes_dropped += len(chunk)
+                            metrics.count("recorder.bytes_dropped", len(chunk))
+                self.error = "stream ended"
+            except Exception as e:  # requests errors, or the response closed under us by stop()
+                if self._stop.is_set():
+                    return
+                self.error = str(e)
+            finally:
+                self._response = None
+
+            delay = min(RECONNECT_MAX_DELAY, RECONNECT_BASE_DELAY * 2 ** attempt) * random.uniform(0.5, 1.0)
+            attempt += 1
+            self.reconnects += 1
+            metrics.count("recorder.reconnects")
+            log.warning("Recording of %s interrupted (%s), reconnecting in %.1f s", self.name, self.error, delay)
+            self._stop.wait(delay)
+
+    # ---- Writer thread ----
+    def _write(self):
+        segment = None
+        segment_started = 0.0
+        try:
+            while True:
+                try:
+                    chunk = self._queue.get(timeout=0.5)
+                except queue.Empty:
+                    if self._stop.is_set():
+                        break  # Stopped and drained
+                    continue
+                now = time.monotonic()
+                if segment is None or now - segment_started >= self.segment_seconds:
+                    if segment is not None:
+                        self._close_segment(segment)
+                    segment = self._open_segment()
+                    segment_started = now
+                segment.write(chunk)
+                self.bytes_written += len(chunk)
+                self.segment_bytes += len(chunk)
+                metrics.count("recorder.bytes_written", len(chunk))
+        except OSError as e:
+            self.error = f"write failed: {e}"
+            log.error("Recording of %s stopped: %s", self.name, self.error)
+            self._stop.set()
+        finally:
+            if segment is not None:
+                self._close_segment(segment)
+            self._finished.set()
+
+    def _open_segment(self):
+        extension = EXTENSIONS.get(self.content_type, "bin")
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(self.directory, f"{stamp}.{extension}")
+        suffix = 1
+        while True:
+            try:
+                segment = open(path, "xb")  # Never overwrite an earlier segment
+                break
+            except FileExistsError:
+                suffix += 1
+                path = os.path.join(self.directory, f"{stamp}-{suffix}.{extension}")
+        self.segment_path = path
+        self.segment_bytes = 0
+        self.segments += 1
+        return segment
+
+    def _close_segment(self, segment):
+        segment.close()
+        path, size = self.segment_path, self.segment_bytes
+        self.segment_path = None
+        self.segment_bytes = 0
+        self.manager._segment_closed(path, size)
+
+
+class RecordingManager:
+    """
+    Runs concurrent recordings and keeps them within a disk budget.
+
+    Finished segments count towards the budget, including those of earlier
+    sessions; when a segment is closed and the total exceeds `disk_budget`,
+    the oldest segments are deleted first. Only files the recorder writes
+    are counted or deleted: names matching `SEGMENT_NAME` in the station
+    folders directly under `directory`. Anything else the user keeps there
+    is left alone.
+
+    Nothing is created on disk until a recording starts; looking at
+    `directory` or `stats()` before then only reads.
+    """
+
+    def __init__(self, directory=None, disk_budget=RECORDING_DISK_BUDGET,
+                 segment_seconds=RECORDING_SEGMENT_SECONDS, max_concurrent=RECORDING_MAX_CONCURRENT):
+        self._directory = directory
+        self.disk_budget = disk_budget
+        self.segment_seconds = segment_seconds
+        self.max_concurrent = max_concurrent
+        self.deleted_segments = 0
+
+        self._lock = threading.Lock()
+        self._recordings = {}  # key -> Recording
+        self._segments = deque()  # (path, size) of finished segments, oldest first
+        self._segments_bytes = 0
+        self._scanned = False
+        atexit.register(self.stop_all)
+
+    @property
+    def directory(self):
+        if self._directory is None:
+            self._directory = user_recordings_dir(create=False)  # Recording.start creates it
+        return self._directory
+
+    def _scan(self):
+        """Account for the segments left by earlier sessions. Caller holds the lock."""
+        if self._scanned:
+            return
+        self._scanned = True
+        found = []
+        try:
+            folders = [entry.path for entry in os.scandir(self.directory) if entry.is_dir(follow_symlinks=False)]
+        except OSError:
+            folders = []  # Nothing recorded yet
+        for folder in folders:
+            try:
+                entries = list(os.scandir(folder))
+            except OSError:
+                continue
+            for entry in entries:
+                if not SEGMENT_NAME.match(entry.name) or not entry.is_file(follow_symlinks=False):
+                    continue
+                try:
+                    info = entry.stat()
+                except OSError:
+                    continue
+                found.append((info.st_mtime, entry.path, info.st_size))
+        for _, path, size in sorted(found):
+            self._segments.append((path, size))
+            self._segments_bytes += size
+
+    # ---- Recordings ----
+    def start(self, url, name="", key=None):
+        """
+        Start recording a stream (or return its running recording).
+        Args:
+            url (str): Stream or playlist URL.
+            name (str): Station name, used for the folder the segments go to.
+            key (str): Identifies the recording; defaults to the URL.
+        Returns:
+            Recording
+        Raises:
+            RecordingError: When `max_concurrent` recordings are already running.
+        """
+        key = key or url
+        with self._lock:
+            self._scan()
+            self._prune()
+            recording = self._recordings.get(key)
+            if recording is not None:
+                return recording
+            if len(self._recordings) >= self.max_concurrent:
+                raise RecordingError(f"Already recording {len(self._recordings)} streams")
+            recording = Recording(self, key, url, name, self.segment_seconds)
+            self._recordings[key] = recording
+        recording.start()
+        metrics.count("recorder.started")
+        return recording
+
+    def stop(self, key, wait=False):
+        """Stop a recording. Returns it, or None if `key` was not being recorded."""
+        with self._lock:
+            recording = self._recordings.pop(key, None)
+        if recording is not None:
+            recording.stop(wait)
+            log.info("Stopped recording %s", recording.name)
+        return recording
+
+    def stop_all(self, wait=True):
+        with self._lock:
+            recordings = list(self._recordings.values())
+            self._recordings.clear()
+        for recording in recordings:
+            recording.stop()
+        if wait:
+            for recording in recordings:
+                recording.stop(wait=True)
+
+    def is_recording(self, key):
+        recording = self._recordings.get(key)
+        return recording is not None and recording.active
+
+    def get(self, key):
+        return self._recordings.get(key)
+
+    def recordings(self):
+        """Running recordings."""
+        with self._lock:
+            self._prune()
+            return list(self._recordings.values())
+
+    def _prune(self):
+        """Forget recordings whose writer has ended on its own (disk error). Caller holds the lock."""
+        for key in [key for key, recording in self._recordings.items() if not recording.active]:
+            del self._recordings[key]
+
+    # ---- Disk budget ----
+    def disk_used(self):
+        """Bytes used by finished segments and the segments being written."""
+        with self._lock:
+            self._scan()
+            return self._segments_bytes + sum(r.segment_bytes for r in self._recordings.values())
+
+    def _segment_closed(self, path, size):
+        with self._lock:
+            self._segments.append((path, size))
+            self._segments_bytes += size
+            in_progress = sum(r.segment_bytes for r in self._recordings.values())
+            while self._segments and self._segments_bytes + in_progress > self.disk_budget:
+                old_path, old_size = self._segments.popleft()
+                self._segments_bytes -= old_size
+                try:
+                    os.remove(old_path)
+                    self.deleted_segments += 1
+                    log.info("Deleted old recording %s to stay within the disk budget", old_path)
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    log.warning("Could not delete old recording %s: %s", old_path, e)
+
+    def stats(self):
+        return {
+            "directory": self.directory,
+            "disk_budget": self.disk_budget,
+            "disk_used": self.disk_used(),
+            "deleted_segments": self.deleted_segments,
+            "recordings": [recording.stats() for recording in self.recordings()],
+        }
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_recording_manager():
+    """Return the process-wide RecordingManager, creating it on first use."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = RecordingManager()
+        return _manager
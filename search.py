@@ -0,0 +1,144 @@
+# search.py
+
+import re
+import time
+import unicodedata
+
+_NON_WORD = re.compile(r"[\W_]+")  # Keeps letters and digits of every script
+
+
+def normalize(text):
+    """
+    Normalize text for searching: strip accents, casefold and collapse
+    punctuation to single spaces ("Radio Télé-Congo" -> "radio tele congo").
+    Letters of non-Latin scripts (Arabic, Ge'ez, ...) are kept.
+    """
+    if not text:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return _NON_WORD.sub(" ", stripped.casefold()).strip()
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class StationSearchIndex:
+    """
+    Precomputed search index over a station list.
+
+    Each station's name, tags, language and codec are normalized once into a
+    single search text. Query tokens of three or more characters are looked up
+    in a trigram index and then verified as substrings; shorter tokens are
+    matched against word prefixes. All tokens must match.
+    """
+
+    FIELDS = ("name", "tags", "language", "codec")
+
+    def __init__(self, stations):
+        self.stations = stations
+        self._texts = []
+        self._trigrams = {}  # trigram -> list of positions (ascending)
+        self._prefixes = {}  # 1 and 2 character word prefix -> list of positions
+        for position, station in enumerate(stations):
+            text = normalize(" ".join(getattr(station, field) for field in self.FIELDS))
+            self._texts.append(text)
+            for gram in _trigrams(text):
+                self._trigrams.setdefault(gram, []).append(position)
+            prefixes = set()
+            for word in text.split():
+                prefixes.add(word[:1])
+                prefixes.add(word[:2])
+            for prefix in prefixes:
+                self._prefixes.setdefault(prefix, []).append(position)
+
+    def __len__(self):
+        return len(self.stations)
+
+    def _match_token(self, token, candidates):
+        """Positions (from `candidates`, or all stations if None) matching one token."""
+        if len(token) < 3:
+            postings = self._prefixes.get(token, ())
+            if candidates is None:
+                return list(postings)
+            wanted = set(postings)
+            return [p for p in candidates if p in wanted]
+
+        if candidates is None:
+            grams = sorted(_trigrams(token), key=lambda g: len(self._trigrams.get(g, ())))
+            postings = self._trigrams.get(grams[0])
+            if not postings:
+                return []
+            candidates = postings  # Rarest trigram first, then verify the rest
+        texts = self._texts
+        return [p for p in candidates if token in texts[p]]
+
+    def search(self, tokens, within=None):
+        """
+        Return the positions of the stations matching every token.
+        Args:
+            tokens (list): Normalized query tokens.
+            within (list): Restrict the search to these positions (incremental narrowing).
+        Returns:
+            list: Matching positions in catalog order.
+        """
+        if not tokens:
+            return list(range(len(self.stations))) if within is None else list(within)
+        candidates = within
+        # Long tokens are more selective: apply them first to shrink the candidate set
+        for token in sorted(tokens, key=len, reverse=True):
+            candidates = self._match_token(token, candidates)
+            if not candidates:
+                return []
+        return candidates
+
+
+class IncrementalSearch:
+    """
+    Stateful search session over a StationSearchIndex.
+    When a query only extends the previous one (more characters typed), the
+    previous result set is filtered instead of the full catalog.
+    """
+
+    def __init__(self, index):
+        self.index = index
+        self._last_tokens = None
+        self._last_results = None
+        self.last_query_ms = 0.0
+        self.last_narrowed = False
+
+    def _can_narrow(self, tokens):
+        previous = self._last_tokens
+        if previous is None or not previous or len(tokens) < len(previous):
+            return False
+        for old, new in zip(previous, tokens):
+            if not new.startswith(old):
+                return False
+            # Prefix matching (short tokens) and substring matching (long ones) don't nest
+            if old != new and (len(old) < 3) != (len(new) < 3):
+                return False
+        return True
+
+    def search(self, query):
+        """
+        Return the stations matching `query` and record the query latency
+        in `last_query_ms`.
+        """
+        started = time.perf_counter()
+        tokens = normalize(query).split()
+        if not tokens and query.strip():
+            # Nothing searchable (only punctuation or symbols): match nothing, not everything
+            self.last_narrowed = False
+            self._last_tokens = self._last_results = None
+            self.last_query_ms = (time.perf_counter() - started) * 1000.0
+            return []
+        self.last_narrowed = self._can_narrow(tokens)
+        within = self._last_results if self.last_narrowed else None
+        positions = self.index.search(tokens, within)
+        self._last_tokens = tokens
+        self._last_results = positions
+        stations = self.index.stations
+        results = [stations[p] for p in positions]
+        self.last_query_ms = (time.perf_counter() - started) * 1000.0
+        return results
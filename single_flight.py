@@ -0,0 +1,88 @@
+# single_flight.py
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from cancel import CancelToken
+from constants import FETCH_CANCEL_POLL, FETCH_DEADLINE
+
+
+class _Call:
+    """One in-flight call shared by every caller that asked for the same key."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.token = CancelToken(FETCH_DEADLINE)
+        self.waiters = 0
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key into one.
+
+    The first caller for a key starts the call on a pool thread; callers
+    arriving while it runs wait for the same result instead of repeating the
+    work. Every caller can give up through its own CancelToken; the shared
+    call itself is cancelled only once all of its callers have given up.
+    """
+
+    def __init__(self, max_workers=6):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="single-flight")
+        self.started = 0    # Calls actually made
+        self.coalesced = 0  # Callers that joined a call already in flight
+        self.cancelled = 0  # Shared calls cancelled because every caller gave up
+
+    def do(self, key, fn, cancel=None):
+        """
+        Return fn(token) for `key`, sharing an in-flight call if there is one.
+        Args:
+            key: Identifies equivalent calls (e.g. the country name).
+            fn (callable): Receives the shared CancelToken.
+            cancel (CancelToken): This caller's own token.
+        Raises:
+            FetchCancelled: if this caller's token was cancelled first.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = _Call()
+                self._calls[key] = call
+                self.started += 1
+                self._executor.submit(self._run, key, call, fn)
+            else:
+                self.coalesced += 1
+            call.waiters += 1
+
+        while not call.done.wait(FETCH_CANCEL_POLL if cancel is not None else None):
+            if cancel.cancelled:
+                with self._lock:
+                    call.waiters -= 1
+                    if call.waiters == 0 and not call.done.is_set():
+                        call.token.cancel()  # Nobody is left to use the result
+                        self.cancelled += 1
+                        if self._calls.get(key) is call:
+                            del self._calls[key]  # Later callers start afresh
+                cancel.check()
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def _run(self, key, call, fn):
+        try:
+            call.result = fn(call.token)
+        except Exception as e:
+            call.error = e
+        finally:
+            with self._lock:
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            call.done.set()
+
+    def stats(self):
+        with self._lock:
+            return {"started": self.started, "coalesced": self.coalesced, "cancelled": self.cancelled}
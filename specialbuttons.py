@@ -1,34 +1,53 @@
-from pynput.keyboard import Key, Listener
+import logging
 import threading
 
-class MediaKeyListener:
+from PyQt6.QtCore import QObject, pyqtSignal
+
+log = logging.getLogger(__name__)
+
+class MediaKeyListener(QObject):
     """
     A class to listen to media keys and control playback.
+    pynput is imported by the listener thread itself, so creating (and
+    starting) the listener costs the UI thread nothing.
+
+    Key presses arrive on pynput's thread. They are only turned into a
+    queued signal there; the player is driven from this object's (the
+    player's) thread, where its timers live.
     """
+    key_pressed = pyqtSignal(str)  # "play_pause", "next" or "previous"
 
     def __init__(self, radio_player):
+        super().__init__(radio_player)
         self.radio_player = radio_player
+        self.key_pressed.connect(self._handle_key)  # Queued: emitted from pynput's thread
         self.listener_thread = threading.Thread(target=self._start_listener)
         self.listener_thread.daemon = True
 
     def _on_press(self, key):
+        from pynput.keyboard import Key  # Already loaded by _start_listener
+        actions = {Key.media_play_pause: "play_pause", Key.media_next: "next", Key.media_previous: "previous"}
+        action = actions.get(key)
+        if action is not None:
+            log.debug("Media key pressed: %s", action)
+            self.key_pressed.emit(action)
+
+    def _handle_key(self, action):
         try:
-            if key == Key.media_play_pause:
-                print("Play/Pause button pressed.")
+            if action == "play_pause":
                 if self.radio_player.is_playing():
                     self.radio_player.stop_station()
                 else:
-                    self.radio_player.play_station(self.radio_player._current_url)
-            elif key == Key.media_next:
-                print("Next button pressed.")
+                    self.radio_player.play_station(self.radio_player.current_url)
+            elif action == "next":
                 self.radio_player.play_next_station()
-            elif key == Key.media_previous:
-                print("Previous button pressed.")
+            elif action == "previous":
                 self.radio_player.play_previous_station()
         except Exception as e:
-            print(f"Error handling key press: {e}")
+            log.error("Error handling key press: %s", e)
 
     def _start_listener(self):
+        from pynput.keyboard import Listener
         with Listener(on_press=self._on_press) as listener:
             listener.join()
 
@@ -0,0 +1,167 @@
+# stall_watchdog.py
+
+import logging
+import logging.handlers
+import os
+import sys
+import threading
+import time
+import traceback
+
+from PyQt6.QtCore import QEvent, QObject, QTimer
+
+import metrics
+from constants import (
+    WATCHDOG_HEARTBEAT_MS, WATCHDOG_STALL_THRESHOLD, WATCHDOG_LOG_MAX_BYTES, WATCHDOG_LOG_BACKUPS,
+)
+from paths import user_cache_dir
+
+log = logging.getLogger(__name__)
+
+# Input events remembered as "the last UI action" for stall reports
+_ACTION_EVENTS = {
+    QEvent.Type.MouseButtonPress: "click",
+    QEvent.Type.MouseButtonDblClick: "double-click",
+    QEvent.Type.KeyPress: "key press",
+    QEvent.Type.Wheel: "scroll",
+}
+
+
+def _describe_widget(obj):
+    """Short description of the object an input event went to: class, name and text."""
+    parts = [type(obj).__name__]
+    name = obj.objectName()
+    if name:
+        parts.append(f"#{name}")
+    text = getattr(obj, "text", None)
+    if callable(text):
+        try:
+            text = text()
+        except TypeError:
+            text = None
+        if isinstance(text, str) and text:
+            parts.append(repr(text[:40]))
+    return " ".join(parts)
+
+
+def format_thread_stacks():
+    """Python stacks of every other thread, the main (UI) thread first."""
+    names = {thread.ident: thread.name for thread in threading.enumerate()}
+    main_ident = threading.main_thread().ident
+    frames = sorted(sys._current_frames().items(), key=lambda item: item[0] != main_ident)
+    sections = []
+    for ident, frame in frames:
+        if ident == threading.get_ident():
+            continue  # The caller's own stack says nothing about the stall
+        header = f"Thread {names.get(ident, '?')} ({ident})"
+        if ident == main_ident:
+            header += " [UI]"
+        sections.append(header + ":\n" + "".join(traceback.format_stack(frame)))
+    return "\n".join(sections)
+
+
+class StallWatchdog(QObject):
+    """
+    Detects UI event-loop stalls and records what caused them.
+
+    A timer on the UI thread stamps a heartbeat every WATCHDOG_HEARTBEAT_MS.
+    A daemon thread checks the stamp; once it is older than `threshold`
+    seconds, the stacks of all threads and the last user action (the most
+    recent click, key press or scroll, and the widget it went to) are
+    written to a rolling diagnostics file. When the event loop comes back,
+    the stall's total duration is logged and recorded as "ui.stall".
+
+    Modal dialogs run their own event loop and keep the heartbeat going, so
+    they are not reported.
+    """
+
+    def __init__(self, app, threshold=WATCHDOG_STALL_THRESHOLD, path=None):
+        """
+        Args:
+            app (QCoreApplication): The application whose event loop is watched.
+            threshold (float): Seconds without a heartbeat that count as a stall.
+            path (str): Diagnostics file (default: <cache dir>/diagnostics/stalls.log).
+        """
+        super().__init__(app)
+        self.app = app
+        self.threshold = threshold
+        self.path = path or os.path.join(user_cache_dir(), "diagnostics", "stalls.log")
+        self.stalls = 0
+
+        self._lock = threading.Lock()
+        self._last_beat = None  # Armed by the first heartbeat, once the event loop runs
+        self._stalled_since = None  # Time of the last heartbeat before the current stall
+        self._last_action = None  # (monotonic time, description)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._watch, name="ui-watchdog", daemon=True)
+
+        self._heartbeat = QTimer(self)
+        self._heartbeat.setInterval(WATCHDOG_HEARTBEAT_MS)
+        self._heartbeat.timeout.connect(self._beat)
+
+        self._report = logging.getLogger("stalls")  # Stack dumps go to the file, not the console
+        self._report.propagate = False
+        self._report.setLevel(logging.INFO)
+
+    def start(self):
+        """Start the heartbeat and the watchdog thread."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        handler = logging.handlers.RotatingFileHandler(
+            self.path, maxBytes=WATCHDOG_LOG_MAX_BYTES, backupCount=WATCHDOG_LOG_BACKUPS,
+            encoding="utf-8", delay=True,
+        )
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        self._report.handlers[:] = [handler]
+        self.app.installEventFilter(self)
+        self._heartbeat.start()
+        self._thread.start()
+
+    def stop(self):
+        self._heartbeat.stop()
+        self.app.removeEventFilter(self)
+        self._stop.set()
+
+    def eventFilter(self, obj, event):
+        action = _ACTION_EVENTS.get(event.type())
+        if action is not None and obj.isWidgetType():
+            self._last_action = (time.monotonic(), f"{action} on {_describe_widget(obj)}")
+        return False
+
+    # ---- UI thread ----
+    def _beat(self):
+        now = time.monotonic()
+        with self._lock:
+            stalled_since, self._stalled_since = self._stalled_since, None
+            self._last_beat = now
+        if stalled_since is not None:
+            duration = now - stalled_since
+            metrics.observe("ui.stall", duration)
+            log.warning("UI event loop was blocked for %.2f s (details in %s)", duration, self.path)
+            self._report.info("Stall ended after %.2f s\n", duration)
+
+    # ---- Watchdog thread ----
+    def _watch(self):
+        poll = max(self.threshold / 4, WATCHDOG_HEARTBEAT_MS / 1000)
+        while not self._stop.wait(poll):
+            with self._lock:
+                last_beat = self._last_beat
+                if last_beat is None or self._stalled_since is not None:
+                    continue  # Not armed yet, or this stall is already reported
+                blocked = time.monotonic() - last_beat
+                if blocked < self.threshold:
+                    continue
+                self._stalled_since = last_beat
+            self._record_stall(last_beat, blocked)
+
+    def _record_stall(self, last_beat, blocked):
+        self.stalls += 1
+        metrics.count("ui.stalls")
+        last_action = self._last_action
+        if last_action is None:
+            action = "none recorded"
+        else:
+            action = f"{last_action[1]}, {time.monotonic() - last_action[0]:.2f} s ago"
+        self._report.info(
+            "UI event loop blocked for %.2f s (threshold %.2f s)\nLast UI action: %s\n%s",
+            blocked, self.threshold, action, format_thread_stacks(),
+        )
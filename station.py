@@ -0,0 +1,149 @@
+# station.py
+
+import sys
+
+
+def _text(value):
+    return value if isinstance(value, str) else ("" if value is None else str(value))
+
+
+def _interned(value):
+    return sys.intern(_text(value))
+
+
+def _int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+class Station:
+    """
+    Compact radio station record.
+
+    The Radio-Browser API returns about 30 fields per station; only the ones
+    the player uses are kept, in __slots__ instead of a per-object dict.
+    Values that repeat across many stations (country, codec, tags, language)
+    are interned so every station shares a single string object.
+    """
+
+    __slots__ = (
+        "stationuuid", "name", "url", "url_resolved",
+        "country", "countrycode", "codec", "bitrate", "tags", "language",
+        "lastcheckok",
+    )
+
+    FIELDS = __slots__
+
+    def __init__(self, stationuuid="", name="Unknown Station", url="", url_resolved="",
+                 country="", countrycode="", codec="", bitrate=0, tags="", language="",
+                 lastcheckok=1):
+        self.stationuuid = stationuuid
+        self.name = name
+        self.url = url
+        self.url_resolved = url_resolved
+        self.country = country
+        self.countrycode = countrycode
+        self.codec = codec
+        self.bitrate = bitrate
+        self.tags = tags
+        self.language = language
+        self.lastcheckok = lastcheckok
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Build a Station from a Radio-Browser API dict (or a dict produced by
+        to_dict). Unknown fields are dropped.
+        """
+        return cls(
+            stationuuid=_text(data.get("stationuuid")),
+            name=_text(data.get("name")).strip() or "Unknown Station",
+            url=_text(data.get("url")).strip(),
+            url_resolved=_text(data.get("url_resolved")).strip(),
+            country=_interned(data.get("country")),
+            countrycode=_interned(data.get("countrycode")),
+            codec=_interned(data.get("codec")),
+            bitrate=_int(data.get("bitrate")),
+            tags=_interned(data.get("tags")),
+            language=_interned(data.get("language")),
+            lastcheckok=_int(data.get("lastcheckok", 1)),
+        )
+
+    @property
+    def key(self):
+        """Stable identity: the Radio-Browser stationuuid, or the URL when missing."""
+        return self.stationuuid or self.url
+
+    def to_dict(self):
+        """Plain dict with the kept fields, for JSON storage."""
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def __eq__(self, other):
+        if not isinstance(other, Station):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self.FIELDS)
+
+    def __hash__(self):
+        return hash((self.stationuuid, self.url))
+
+    def __repr__(self):
+        return f"Station({self.name!r}, {self.country!r}, {self.url!r})"
+
+
+class StationIndex:
+    """
+    Lookup tables over one station list, built once per catalog so play,
+    next and previous never scan the list.
+
+    - by key (stationuuid) -> Station and list position
+    - by name -> keys of every station with that name (names are not unique)
+    - by stream URL -> position
+    """
+
+    def __init__(self, stations=None):
+        self.stations = stations or []
+        self._by_key = {}
+        self._position_by_key = {}
+        self._keys_by_name = {}
+        self._position_by_url = {}
+        for position, station in enumerate(self.stations):
+            key = station.key
+            if key in self._by_key:
+                continue  # Duplicate entry in the API response, keep the first
+            self._by_key[key] = station
+            self._position_by_key[key] = position
+            self._keys_by_name.setdefault(station.name, []).append(key)
+            if station.url:
+                self._position_by_url.setdefault(station.url, position)
+            if station.url_resolved:
+                self._position_by_url.setdefault(station.url_resolved, position)
+
+    def __len__(self):
+        return len(self.stations)
+
+    def get(self, key):
+        """Station with the given key (stationuuid), or None."""
+        return self._by_key.get(key)
+
+    def position(self, key):
+        """List position of the station with the given key, or None."""
+        return self._position_by_key.get(key)
+
+    def position_of_url(self, url):
+        """List position of the station streaming from `url`, or None."""
+        return self._position_by_url.get(url)
+
+    def keys_for_name(self, name):
+        """Keys of every station called `name` (empty if none)."""
+        return self._keys_by_name.get(name, [])
+
+    def at(self, position):
+        """Station at a list position, wrapping around at both ends."""
+        return self.stations[position % len(self.stations)]
+
+
+def stations_from_dicts(items):
+    """Convert a list of API dicts to Station records, skipping non-dict entries."""
+    return [Station.from_dict(item) for item in items if isinstance(item, dict)]
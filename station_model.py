@@ -0,0 +1,241 @@
+# station_model.py
+
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QSize, QEvent, pyqtSignal
+from PyQt6.QtGui import QColor
+from PyQt6.QtWidgets import QStyledItemDelegate, QStyle, QStyleOptionViewItem, QApplication
+
+from asset_cache import get_asset_cache
+
+# Custom item data roles
+StationRole = Qt.ItemDataRole.UserRole          # The Station behind a row
+FavoriteRole = Qt.ItemDataRole.UserRole + 1     # True if the station is a favorite
+PlaceholderRole = Qt.ItemDataRole.UserRole + 2  # True for "[Loading stations...]"-style rows
+
+
+class StationListModel(QAbstractListModel):
+    """
+    List model over a list of Station records.
+    Rows are produced on demand by the view, so only the visible ones cost
+    anything. When there are no stations the model shows a single,
+    unselectable placeholder row (e.g. "[Loading stations...]").
+
+    A key -> row map is rebuilt whenever the rows change (a new catalog or
+    a search filter), so finding a station's row is a dict lookup. The
+    now-playing highlight is tracked by key and survives filtering.
+
+    Single-row changes (highlight, star) are announced through
+    `row_repaint` rather than `dataChanged`: QListView answers a one-row
+    dataChanged with O(rows) work, while the view owner can repaint just
+    that row's rectangle.
+    """
+    row_repaint = pyqtSignal(int)  # row whose appearance changed
+
+    BROKEN_COLOR = QColor(150, 150, 150)
+
+    def __init__(self, is_favorite=None, parent=None, health=None):
+        """
+        Args:
+            is_favorite (callable): Returns True if a station key (stationuuid) is a favorite.
+            health (StreamHealthProber): Optional; rows of broken streams are dimmed.
+        """
+        super().__init__(parent)
+        self._stations = []
+        self._rows = {}  # station key (stationuuid) -> row
+        self._placeholder = None
+        self._playing_key = None
+        self._show_country = False
+        self._is_favorite = is_favorite or (lambda name: False)
+        self._health = health
+
+    # ---- Qt model interface ----
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        if self._placeholder is not None:
+            return 1
+        return len(self._stations)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if self._placeholder is not None:
+            if role == Qt.ItemDataRole.DisplayRole:
+                return self._placeholder
+            if role == PlaceholderRole:
+                return True
+            return None
+
+        station = self._stations[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            if self._show_country and station.country:
+                return f"{station.name} ({station.country})"
+            return station.name
+        if role == StationRole:
+            return station
+        if role == FavoriteRole:
+            return self._is_favorite(station.key)
+        if role == Qt.ItemDataRole.FontRole and self._playing_key is not None and station.key == self._playing_key:
+            font = QApplication.font()
+            font.setBold(True)
+            return font
+        if self._health is not None:
+            if role == Qt.ItemDataRole.ForegroundRole and self._health.is_broken(station):
+                return self.BROKEN_COLOR
+            if role == Qt.ItemDataRole.ToolTipRole:
+                return self._health.describe(station) or None
+        if role == PlaceholderRole:
+            return False
+        return None
+
+    def flags(self, index):
+        if self._placeholder is not None:
+            return Qt.ItemFlag.ItemIsEnabled
+        return super().flags(index)
+
+    # ---- Content ----
+    def set_stations(self, stations, show_country=False):
+        """
+        Replace the rows with the given stations.
+        Args:
+            stations (list): Station records.
+            show_country (bool): Append each station's country to its name
+                (used for cross-country search results).
+        """
+        self.beginResetModel()
+        self._stations = stations or []
+        self._rows = {}
+        for row, station in enumerate(self._stations):
+            self._rows.setdefault(station.key, row)
+        self._show_country = show_country
+        self._placeholder = None
+        self.endResetModel()
+
+    def set_placeholder(self, text):
+        """Show a single informational row instead of stations."""
+        self.beginResetModel()
+        self._stations = []
+        self._rows = {}
+        self._placeholder = text
+        self.endResetModel()
+
+    def stations(self):
+        return self._stations
+
+    def station_at(self, row):
+        """Return the Station shown at `row`, or None."""
+        if self._placeholder is None and 0 <= row < len(self._stations):
+            return self._stations[row]
+        return None
+
+    def row_of(self, key):
+        """Row showing the station with `key` (stationuuid), or None. O(1)."""
+        if self._placeholder is not None:
+            return None
+        return self._rows.get(key)
+
+    def refresh_row(self, row):
+        """Ask the view to repaint a single row (e.g. after a favorite toggle)."""
+        if self._placeholder is None and 0 <= row < len(self._stations):
+            self.row_repaint.emit(row)
+
+    def refresh_all(self):
+        """Ask the view to repaint every row (only the visible ones are actually drawn)."""
+        if self._placeholder is None and self._stations:
+            self.dataChanged.emit(self.index(0), self.index(len(self._stations) - 1))
+
+    # ---- Now-playing highlight ----
+    @property
+    def playing_key(self):
+        return self._playing_key
+
+    @property
+    def playing_row(self):
+        """Row of the now-playing station, or None if it is not shown."""
+        return self.row_of(self._playing_key) if self._playing_key is not None else None
+
+    def set_playing_key(self, key):
+        """Bold the station with `key` wherever it is shown (None clears the highlight)."""
+        previous = self.playing_row
+        self._playing_key = key
+        if previous is not None:
+            self.refresh_row(previous)
+        row = self.playing_row
+        if row is not None:
+            self.refresh_row(row)
+
+    def set_playing_row(self, row):
+        """Bold `row` (None clears the highlight)."""
+        station = self.station_at(row) if row is not None else None
+        self.set_playing_key(station.key if station is not None else None)
+
+
+class StationDelegate(QStyledItemDelegate):
+    """
+    Paints a station row as a star followed by the station name and turns a
+    click on the star into a `star_clicked` signal (hit testing replaces the
+    per-row QPushButton). Stars come from the shared AssetCache, already
+    rendered at the view's device-pixel ratio.
+    """
+    star_clicked = pyqtSignal(QModelIndex)
+
+    ROW_HEIGHT = 34
+    STAR_SIZE = 24
+    MARGIN = 5
+    SPACING = 10
+
+    STAR_FULL = "star_full.png"
+    STAR_EMPTY = "star_empty.png"
+
+    def __init__(self, parent=None, assets=None):
+        super().__init__(parent)
+        self.assets = assets or get_asset_cache()
+
+    def star_rect(self, option_rect):
+        """Rectangle occupied by the star inside a row."""
+        top = option_rect.top() + (option_rect.height() - self.STAR_SIZE) // 2
+        return QRect(option_rect.left() + self.MARGIN, top, self.STAR_SIZE, self.STAR_SIZE)
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+
+    def paint(self, painter, option, index):
+        if index.data(PlaceholderRole):
+            super().paint(painter, option, index)
+            return
+
+        option = QStyleOptionViewItem(option)
+        self.initStyleOption(option, index)
+        style = option.widget.style() if option.widget else QApplication.style()
+
+        # Background and selection
+        style.drawPrimitive(QStyle.PrimitiveElement.PE_PanelItemViewItem, option, painter, option.widget)
+
+        # Star
+        star_rect = self.star_rect(option.rect)
+        name = self.STAR_FULL if index.data(FavoriteRole) else self.STAR_EMPTY
+        ratio = option.widget.devicePixelRatioF() if option.widget else 1.0
+        painter.drawPixmap(star_rect, self.assets.pixmap(name, self.STAR_SIZE, ratio))
+
+        # Station name
+        text_rect = QRect(option.rect)
+        text_rect.setLeft(star_rect.right() + self.SPACING)
+        painter.save()
+        painter.setFont(option.font)
+        if option.state & QStyle.StateFlag.State_Selected:
+            painter.setPen(option.palette.highlightedText().color())
+        else:
+            painter.setPen(option.palette.text().color())
+        text = painter.fontMetrics().elidedText(option.text, Qt.TextElideMode.ElideRight, text_rect.width())
+        painter.drawText(text_rect, Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft, text)
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if (
+            event.type() == QEvent.Type.MouseButtonRelease
+            and event.button() == Qt.MouseButton.LeftButton
+            and not index.data(PlaceholderRole)
+            and self.star_rect(option.rect).contains(event.position().toPoint())
+        ):
+            self.star_clicked.emit(index)
+            return True
+        return super().editorEvent(event, model, option, index)
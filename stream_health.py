@@ -0,0 +1,233 @@
+# stream_health.py
+
+import socket
+import ssl
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, urljoin
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from constants import HEALTH_CACHE_TTL, HEALTH_LATENCY_STEP_MS, HEALTH_MAX_CONCURRENT, HEALTH_PROBE_TIMEOUT
+
+AUDIO_CONTENT_TYPES = ("audio/", "application/ogg", "application/octet-stream", "video/mp2t")
+PLAYLIST_CONTENT_TYPES = ("audio/x-scpls", "audio/x-mpegurl", "audio/mpegurl", "application/vnd.apple.mpegurl")
+
+
+class ProbeResult:
+    """Outcome of probing one stream URL."""
+
+    def __init__(self, url, ok=False, status=None, connect_ms=None, first_byte_ms=None,
+                 content_type="", bitrate=0, icy_name="", error=""):
+        self.url = url
+        self.ok = ok
+        self.status = status
+        self.connect_ms = connect_ms
+        self.first_byte_ms = first_byte_ms
+        self.content_type = content_type
+        self.bitrate = bitrate
+        self.icy_name = icy_name
+        self.error = error
+        self.checked_at = time.time()
+
+    def is_fresh(self):
+        return time.time() - self.checked_at < HEALTH_CACHE_TTL
+
+    def describe(self):
+        if not self.ok:
+            return f"Unreachable: {self.error or self.status}"
+        parts = [f"connect {self.connect_ms:.0f} ms", f"first byte {self.first_byte_ms:.0f} ms"]
+        if self.bitrate:
+            parts.append(f"{self.bitrate} kbps")
+        return ", ".join(parts)
+
+
+def probe_stream(url, timeout=HEALTH_PROBE_TIMEOUT, max_redirects=3):
+    """
+    Open a stream URL with a raw HTTP/1.0 request (asking for ICY metadata),
+    measure connect and first-byte time, and read the response headers.
+    Only the headers and the first bytes are read; the connection is then closed.
+    Returns:
+        ProbeResult
+    """
+    for _ in range(max_redirects + 1):
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            return ProbeResult(url, error="unsupported URL")
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        path = parts.path or "/"
+        if parts.query:
+            path += f"?{parts.query}"
+
+        started = time.monotonic()
+        try:
+            sock = socket.create_connection((parts.hostname, port), timeout=timeout)
+        except OSError as e:
+            return ProbeResult(url, error=f"connect failed: {e}")
+        connect_ms = (time.monotonic() - started) * 1000.0
+
+        try:
+            if parts.scheme == "https":
+                sock = ssl.create_default_context().wrap_socket(sock, server_hostname=parts.hostname)
+            sock.settimeout(timeout)
+            request = (
+                f"GET {path} HTTP/1.0\r\n"
+                f"Host: {parts.netloc}\r\n"
+                "User-Agent: SmoothAfricanRadioPlayer/1.0\r\n"
+                "Icy-MetaData: 1\r\n"
+                "Accept: */*\r\n"
+                "\r\n"
+            )
+            sock.sendall(request.encode("ascii", "ignore"))
+
+            data = sock.recv(4096)
+            first_byte_ms = (time.monotonic() - started) * 1000.0
+            while data and b"\r\n\r\n" not in data and len(data) < 16384:
+                chunk = sock.recv(4096)
+                if not chunk:
+                    break
+                data += chunk
+        except (OSError, ssl.SSLError) as e:
+            return ProbeResult(url, connect_ms=connect_ms, error=f"no response: {e}")
+        finally:
+            sock.close()
+
+        if not data:
+            return ProbeResult(url, connect_ms=connect_ms, error="empty response")
+
+        head = data.split(b"\r\n\r\n", 1)[0].decode("latin-1", "replace")
+        lines = head.split("\r\n")
+        status_parts = lines[0].split(" ", 2)  # "HTTP/1.1 200 OK" or "ICY 200 OK"
+        try:
+            status = int(status_parts[1])
+        except (IndexError, ValueError):
+            return ProbeResult(url, connect_ms=connect_ms, first_byte_ms=first_byte_ms, error="not HTTP")
+
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if status in (301, 302, 303, 307, 308) and headers.get("location"):
+            url = urljoin(url, headers["location"])
+            continue
+
+        content_type = headers.get("content-type", "").split(";")[0].lower()
+        try:
+            bitrate = int(headers.get("icy-br", "0").split(",")[0])
+        except ValueError:
+            bitrate = 0
+        is_stream = (
+            content_type.startswith(AUDIO_CONTENT_TYPES)
+            or content_type in PLAYLIST_CONTENT_TYPES
+            or any(name.startswith("icy-") for name in headers)
+        )
+        return ProbeResult(
+            url,
+            ok=status == 200 and is_stream,
+            status=status,
+            connect_ms=connect_ms,
+            first_byte_ms=first_byte_ms,
+            content_type=content_type,
+            bitrate=bitrate,
+            icy_name=headers.get("icy-name", ""),
+            error=f"HTTP {status}" if status != 200 else ("" if is_stream else f"not audio ({content_type})"),
+        )
+    return ProbeResult(url, error="too many redirects")
+
+
+class StreamHealthProber(QObject):
+    """
+    Checks station streams in the background and ranks stations by health.
+
+    Probes run on a small thread pool (HEALTH_MAX_CONCURRENT at a time) and
+    are cached per URL for HEALTH_CACHE_TTL seconds. Until a station has been
+    probed, the API's own `lastcheckok` flag decides whether it looks broken.
+    """
+    probed = pyqtSignal(str, object)  # stream URL, ProbeResult
+
+    def __init__(self, parent=None, max_concurrent=HEALTH_MAX_CONCURRENT):
+        super().__init__(parent)
+        self._results = {}
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="probe")
+
+    def result(self, url):
+        """Cached ProbeResult for a URL, or None if unknown or expired."""
+        with self._lock:
+            result = self._results.get(url)
+        return result if result is not None and result.is_fresh() else None
+
+    def record_failure(self, url, error):
+        """Record a failure observed elsewhere (e.g. during playback) as a probe result."""
+        result = ProbeResult(url, error=error)
+        with self._lock:
+            self._results[url] = result
+        self.probed.emit(url, result)
+
+    def probe(self, stations):
+        """Queue every station whose stream has no fresh probe result."""
+        for station in stations:
+            url = station.url
+            if not url or self.result(url) is not None:
+                continue
+            with self._lock:
+                if url in self._pending:
+                    continue
+                self._pending.add(url)
+            self._executor.submit(self._probe, url)
+
+    def _probe(self, url):
+        try:
+            result = probe_stream(url)
+        except Exception as e:
+            result = ProbeResult(url, error=str(e))
+        with self._lock:
+            self._pending.discard(url)
+            self._results[url] = result
+        self.probed.emit(url, result)
+
+    # ---- Ranking ----
+    def is_broken(self, station):
+        """True if the station's stream failed its probe, or the API marks it as failing."""
+        result = self.result(station.url)
+        if result is not None:
+            return not result.ok
+        return not station.lastcheckok
+
+    def bitrate(self, station):
+        """Stream bitrate in kbps: the ICY header when probed, else the API's value."""
+        result = self.result(station.url)
+        if result is not None and result.bitrate:
+            return result.bitrate
+        return station.bitrate or 0
+
+    def describe(self, station):
+        """Short health summary for tooltips."""
+        result = self.result(station.url)
+        if result is not None:
+            return result.describe()
+        if not station.lastcheckok:
+            return "Failing the directory's last check"
+        return f"{station.bitrate} kbps" if station.bitrate else ""
+
+    def rank_key(self, station):
+        """
+        Sort key for `rank`: streams that answered their probe first, fastest
+        first (latency rounded to HEALTH_LATENCY_STEP_MS, so jitter does not
+        reorder them) and then highest bitrate; unprobed streams next, by
+        bitrate; broken streams last.
+        """
+        if self.is_broken(station):
+            return (2, 0, 0)
+        result = self.result(station.url)
+        if result is None:
+            return (1, 0, -self.bitrate(station))
+        latency = result.first_byte_ms if result.first_byte_ms is not None else result.connect_ms or 0.0
+        return (0, int(latency // HEALTH_LATENCY_STEP_MS), -self.bitrate(station))
+
+    def rank(self, stations):
+        """Stations ordered by `rank_key`; ties keep their order."""
+        return sorted(stations, key=self.rank_key)
@@ -0,0 +1,27 @@
+# tests/conftest.py
+
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@contextmanager
+def local_server(handler):
+    """
+    Serve `handler` (a BaseHTTPRequestHandler class) on a free loopback port
+    for the duration of the block. Yields the server; `server.url` is its
+    base URL.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    server.url = f"http://127.0.0.1:{server.server_port}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,31 @@
+# tests/test_favorites_store.py
+
+import json
+
+from favorites_store import FavoritesStore
+from station import Station
+
+
+def test_wrong_shaped_file_is_ignored(tmp_path):
+    path = tmp_path / "favorites.json"
+    path.write_text(json.dumps({"stationuuid": "a"}))
+    assert len(FavoritesStore(str(path))) == 0
+
+
+def test_non_dict_records_are_skipped(tmp_path):
+    path = tmp_path / "favorites.json"
+    path.write_text(json.dumps(["a", 3, None, [], {"stationuuid": "b", "name": "B", "url": "http://b"}]))
+    store = FavoritesStore(str(path))
+    assert store.keys() == ["b"]
+
+
+def test_changes_round_trip(tmp_path):
+    path = str(tmp_path / "favorites.json")
+    store = FavoritesStore(path, write_delay=0.05)
+    store.add(Station.from_dict({"stationuuid": "a", "name": "A", "url": "http://a", "country": "Ghana"}))
+    store.add(Station.from_dict({"stationuuid": "b", "name": "B", "url": "http://b"}), country="Kenya")
+    store.remove("a")
+    store.flush()
+    reloaded = FavoritesStore(path)
+    assert reloaded.keys() == ["b"]
+    assert reloaded.countries() == ["Kenya"]
@@ -0,0 +1,33 @@
+# tests/test_global_index.py
+
+import sqlite3
+
+from global_index import GlobalStationIndex, INDEX_VERSION
+from station import Station
+
+
+def station(uuid, name, country):
+    return Station.from_dict({"stationuuid": uuid, "name": name, "country": country})
+
+
+def test_non_latin_names_are_found(tmp_path):
+    index = GlobalStationIndex(str(tmp_path / "stations.db"))
+    index.update_country("Egypt", [station("1", "إذاعة مصر", "Egypt"), station("2", "Nile FM", "Egypt")], "a")
+    index.update_country("Ethiopia", [station("3", "ሬዲዮ ፋና", "Ethiopia")], "b")
+
+    assert [s.name for s in index.search("مصر")] == ["إذاعة مصر"]
+    assert [s.name for s in index.search("ፋና")] == ["ሬዲዮ ፋና"]
+    assert [s.name for s in index.search("nile")] == ["Nile FM"]
+    assert index.search("!!!") == []
+
+
+def test_index_from_an_older_version_is_rebuilt(tmp_path):
+    path = str(tmp_path / "stations.db")
+    index = GlobalStationIndex(path)
+    index.update_country("Egypt", [station("1", "إذاعة مصر", "Egypt")], "a")
+    index._db.execute("PRAGMA user_version = 1")
+    index._db.commit()
+
+    reopened = GlobalStationIndex(path)
+    assert reopened.indexed_digest("Egypt") is None  # Re-indexed on the next catalog load
+    assert sqlite3.connect(path).execute("PRAGMA user_version").fetchone()[0] == INDEX_VERSION
@@ -0,0 +1,98 @@
+# tests/test_headless.py
+
+import json
+from http.client import HTTPConnection
+
+import pytest
+
+from conftest import local_server
+from headless import ControlError, _ControlHandler
+
+
+class FakeRadio:
+    """Stands in for HeadlessRadio: runs calls inline and records what was asked."""
+
+    def __init__(self):
+        self.calls = []
+        self.recorder = self
+
+    def call(self, fn):
+        return fn()
+
+    def status(self):
+        return {"playing": False}
+
+    def stop(self):
+        self.calls.append("stop")
+        return self.status()
+
+    def set_volume(self, volume):
+        self.calls.append(("volume", volume))
+        return {"volume": volume}
+
+    def search(self, query, limit):
+        if limit < 0:
+            raise AssertionError("negative limit reached search")
+        return {"query": query, "limit": limit}
+
+    def play(self, key, url):
+        raise ControlError(404, "no such station")
+
+    def favorite_list(self):
+        return {"favorites": []}
+
+    def stats(self):
+        return {}
+
+
+@pytest.fixture
+def control():
+    radio = FakeRadio()
+    handler = type("Handler", (_ControlHandler,), {"radio": radio})
+    with local_server(handler) as server:
+        yield radio, server.server_port
+
+
+def request(port, method, path, body=None, headers=None):
+    connection = HTTPConnection("127.0.0.1", port, timeout=5)
+    connection.request(method, path, body=body, headers=headers or {})
+    response = connection.getresponse()
+    payload = json.loads(response.read() or b"{}")
+    connection.close()
+    return response.status, payload
+
+
+def test_get_and_json_post(control):
+    radio, port = control
+    assert request(port, "GET", "/status") == (200, {"playing": False})
+    status, payload = request(port, "POST", "/volume", json.dumps({"volume": 40}),
+                              {"Content-Type": "application/json; charset=utf-8"})
+    assert (status, payload) == (200, {"volume": 40})
+    assert radio.calls == [("volume", 40)]
+    assert request(port, "POST", "/play", "{}", {"Content-Type": "application/json"})[0] == 404
+
+
+def test_post_without_json_content_type_is_refused(control):
+    radio, port = control
+    for headers in ({}, {"Content-Type": "text/plain"}, {"Content-Type": "application/x-www-form-urlencoded"}):
+        status, _ = request(port, "POST", "/stop", "{}", headers)
+        assert status == 415
+    assert radio.calls == []
+
+
+def test_foreign_host_is_refused(control):
+    radio, port = control
+    assert request(port, "GET", "/status", headers={"Host": "evil.example:%d" % port})[0] == 403
+    assert request(port, "GET", "/status", headers={"Host": "127.0.0.1:1"})[0] == 403
+    assert request(port, "GET", "/status", headers={"Host": "localhost:%d" % port})[0] == 200
+    status, _ = request(port, "POST", "/stop", "{}",
+                        {"Host": "evil.example", "Content-Type": "application/json"})
+    assert status == 403
+    assert radio.calls == []
+
+
+def test_search_limit_must_not_be_negative(control):
+    _, port = control
+    assert request(port, "GET", "/search?q=fm&limit=-1")[0] == 400
+    assert request(port, "GET", "/search?q=fm&limit=x")[0] == 400
+    assert request(port, "GET", "/search?q=fm&limit=0") == (200, {"query": "fm", "limit": 0})
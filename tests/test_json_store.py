@@ -0,0 +1,39 @@
+# tests/test_json_store.py
+
+import json
+import time
+
+from json_store import WriteBehindJSON
+
+
+def test_changes_are_coalesced_and_written_atomically(tmp_path):
+    path = tmp_path / "doc.json"
+    state = {"n": 0}
+    snapshots = []
+
+    def snapshot():
+        snapshots.append(dict(state))
+        return dict(state)
+
+    store = WriteBehindJSON(str(path), snapshot, delay=0.1)
+    for n in range(1, 6):
+        state["n"] = n
+        store.mark_dirty()
+    assert not path.exists()
+    time.sleep(0.4)
+    assert json.loads(path.read_text()) == {"n": 5}
+    assert snapshots == [{"n": 5}]  # One write for five changes
+    assert not (tmp_path / "doc.json.tmp").exists()
+
+    store.flush()  # Nothing pending: no write
+    assert len(snapshots) == 1
+
+
+def test_load_survives_missing_and_corrupt_files(tmp_path):
+    path = tmp_path / "doc.json"
+    store = WriteBehindJSON(str(path), dict, delay=1.0)
+    assert store.load() is None
+    path.write_text("{not json")
+    assert store.load() is None
+    path.write_text('{"a": 1}')
+    assert store.load() == {"a": 1}
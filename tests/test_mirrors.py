@@ -0,0 +1,146 @@
+# tests/test_mirrors.py
+
+import json
+import threading
+import time
+from contextlib import ExitStack
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+import mirrors
+from conftest import local_server
+from constants import API_CIRCUIT_FAILURES
+from mirrors import MirrorPool, MirrorPoolError
+
+SLOW_DELAY = 1.0  # Seconds the slow mirror takes to answer
+
+
+class FakeMirror(BaseHTTPRequestHandler):
+    """Answers every GET with {"mirror": name} after `delay`, or with `status` when that is an error."""
+    name = ""
+    delay = 0.0
+    status = 200
+    hits = 0
+
+    def do_GET(self):
+        type(self).hits += 1
+        time.sleep(self.delay)
+        body = json.dumps({"mirror": self.name, "path": self.path}).encode("utf-8")
+        self.send_response(self.status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TricklingMirror(BaseHTTPRequestHandler):
+    """Sends headers at once, then a large body slowly; records whether the client read it all."""
+    chunks = 100
+    finished = None
+    aborted = None
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(self.chunks * 65536))
+        self.end_headers()
+        try:
+            for _ in range(self.chunks):
+                self.wfile.write(b" " * 65536)
+                time.sleep(0.02)
+            type(self).finished.set()
+        except (BrokenPipeError, ConnectionResetError):
+            type(self).aborted.set()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def mirror(name, delay=0.0, status=200):
+    """A FakeMirror subclass with its own settings and hit counter."""
+    return type(name, (FakeMirror,), {"name": name, "delay": delay, "status": status, "hits": 0})
+
+
+@pytest.fixture
+def servers(monkeypatch):
+    """(handler, base URL) of a slow, a failing and a fast mirror."""
+    monkeypatch.setattr(mirrors, "API_HEDGE_DELAY_DEFAULT", 0.2)
+    handlers = [mirror("slow", delay=SLOW_DELAY), mirror("failing", status=503), mirror("fast")]
+    with ExitStack() as stack:
+        yield [(handler, stack.enter_context(local_server(handler)).url) for handler in handlers]
+
+
+def test_slow_mirror_is_hedged_to_the_next_one(servers):
+    (slow, slow_url), _, (fast, fast_url) = servers
+    pool = MirrorPool([slow_url, fast_url])
+
+    started = time.monotonic()
+    response = pool.get("/json/stations")
+    elapsed = time.monotonic() - started
+
+    assert response.json()["mirror"] == "fast"  # The hedge answered first
+    assert elapsed < SLOW_DELAY
+    assert slow.hits == 1 and fast.hits == 1
+
+
+def test_failing_mirror_fails_over(servers):
+    (slow, slow_url), (failing, failing_url), _ = servers
+    pool = MirrorPool([failing_url, slow_url], max_hedges=0)
+
+    assert pool.get("/json/stations").json()["mirror"] == "slow"
+    assert pool.stats(failing_url).failures == 1
+    assert pool.stats(slow_url).successes == 1
+    # The failure now ranks the failing mirror last
+    assert [s.base_url for s in pool.ranked()] == [slow_url, failing_url]
+
+
+def test_circuit_breaker_ejects_and_retries_after_cooldown(servers, monkeypatch):
+    _, (failing, failing_url), _ = servers
+    monkeypatch.setattr(mirrors, "API_CIRCUIT_COOLDOWN", 0.3)
+    pool = MirrorPool([failing_url])
+
+    for _ in range(API_CIRCUIT_FAILURES):
+        with pytest.raises(MirrorPoolError):
+            pool.get("/json/stations")
+    assert pool.stats(failing_url).opened_at is not None
+    assert pool.ranked() == []  # Ejected
+
+    time.sleep(0.35)
+    assert [s.base_url for s in pool.ranked()] == [failing_url]  # Half-open: one trial request
+    failing.status = 200
+    assert pool.get("/json/stations").json()["mirror"] == "failing"
+    stats = pool.stats(failing_url)
+    assert stats.opened_at is None and stats.consecutive_failures == 0
+
+
+def test_failed_trial_reopens_the_breaker(servers, monkeypatch):
+    _, (failing, failing_url), _ = servers
+    monkeypatch.setattr(mirrors, "API_CIRCUIT_COOLDOWN", 0.3)
+    pool = MirrorPool([failing_url])
+    for _ in range(API_CIRCUIT_FAILURES):
+        with pytest.raises(MirrorPoolError):
+            pool.get("/json/stations")
+
+    time.sleep(0.35)
+    with pytest.raises(MirrorPoolError):
+        pool.get("/json/stations")  # The trial fails
+    assert pool.ranked() == []
+    assert failing.hits == API_CIRCUIT_FAILURES + 1
+
+
+def test_losing_hedge_stops_downloading(servers):
+    _, _, (_, fast_url) = servers
+    handler = type("trickling", (TricklingMirror,), {"finished": threading.Event(), "aborted": threading.Event()})
+    with local_server(handler) as trickling:
+        pool = MirrorPool([trickling.url, fast_url])
+
+        assert pool.get("/json/stations").json()["mirror"] == "fast"
+        assert handler.aborted.wait(5)  # The slow body was abandoned, not downloaded in full
+        assert not handler.finished.is_set()
@@ -0,0 +1,31 @@
+# tests/test_prefetch.py
+
+import threading
+
+import prefetch
+from prefetch import CatalogPrefetcher
+
+
+class EmptyCache:
+    def load(self, country):
+        return None
+
+
+def test_workers_exit_once_every_other_country_is_fetched(monkeypatch):
+    fetched = []
+    lock = threading.Lock()
+
+    def refresh(country, entry, cancel=None):
+        with lock:
+            fetched.append(country)
+
+    monkeypatch.setattr(prefetch, "get_catalog_cache", EmptyCache)
+    monkeypatch.setattr(prefetch, "refresh_catalog_shared", refresh)
+    prefetcher = CatalogPrefetcher(["A", "B", "C", "D"], max_in_flight=2)
+    prefetcher.start(current_country="B")  # The window loads B itself; it is never queued
+
+    for thread in prefetcher._threads:
+        thread.join(timeout=5)
+        assert not thread.is_alive()
+    assert sorted(fetched) == ["A", "C", "D"]
+    assert fetched[0] in ("A", "C")  # Neighbours of the current country first
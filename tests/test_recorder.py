@@ -0,0 +1,113 @@
+# tests/test_recorder.py
+
+import os
+import time
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from conftest import local_server
+from recorder import RecordingManager
+
+PATTERN = bytes(range(251))
+RATE = 64 * 1024  # Bytes per second
+
+
+def pattern_bytes(length):
+    return (PATTERN * (length // len(PATTERN) + 1))[:length]
+
+
+class StreamSource(BaseHTTPRequestHandler):
+    """An endless audio/mpeg stream of a known byte pattern, at RATE."""
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "audio/mpeg")
+        self.end_headers()
+        stream = pattern_bytes(len(PATTERN) * 4096)
+        sent = 0
+        started = time.monotonic()
+        try:
+            while True:
+                piece = stream[sent % len(PATTERN):][:4096]
+                self.wfile.write(piece)
+                sent += len(piece)
+                ahead = sent / RATE - (time.monotonic() - started)
+                if ahead > 0:
+                    time.sleep(ahead)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def source():
+    with local_server(StreamSource) as server:
+        yield f"{server.url}/live"
+
+
+def segment_order(name):
+    """Sort key for <timestamp>[-n].<ext>: segments opened within the same second carry a suffix."""
+    stem = name.rsplit(".", 1)[0]
+    stamp, _, suffix = stem[:15], stem[15:16], stem[16:]
+    return stamp, int(suffix or 1)
+
+
+def read_folder(folder):
+    data = b""
+    for name in sorted(os.listdir(folder), key=segment_order):
+        with open(os.path.join(folder, name), "rb") as f:
+            data += f.read()
+    return data
+
+
+def test_segments_hold_exactly_the_stream(source, tmp_path):
+    manager = RecordingManager(str(tmp_path / "rec"), disk_budget=1024 ** 3, segment_seconds=0.4)
+    recording = manager.start(source, name="Radio One", key="one")
+    time.sleep(1.5)
+    manager.stop_all(wait=True)
+
+    stats = recording.stats()
+    assert not stats["active"]
+    assert stats["segments"] >= 2
+    assert stats["chunks_dropped"] == 0
+    names = os.listdir(recording.directory)
+    assert all(name.endswith(".mp3") for name in names)
+    data = read_folder(recording.directory)
+    assert len(data) == stats["bytes_written"] > 0
+    assert data == pattern_bytes(len(data))
+
+
+def test_budget_deletes_only_recorder_segments(source, tmp_path):
+    directory = tmp_path / "rec"
+    station = directory / "Radio_One"
+    station.mkdir(parents=True)
+    own = [directory / "mix.mp3", station / "notes.txt", station / "favourite-song.mp3"]
+    for path in own:
+        path.write_bytes(b"x" * RATE)
+    old_segment = station / "20200101-000000.mp3"
+    old_segment.write_bytes(b"x" * RATE)
+    os.utime(old_segment, (0, 0))
+
+    budget = 2 * RATE
+    manager = RecordingManager(str(directory), disk_budget=budget, segment_seconds=0.3)
+    assert manager.disk_used() == RATE  # Only the old segment counts
+    manager.start(source, name="Radio One", key="one")
+    time.sleep(2.0)
+    manager.stop_all(wait=True)
+
+    assert manager.deleted_segments > 0
+    assert not old_segment.exists()
+    assert all(path.exists() for path in own)
+    assert manager.disk_used() <= budget
+
+
+def test_stats_do_not_create_the_directory(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_MUSIC_DIR", str(tmp_path / "Music"))
+    manager = RecordingManager()
+    stats = manager.stats()
+    assert stats["disk_used"] == 0
+    assert stats["directory"].startswith(str(tmp_path / "Music"))
+    assert not os.path.exists(tmp_path / "Music")
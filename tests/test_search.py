@@ -0,0 +1,34 @@
+# tests/test_search.py
+
+from search import IncrementalSearch, StationSearchIndex, normalize
+from station import Station
+
+NAMES = ["إذاعة مصر", "Radio Télé-Congo", "ሬዲዮ ፋና", "Capital FM"]
+
+
+def make_search():
+    stations = [Station.from_dict({"stationuuid": str(i), "name": name}) for i, name in enumerate(NAMES)]
+    return IncrementalSearch(StationSearchIndex(stations))
+
+
+def names(stations):
+    return [station.name for station in stations]
+
+
+def test_normalize_keeps_non_latin_letters():
+    assert normalize("Radio Télé-Congo") == "radio tele congo"
+    assert normalize("ሬዲዮ ፋና") == "ሬዲዮ ፋና"
+    assert normalize("إذاعة مصر").split()[-1] == "مصر"
+
+
+def test_arabic_and_ethiopic_names_are_searchable():
+    search = make_search()
+    assert names(search.search("مصر")) == ["إذاعة مصر"]
+    assert names(search.search("مص")) == ["إذاعة مصر"]
+    assert names(search.search("ፋና")) == ["ሬዲዮ ፋና"]
+
+
+def test_query_without_searchable_characters_matches_nothing():
+    search = make_search()
+    assert search.search("!!!") == []
+    assert names(search.search("fm")) == ["Capital FM"]  # Still searching normally afterwards
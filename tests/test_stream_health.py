@@ -0,0 +1,104 @@
+# tests/test_stream_health.py
+
+import time
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from conftest import local_server
+from station import Station
+from stream_health import StreamHealthProber, probe_stream
+
+
+class FakeStreams(BaseHTTPRequestHandler):
+    """
+    ICY-style streams: /fast/<kbps> answers at once, /slow/<kbps> after a
+    delay, /dead with 404, /moved redirects to /fast/96 and /page is HTML.
+    """
+    slow_delay = 0.6
+
+    def do_GET(self):
+        parts = self.path.strip("/").split("/")
+        if parts[0] == "dead":
+            self.send_error(404)
+            return
+        if parts[0] == "moved":
+            self.send_response(302)
+            self.send_header("Location", "/fast/96")
+            self.end_headers()
+            return
+        if parts[0] == "page":
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.end_headers()
+            self.wfile.write(b"<html></html>")
+            return
+        if parts[0] == "slow":
+            time.sleep(self.slow_delay)
+        self.send_response(200)
+        self.send_header("Content-Type", "audio/mpeg")
+        self.send_header("icy-br", parts[1])
+        self.send_header("icy-name", f"Station {parts[1]}")
+        self.end_headers()
+        try:
+            self.wfile.write(b"\xff\xfb" * 2048)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def base_url():
+    with local_server(FakeStreams) as server:
+        yield server.url
+
+
+def station(name, url, bitrate=0, lastcheckok=1):
+    return Station.from_dict({"stationuuid": name, "name": name, "url": url,
+                              "bitrate": bitrate, "lastcheckok": lastcheckok})
+
+
+def test_probe_reads_icy_headers(base_url):
+    result = probe_stream(f"{base_url}/fast/128")
+    assert result.ok and result.status == 200
+    assert result.bitrate == 128 and result.icy_name == "Station 128"
+    assert result.content_type == "audio/mpeg"
+    assert 0 <= result.connect_ms <= result.first_byte_ms
+
+
+def test_probe_follows_redirects_and_rejects_non_audio(base_url):
+    moved = probe_stream(f"{base_url}/moved")
+    assert moved.ok and moved.url.endswith("/fast/96") and moved.bitrate == 96
+    dead = probe_stream(f"{base_url}/dead")
+    assert not dead.ok and dead.status == 404
+    page = probe_stream(f"{base_url}/page")
+    assert not page.ok and "not audio" in page.error
+    assert not probe_stream("http://127.0.0.1:9/").ok
+
+
+def test_rank_orders_by_health_latency_and_bitrate(base_url):
+    stations = [
+        station("unprobed-broken", f"{base_url}/never/1", lastcheckok=0),
+        station("dead", f"{base_url}/dead"),
+        station("slow-320", f"{base_url}/slow/320"),
+        station("unprobed-64", f"{base_url}/never/2", bitrate=64),
+        station("fast-64", f"{base_url}/fast/64"),
+        station("unprobed-192", f"{base_url}/never/3", bitrate=192),
+        station("fast-128", f"{base_url}/fast/128", bitrate=32),  # The ICY header wins over the API value
+    ]
+    prober = StreamHealthProber()
+    probed = [s for s in stations if "never" not in s.url]
+    prober.probe(probed)
+    deadline = time.monotonic() + 10
+    while any(prober.result(s.url) is None for s in probed) and time.monotonic() < deadline:
+        time.sleep(0.02)
+
+    ranked = [s.name for s in prober.rank(stations)]
+    assert ranked == [
+        "fast-128", "fast-64", "slow-320",
+        "unprobed-192", "unprobed-64",
+        "unprobed-broken", "dead",
+    ]
+    assert prober.bitrate(stations[-1]) == 128
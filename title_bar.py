@@ -1,6 +1,7 @@
 from PyQt6.QtCore import Qt, QSize
 from PyQt6.QtWidgets import QWidget, QHBoxLayout, QLabel, QPushButton
-from PyQt6.QtGui import QIcon
+
+from asset_cache import get_asset_cache
 
 class TitleBar(QWidget):
     """
@@ -35,7 +36,7 @@ class TitleBar(QWidget):
         self.min_button.setObjectName("MinButton")  # for styling via stylesheet
         self.min_button.setFixedSize(32, 32)  # Consistent size for all buttons
         self.min_button.setToolTip("Minimize")
-        self.min_button.setIcon(QIcon("assets/minimize_icon.svg"))
+        self.min_button.setIcon(get_asset_cache().icon("minimize_icon.svg", 20))
         self.min_button.setIconSize(QSize(20, 20))  # Adjusted icon size
         self.min_button.clicked.connect(self.on_minimize)
         self.layout.addWidget(self.min_button)
@@ -45,7 +46,7 @@ class TitleBar(QWidget):
         self.close_button.setObjectName("CloseButton")
         self.close_button.setFixedSize(32, 32)
         self.close_button.setToolTip("Close")
-        self.close_button.setIcon(QIcon("assets/close_icon.svg"))
+        self.close_button.setIcon(get_asset_cache().icon("close_icon.svg", 20))
         self.close_button.setIconSize(QSize(20, 20))
         self.close_button.clicked.connect(self.on_close)
         self.layout.addWidget(self.close_button)
@@ -0,0 +1,28 @@
+# vlc_loader.py
+
+import threading
+
+_vlc = None
+_lock = threading.Lock()
+
+
+def load_vlc():
+    """
+    Import python-vlc on first use and return the module.
+    Importing it locates and loads libvlc, which is a noticeable share of
+    startup time, so nothing imports it at module level; call
+    `preload_vlc()` after the window is up to have it ready before the
+    first play.
+    """
+    global _vlc
+    if _vlc is None:
+        with _lock:
+            if _vlc is None:
+                import vlc
+                _vlc = vlc
+    return _vlc
+
+
+def preload_vlc():
+    """Import python-vlc on a background thread."""
+    threading.Thread(target=load_vlc, name="vlc-preload", daemon=True).start()